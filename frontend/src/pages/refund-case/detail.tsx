@@ -51,8 +51,10 @@ const RefundCaseDetail: React.FC = () => {
       const caseData = await refundApi.getRefundCaseDetailed(refundCaseId);
       setRefundCase(caseData);
 
-      // If there's an associated support case, fetch its details
-      if (caseData.case_number) {
+      // The detailed view embeds the support case; only fetch it separately as a fallback
+      if (caseData.support_case_details) {
+        setSupportCase(caseData.support_case_details);
+      } else if (caseData.case_number) {
         try {
           const supportData = await supportApi.getSupportCase(caseData.case_number);
           setSupportCase(supportData);
@@ -0,0 +1,162 @@
+"""BatchRefundDecisions use case implementation"""
+
+from typing import Dict, Any, List
+from uuid import uuid4
+from ..refund_response import RefundResponse, RefundMethod
+from ..value_objects.money import Money
+from ..value_objects.refund_decision import RefundDecision, RefundDecisionValue
+
+
+# Upper bound on decisions per batch so one request holds the write lock briefly
+MAX_BATCH_SIZE = 500
+
+
+class BatchRefundDecisions:
+    """Use case for deciding many refund requests in one transaction
+
+    Every item is validated on its own; invalid items are reported as failed
+    and never block the rest of the batch. All valid decisions are written
+    together, so the batch costs one lookup query and one write transaction
+    instead of a round trip per request.
+    """
+
+    def __init__(self, refund_request_repository):
+        """Initialize with required dependencies"""
+        self.refund_request_repository = refund_request_repository
+
+    def execute(self, decisions: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """Execute the batch refund decisions use case
+
+        Args:
+            decisions: Items with refund_request_id, agent_id, decision, reason
+                and optional refund_amount, refund_method and attachments
+
+        Returns:
+            Dictionary with a result per item, in input order, plus the
+            decided refund requests and responses for notification
+        """
+        if not decisions:
+            raise ValueError("At least one decision is required")
+
+        if len(decisions) > MAX_BATCH_SIZE:
+            raise ValueError(f"A batch may contain at most {MAX_BATCH_SIZE} decisions")
+
+        refund_requests = self.refund_request_repository.find_by_ids(
+            list({item.get("refund_request_id") for item in decisions if item.get("refund_request_id")})
+        )
+
+        results = []
+        decided = {}
+        for item in decisions:
+            refund_request_id = item.get("refund_request_id")
+            result = {
+                "refund_request_id": refund_request_id,
+                "status": "failed",
+                "decision": None,
+                "new_status": None,
+                "response_id": None,
+                "error": None
+            }
+            results.append(result)
+
+            try:
+                if refund_request_id in decided:
+                    raise ValueError("Duplicate refund request in batch")
+
+                refund_request = refund_requests.get(refund_request_id)
+                if refund_request is None:
+                    raise ValueError("Refund request not found")
+
+                response = self._decide(refund_request, item)
+            except ValueError as e:
+                result["error"] = str(e)
+                continue
+
+            decided[refund_request_id] = (refund_request, response, result)
+
+        applied = self.refund_request_repository.apply_decisions(
+            [refund_request for refund_request, _, _ in decided.values()],
+            [response for _, response, _ in decided.values()]
+        )
+
+        applied_requests = []
+        applied_responses = []
+        for refund_request_id, (refund_request, response, result) in decided.items():
+            if refund_request_id not in applied:
+                result["error"] = "Refund request was changed concurrently"
+                continue
+
+            result.update({
+                "status": "applied",
+                "decision": response.decision.decision.value,
+                "new_status": refund_request.status.value,
+                "response_id": response.response_id
+            })
+            applied_requests.append(refund_request)
+            applied_responses.append(response)
+
+        print(f"Applied {len(applied_requests)} of {len(decisions)} batched refund decisions")
+
+        return {
+            "results": results,
+            "applied": len(applied_requests),
+            "failed": len(results) - len(applied_requests),
+            "refund_requests": applied_requests,
+            "responses": applied_responses
+        }
+
+    def _decide(self, refund_request, item: Dict[str, Any]) -> RefundResponse:
+        """Validate one item and apply its decision to the refund request
+
+        Raises:
+            ValueError: If the item is invalid, the request is already decided
+                or it is no longer at the item's expected version
+        """
+        agent_id = item.get("agent_id")
+        if not agent_id:
+            raise ValueError("Agent ID is required")
+
+        if refund_request.to_dict()["status"] != "pending":
+            raise ValueError(f"Refund request is already {refund_request.status.value}")
+
+        expected_version = item.get("expected_version")
+        if expected_version is not None and expected_version != refund_request.version:
+            raise ValueError("Refund request was changed concurrently")
+
+        reason = item.get("reason") or ""
+        decision = RefundDecision.from_string(item.get("decision") or "", reason, strict=True)
+
+        refund_method = None
+        if item.get("refund_method"):
+            try:
+                refund_method = RefundMethod(item["refund_method"])
+            except ValueError:
+                raise ValueError(f"Invalid refund method: {item['refund_method']}")
+
+        refund_amount = None
+        if item.get("refund_amount"):
+            try:
+                refund_amount = Money.from_dict({"amount": float(item["refund_amount"]), "currency": "USD"})
+            except ValueError:
+                raise ValueError(f"Invalid refund amount: {item['refund_amount']}")
+
+        # Enforces amount and method for accepted decisions
+        response = RefundResponse(
+            response_id=f"RESP-{uuid4().hex[:8].upper()}",
+            refund_request_id=refund_request.refund_request_id,
+            agent_id=agent_id,
+            decision=decision,
+            response_content=reason,
+            refund_amount=refund_amount,
+            attachments=item.get("attachments") or [],
+            refund_method=refund_method
+        )
+
+        if decision.decision == RefundDecisionValue.ACCEPTED:
+            refund_request.approve(agent_id, reason, refund_amount)
+        elif decision.decision == RefundDecisionValue.REJECTED:
+            refund_request.reject(agent_id, reason)
+        else:
+            refund_request.request_additional_evidence(agent_id, reason)
+
+        return response
@@ -0,0 +1,70 @@
+"""ClaimRefundRequest use case implementation"""
+
+from typing import Dict, Any
+
+
+# Bounds for a requested lease so claims can neither flap nor hoard work
+MIN_LEASE_SECONDS = 30
+MAX_LEASE_SECONDS = 4 * 60 * 60
+
+
+class ClaimRefundRequest:
+    """Use case for an agent claiming the next refund request from the work queue"""
+
+    def __init__(self, refund_request_repository, default_lease_seconds: int = 900):
+        """Initialize with required dependencies"""
+        self.refund_request_repository = refund_request_repository
+        self.default_lease_seconds = default_lease_seconds
+
+    def execute(self, agent_id: str, lease_seconds: int | None = None) -> Dict[str, Any]:
+        """Execute the claim refund request use case
+
+        Args:
+            agent_id: The agent claiming work
+            lease_seconds: How long the claim is held before it returns to the queue
+
+        Returns:
+            Dictionary with the claimed refund request, or a queue_empty status
+        """
+        if not agent_id:
+            raise ValueError("Agent ID is required")
+
+        if lease_seconds is None:
+            lease_seconds = self.default_lease_seconds
+        if not MIN_LEASE_SECONDS <= lease_seconds <= MAX_LEASE_SECONDS:
+            raise ValueError(
+                f"Lease must be between {MIN_LEASE_SECONDS} and {MAX_LEASE_SECONDS} seconds"
+            )
+
+        refund_request = self.refund_request_repository.claim_next(agent_id, lease_seconds)
+
+        if refund_request is None:
+            return {
+                "status": "queue_empty",
+                "refund_request": None
+            }
+
+        return {
+            "refund_request_id": refund_request.refund_request_id,
+            "status": "claimed",
+            "claimed_by": refund_request.claimed_by,
+            "claim_expires_at": refund_request.claim_expires_at,
+            "refund_request": refund_request
+        }
+
+    def release(self, refund_request_id: str, agent_id: str) -> Dict[str, Any]:
+        """Return a claimed refund request to the queue
+
+        Raises:
+            ValueError: If the agent does not hold the claim
+        """
+        if not agent_id:
+            raise ValueError("Agent ID is required")
+
+        if not self.refund_request_repository.release_claim(refund_request_id, agent_id):
+            raise ValueError(f"Refund request {refund_request_id} is not claimed by agent {agent_id}")
+
+        return {
+            "refund_request_id": refund_request_id,
+            "status": "released"
+        }
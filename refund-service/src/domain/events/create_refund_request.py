@@ -6,6 +6,39 @@ from uuid import uuid4
 from ..refund_request import RefundRequest, RefundRequestStatus
 
 
+def validate_refund_request_input(
+    support_case_number: str,
+    customer_id: str,
+    order_id: str,
+    product_ids: List[str],
+    request_reason: str
+) -> None:
+    """Validate the fields required to create a refund request"""
+    if not support_case_number or not customer_id or not order_id:
+        raise ValueError("Support case number, customer ID, and order ID are required")
+    
+    if not product_ids:
+        raise ValueError("At least one product ID is required")
+    
+    if not request_reason:
+        raise ValueError("Request reason is required")
+
+
+def validate_support_case(support_case, support_case_number: str) -> None:
+    """Validate that a support case can accept refund requests"""
+    if not support_case:
+        raise ValueError(f"Support case {support_case_number} not found")
+    
+    if support_case.is_deleted:
+        raise ValueError(f"Cannot create refund request for deleted support case {support_case_number}")
+    
+    if support_case.status == "closed":
+        raise ValueError(f"Cannot create refund request for closed support case {support_case_number}")
+    
+    if support_case.case_type != "refund":
+        raise ValueError(f"Cannot create refund request for non-refund support case {support_case_number}")
+
+
 class CreateRefundRequest:
     """Use case for creating a new refund request"""
 
@@ -27,28 +60,13 @@ class CreateRefundRequest:
         """Execute the create refund request use case"""
         
         # Validate inputs
-        if not support_case_number or not customer_id or not order_id:
-            raise ValueError("Support case number, customer ID, and order ID are required")
-        
-        if not product_ids:
-            raise ValueError("At least one product ID is required")
-        
-        if not request_reason:
-            raise ValueError("Request reason is required")
+        validate_refund_request_input(
+            support_case_number, customer_id, order_id, product_ids, request_reason
+        )
         
         # Validate support case can accept refund requests
         support_case = self.support_case_repository.find_by_case_number(support_case_number)
-        if not support_case:
-            raise ValueError(f"Support case {support_case_number} not found")
-        
-        if support_case.is_deleted:
-            raise ValueError(f"Cannot create refund request for deleted support case {support_case_number}")
-        
-        if support_case.status == "closed":
-            raise ValueError(f"Cannot create refund request for closed support case {support_case_number}")
-        
-        if support_case.case_type != "refund":
-            raise ValueError(f"Cannot create refund request for non-refund support case {support_case_number}")
+        validate_support_case(support_case, support_case_number)
         
         # Generate refund request ID
         refund_request_id = f"RR-{uuid4().hex[:8].upper()}"
@@ -0,0 +1,86 @@
+"""GetCustomerOverview use case implementation"""
+
+import asyncio
+from datetime import datetime
+from typing import Dict, Any
+
+
+class GetCustomerOverview:
+    """Use case for assembling a customer's support cases with their refund status
+
+    The customer's support cases (from the Support Service) and refund
+    requests (from this service) are loaded concurrently and joined by
+    support case number, so the portal needs a single round trip. Complete
+    overviews are cached briefly per customer.
+    """
+
+    def __init__(self, refund_request_repository, support_case_repository, cache):
+        """Initialize with required dependencies"""
+        self.refund_request_repository = refund_request_repository
+        self.support_case_repository = support_case_repository
+        self.cache = cache
+
+    async def execute(self, customer_id: str) -> Dict[str, Any]:
+        """Execute the get customer overview use case
+
+        If the Support Service is unavailable the overview still lists the
+        customer's refund requests, is flagged as partial and is not cached.
+        """
+        if not customer_id:
+            raise ValueError("Customer ID is required")
+
+        cached = self.cache.get(customer_id)
+        if cached is not None:
+            return cached
+
+        refund_requests, support_cases = await asyncio.gather(
+            asyncio.to_thread(self.refund_request_repository.find_by_customer_id, customer_id),
+            self.support_case_repository.fetch_customer_cases(customer_id),
+            return_exceptions=True
+        )
+        if isinstance(refund_requests, BaseException):
+            raise refund_requests
+
+        support_service_available = not isinstance(support_cases, BaseException)
+        if not support_service_available:
+            print(f"⚠️ Support service unavailable for customer overview {customer_id}: {support_cases}")
+            support_cases = []
+
+        refunds_by_case = {}
+        for refund_request in sorted(refund_requests, key=lambda req: req.created_at):
+            data = refund_request.to_dict()
+            refunds_by_case.setdefault(refund_request.support_case_number, []).append({
+                "refund_case_id": data["refund_request_id"],
+                "order_id": data["order_id"],
+                "product_ids": data["product_ids"],
+                "status": data["status"],
+                "created_at": data["created_at"],
+                "updated_at": data["updated_at"]
+            })
+
+        overview_cases = []
+        for support_case in support_cases:
+            overview_cases.append({
+                **support_case,
+                "refund_requests": refunds_by_case.pop(support_case["case_number"], [])
+            })
+
+        overview = {
+            "customer_id": customer_id,
+            "support_cases": overview_cases,
+            # Refund requests whose support case the Support Service did not return
+            "unlinked_refund_requests": [
+                refund for refunds in refunds_by_case.values() for refund in refunds
+            ],
+            "support_service_available": support_service_available,
+            "generated_at": datetime.utcnow().isoformat()
+        }
+
+        if support_service_available:
+            self.cache.put(customer_id, overview)
+
+        return overview
+
+    def invalidate(self, customer_id: str) -> None:
+        """Drop a customer's cached overview after one of their refunds changed"""
+        self.cache.invalidate(customer_id)
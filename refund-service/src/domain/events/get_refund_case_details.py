@@ -0,0 +1,85 @@
+"""GetRefundCaseDetails use case implementation"""
+
+import asyncio
+from typing import Dict, Any, Optional
+
+
+class GetRefundCaseDetails:
+    """Use case for assembling the detailed agent view of a refund request
+
+    The refund request, its response history and the linked support case are
+    loaded concurrently. Assembled views are cached per refund request and
+    reused only while the request's change marker is unchanged, so a
+    decision, upload or claim is visible immediately. Support case details
+    from the Support Service can lag by at most the cache lifetime.
+    """
+
+    def __init__(self, refund_request_repository, refund_response_repository, support_case_repository, cache):
+        """Initialize with required dependencies"""
+        self.refund_request_repository = refund_request_repository
+        self.refund_response_repository = refund_response_repository
+        self.support_case_repository = support_case_repository
+        self.cache = cache
+
+    async def execute(self, refund_request_id: str) -> Optional[Dict[str, Any]]:
+        """Execute the get refund case details use case
+
+        Returns:
+            The detailed view, or None if the refund request does not exist
+        """
+        change = await asyncio.to_thread(self.refund_request_repository.find_change_marker, refund_request_id)
+        if change is None:
+            return None
+        support_case_number, marker = change
+
+        cached = self.cache.get(refund_request_id)
+        if cached is not None and cached[0] == marker:
+            return cached[1]
+
+        refund_request, responses, support_case = await asyncio.gather(
+            asyncio.to_thread(self.refund_request_repository.find_by_id, refund_request_id),
+            asyncio.to_thread(self.refund_response_repository.find_by_refund_request_id, refund_request_id),
+            self.support_case_repository.fetch_case(support_case_number),
+            return_exceptions=True
+        )
+        for result in (refund_request, responses):
+            if isinstance(result, BaseException):
+                raise result
+        if refund_request is None:
+            # Deleted between the marker lookup and the load
+            return None
+
+        support_service_available = not isinstance(support_case, BaseException)
+        if not support_service_available:
+            print(f"⚠️ Support service unavailable for refund case {refund_request_id}: {support_case}")
+            support_case = None
+
+        data = refund_request.to_dict()
+        latest_response = responses[-1] if responses else None
+        view = {
+            "refund_case_id": data["refund_request_id"],
+            "case_number": data["support_case_number"],
+            "customer_id": data["customer_id"],
+            "order_id": data["order_id"] or "ORD-unknown",
+            "status": data["status"],
+            "created_at": data["created_at"],
+            "updated_at": data["updated_at"],
+            "request_reason": data["request_reason"],
+            "product_ids": data["product_ids"],
+            "evidence_photos": data["evidence_photos"],
+            "refund_id": data["refund_id"],
+            "priority": data["priority"],
+            "claimed_by": data["claimed_by"],
+            "claim_expires_at": data["claim_expires_at"],
+            "version": data["version"],
+            "latest_decision": latest_response.decision.to_dict() if latest_response else None,
+            "responses": [response.to_dict() for response in responses],
+            "total_responses": len(responses),
+            "support_case_details": support_case,
+            "support_service_available": support_service_available
+        }
+
+        if support_service_available:
+            self.cache.put(refund_request_id, (marker, view))
+
+        return view
@@ -0,0 +1,105 @@
+"""ImportRefundRequests use case implementation"""
+
+from typing import Dict, Any, List, Optional
+from uuid import uuid4
+
+from ..refund_request import RefundRequest, RefundRequestStatus
+from .create_refund_request import validate_refund_request_input, validate_support_case
+
+
+class ImportRefundRequests:
+    """Use case for importing a chunk of refund requests in bulk
+
+    Unlike CreateRefundRequest, which looks up the support case and saves
+    once per request, a chunk resolves all of its support cases with one
+    batched lookup and inserts every valid request in a single transaction.
+    Callers stream large imports through in chunks so memory and lock time
+    stay bounded.
+    """
+
+    def __init__(self, refund_request_repository, support_case_repository):
+        """Initialize with required dependencies"""
+        self.refund_request_repository = refund_request_repository
+        self.support_case_repository = support_case_repository
+
+    def execute(
+        self,
+        items: List[Dict[str, Any]],
+        support_cases: Optional[Dict[str, Any]] = None
+    ) -> Dict[str, Any]:
+        """Execute the import refund requests use case for one chunk
+
+        Args:
+            items: Refund request payloads with case_number, customer_id,
+                order_id, product_ids, request_reason, optional
+                evidence_photos and the source line number
+            support_cases: Support cases resolved by earlier chunks, keyed by
+                case number; newly resolved cases are added to it
+
+        Returns:
+            Dictionary with a result per item, in input order, and the new
+            refund request IDs grouped by support case number
+        """
+        if support_cases is None:
+            support_cases = {}
+
+        unresolved = list(dict.fromkeys(
+            item.get("case_number") for item in items
+            if item.get("case_number") and item.get("case_number") not in support_cases
+        ))
+        if unresolved:
+            support_cases.update(self.support_case_repository.find_by_case_numbers(unresolved))
+
+        results = []
+        refund_requests = []
+        for item in items:
+            result = {
+                "line": item.get("line"),
+                "refund_case_id": None,
+                "status": "failed",
+                "error": None
+            }
+            results.append(result)
+
+            case_number = item.get("case_number")
+            try:
+                validate_refund_request_input(
+                    case_number,
+                    item.get("customer_id"),
+                    item.get("order_id"),
+                    item.get("product_ids"),
+                    item.get("request_reason")
+                )
+                validate_support_case(support_cases.get(case_number), case_number)
+            except ValueError as e:
+                result["error"] = str(e)
+                continue
+
+            refund_request = RefundRequest(
+                refund_request_id=f"RR-{uuid4().hex[:8].upper()}",
+                support_case_number=case_number,
+                customer_id=item["customer_id"],
+                product_ids=item["product_ids"],
+                request_reason=item["request_reason"],
+                evidence_photos=item.get("evidence_photos") or [],
+                status=RefundRequestStatus.SUBMITTED,
+                order_id=item["order_id"]
+            )
+            refund_requests.append(refund_request)
+            result.update({
+                "refund_case_id": refund_request.refund_request_id,
+                "status": "imported"
+            })
+
+        self.refund_request_repository.save_many(refund_requests)
+
+        links = {}
+        for refund_request in refund_requests:
+            links.setdefault(refund_request.support_case_number, []).append(refund_request.refund_request_id)
+
+        return {
+            "results": results,
+            "imported": len(refund_requests),
+            "failed": len(results) - len(refund_requests),
+            "links": links
+        }
@@ -0,0 +1,72 @@
+"""UploadRefundEvidence use case implementation"""
+
+from typing import Dict, Any, List, Optional
+
+from ..refund_request import RefundRequest
+
+
+class UploadRefundEvidence:
+    """Use case for storing evidence photos and attaching them to a refund request"""
+
+    def __init__(self, refund_request_repository, file_storage):
+        """Initialize with required dependencies"""
+        self.refund_request_repository = refund_request_repository
+        self.file_storage = file_storage
+
+    async def execute(
+        self,
+        refund_request: RefundRequest,
+        files: List,
+        allowed_types: Optional[List[str]] = None,
+        max_size_bytes: Optional[int] = None,
+        max_concurrency: int = 4
+    ) -> Dict[str, Any]:
+        """Execute the upload refund evidence use case
+
+        Args:
+            refund_request: The refund request receiving the evidence
+            files: Uploaded files to store
+            allowed_types: File types accepted by extension and content
+            max_size_bytes: Per-file size limit enforced while streaming
+            max_concurrency: Number of files streamed to storage at once
+
+        Returns:
+            Dictionary with the stored files and updated refund request
+        """
+        # Validate inputs
+        if not files:
+            raise ValueError("At least one evidence file is required")
+
+        if not refund_request.can_attach_evidence():
+            raise ValueError(
+                f"Cannot upload evidence to {refund_request.status.value} refund request "
+                f"{refund_request.refund_request_id}"
+            )
+
+        # Stream files to storage
+        stored_files = await self.file_storage.save_files_concurrently(
+            files,
+            max_concurrency=max_concurrency,
+            allowed_types=allowed_types,
+            max_size_bytes=max_size_bytes
+        )
+        file_paths = [stored_file.file_path for stored_file in stored_files]
+
+        # Record stored paths on the aggregate in a single batched write
+        try:
+            refund_request.attach_evidence(file_paths)
+            self.refund_request_repository.add_evidence_photos(
+                refund_request.refund_request_id,
+                file_paths,
+                refund_request.updated_at
+            )
+        except Exception:
+            await self.file_storage.delete_files(stored_files)
+            raise
+
+        return {
+            "refund_request_id": refund_request.refund_request_id,
+            "status": "evidence_uploaded",
+            "stored_files": stored_files,
+            "refund_request": refund_request
+        }
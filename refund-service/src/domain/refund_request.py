@@ -22,6 +22,13 @@ class RefundRequestStatus(Enum):
 class RefundRequest:
     """Aggregate root representing a customer's refund request"""
 
+    __slots__ = (
+        "refund_request_id", "support_case_number", "customer_id", "product_ids",
+        "request_reason", "evidence_photos", "status", "order_id", "created_at",
+        "updated_at", "responses", "decisions", "refund_id", "priority", "claimed_by",
+        "claim_expires_at", "version"
+    )
+
     def __init__(
         self,
         refund_request_id: str,
@@ -36,7 +43,11 @@ class RefundRequest:
         updated_at: datetime | None = None,
         responses: list['RefundResponse'] | None = None,
         decisions: list['RefundDecision'] | None = None,
-        refund_id: str | None = None  # Link to actual refund entity
+        refund_id: str | None = None,  # Link to actual refund entity
+        priority: int = 0,
+        claimed_by: str | None = None,
+        claim_expires_at: datetime | None = None,
+        version: int = 0
     ):
         self.refund_request_id = refund_request_id
         self.support_case_number = support_case_number
@@ -51,6 +62,10 @@ class RefundRequest:
         self.responses = responses or []
         self.decisions = decisions or []
         self.refund_id = refund_id
+        self.priority = priority
+        self.claimed_by = claimed_by  # Agent holding the work queue lease
+        self.claim_expires_at = claim_expires_at
+        self.version = version  # Stored version this was loaded at; 0 until first saved
 
     @property
     def has_minimum_data(self) -> bool:
@@ -74,22 +89,44 @@ class RefundRequest:
         """Mark request as completed with refund processed"""
         self.status = RefundRequestStatus.COMPLETED
         self.refund_id = refund_id
+        self.updated_at = datetime.utcnow()
 
     def cancel(self) -> None:
         """Cancel the refund request"""
         self.status = RefundRequestStatus.CANCELLED
+        self.updated_at = datetime.utcnow()
 
     def approve(self, agent_id: str, response_content: str, refund_amount: Optional[Money]) -> None:
         """Approve the refund request"""
         self.status = RefundRequestStatus.APPROVED
+        self.updated_at = datetime.utcnow()
 
     def reject(self, agent_id: str, response_content: str) -> None:
         """Reject the refund request"""
         self.status = RefundRequestStatus.REJECTED
+        self.updated_at = datetime.utcnow()
 
     def request_additional_evidence(self, agent_id: str, response_content: str) -> None:
         """Request additional evidence for the refund request"""
         self.status = RefundRequestStatus.UNDER_REVIEW
+        self.updated_at = datetime.utcnow()
+
+    def is_claimed(self, now: datetime | None = None) -> bool:
+        """Check if an agent currently holds the work queue lease"""
+        if not self.claimed_by or not self.claim_expires_at:
+            return False
+        return self.claim_expires_at > (now or datetime.utcnow())
+
+    def can_attach_evidence(self) -> bool:
+        """Check if evidence photos can still be attached"""
+        return self.status not in [RefundRequestStatus.COMPLETED, RefundRequestStatus.CANCELLED]
+
+    def attach_evidence(self, file_paths: list[str]) -> None:
+        """Attach stored evidence photos to the refund request"""
+        if not self.can_attach_evidence():
+            raise ValueError(f"Cannot attach evidence to {self.status.value} refund request")
+        self.evidence_photos.extend(file_paths)
+        self.updated_at = datetime.utcnow()
 
     def add_response(
         self,
@@ -156,7 +193,11 @@ class RefundRequest:
             "updated_at": self.updated_at.isoformat(),
             "latest_decision": latest_decision.to_dict() if latest_decision else None,
             "responses": [response.to_dict() for response in self.responses],
-            "refund_id": self.refund_id
+            "refund_id": self.refund_id,
+            "priority": self.priority,
+            "claimed_by": self.claimed_by,
+            "claim_expires_at": self.claim_expires_at.isoformat() if self.claim_expires_at else None,
+            "version": self.version
         }
 
     @classmethod
@@ -19,6 +19,11 @@ class RefundMethod(Enum):
 class RefundResponse:
     """Aggregate representing a formal response to a refund request decision"""
 
+    __slots__ = (
+        "response_id", "refund_request_id", "agent_id", "decision", "response_content",
+        "refund_amount", "attachments", "refund_method", "timestamp"
+    )
+
     def __init__(
         self,
         response_id: str,
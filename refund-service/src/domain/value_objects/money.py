@@ -3,7 +3,7 @@ from typing import Union
 from dataclasses import dataclass
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class Money:
     """Value object representing monetary amount with currency"""
     amount: Decimal
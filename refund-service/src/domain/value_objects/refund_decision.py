@@ -9,7 +9,7 @@ class RefundDecisionValue(Enum):
     NEED_MORE_INPUT = "need_more_input"
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class RefundDecision:
     """Value object representing a refund decision with reason/description"""
     decision: RefundDecisionValue
@@ -35,8 +35,12 @@ class RefundDecision:
         }
 
     @classmethod
-    def from_string(cls, decision_str: str, reason: str = "") -> 'RefundDecision':
-        """Create from string representation"""
+    def from_string(cls, decision_str: str, reason: str = "", strict: bool = False) -> 'RefundDecision':
+        """Create from string representation
+
+        Unknown decision strings fall back to a rejection, or raise
+        ValueError when ``strict`` is set.
+        """
         try:
             decision_value = RefundDecisionValue(decision_str.lower())
             return cls(decision_value, reason)
@@ -49,6 +53,8 @@ class RefundDecision:
                 return cls(RefundDecisionValue.REJECTED, reason)
             elif decision_lower in ["request_additional_evidence", "need_more_info", "request_more_info", "need_more_input"]:
                 return cls(RefundDecisionValue.NEED_MORE_INPUT, reason)
+            elif strict:
+                raise ValueError(f"Unknown decision type '{decision_str}'")
             else:
                 # Default to rejected for unknown values
                 return cls(RefundDecisionValue.REJECTED, f"Unknown decision type '{decision_str}': {reason}")
@@ -0,0 +1,91 @@
+"""In-process caches for assembled read views"""
+
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Hashable, Optional
+
+from ..config import get_config
+
+
+class TTLCache:
+    """Bounded LRU cache whose entries expire a fixed time after being stored
+
+    Meant for short-lived copies of views that are expensive to assemble,
+    such as ones that fan out to other services. Entries are process-local;
+    each worker keeps its own copy.
+    """
+
+    def __init__(self, max_size: int = 1024, ttl_seconds: float = 5.0):
+        """Initialize with the maximum number of entries and their lifetime"""
+        self.max_size = max_size
+        self.ttl_seconds = ttl_seconds
+        self._entries: "OrderedDict[Hashable, tuple[float, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        """Return the cached value for a key that has not expired yet"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+
+            expires_at, value = entry
+            if expires_at <= time.monotonic():
+                del self._entries[key]
+                return None
+
+            self._entries.move_to_end(key)
+            return value
+
+    def put(self, key: Hashable, value: Any) -> None:
+        """Cache a value for the configured lifetime"""
+        if self.max_size <= 0 or self.ttl_seconds <= 0:
+            return
+
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl_seconds, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, key: Hashable) -> None:
+        """Drop a single entry"""
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        """Drop all entries"""
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+_customer_overview_cache: Optional[TTLCache] = None
+_refund_detail_cache: Optional[TTLCache] = None
+
+
+def get_customer_overview_cache() -> TTLCache:
+    """Get the process-wide customer overview cache"""
+    global _customer_overview_cache
+    if _customer_overview_cache is None:
+        config = get_config()
+        _customer_overview_cache = TTLCache(
+            max_size=config.customer_overview_cache_size,
+            ttl_seconds=config.customer_overview_cache_ttl_seconds
+        )
+    return _customer_overview_cache
+
+
+def get_refund_detail_cache() -> TTLCache:
+    """Get the process-wide detailed refund view cache"""
+    global _refund_detail_cache
+    if _refund_detail_cache is None:
+        config = get_config()
+        _refund_detail_cache = TTLCache(
+            max_size=config.refund_detail_cache_size,
+            ttl_seconds=config.refund_detail_cache_ttl_seconds
+        )
+    return _refund_detail_cache
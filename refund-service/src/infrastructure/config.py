@@ -13,6 +13,11 @@ class Config:
         
         # Database
         self.refund_db_path = os.getenv("REFUND_DB_PATH", "data/refund.db")
+        self.lazy_row_mapping = os.getenv("REFUND_LAZY_ROW_MAPPING", "false").lower() == "true"
+        self.group_commit_enabled = os.getenv("REFUND_GROUP_COMMIT", "false").lower() == "true"
+        self.group_commit_window_ms = float(os.getenv("REFUND_GROUP_COMMIT_WINDOW_MS", "2"))
+        self.group_commit_max_batch = int(os.getenv("REFUND_GROUP_COMMIT_MAX_BATCH", "64"))
+        self.read_pool_size = int(os.getenv("REFUND_READ_POOL_SIZE", "4"))
         
         # Service
         self.service_port = int(os.getenv("REFUND_SERVICE_PORT", "8001"))
@@ -21,16 +26,44 @@ class Config:
         # External services
         self.auth_service_url = os.getenv("AUTH_SERVICE_URL", "http://localhost:8080")
         self.shop_service_url = os.getenv("SHOP_SERVICE_URL", "http://localhost:8081")
+        self.support_service_url = os.getenv("SUPPORT_SERVICE_URL", "http://support-service:8001")
+        
+        # Support Service call budgets and circuit breaker
+        self.support_call_timeout_seconds = float(os.getenv("SUPPORT_CALL_TIMEOUT_SECONDS", "5"))
+        self.support_lookup_budget_seconds = float(os.getenv("SUPPORT_LOOKUP_BUDGET_SECONDS", "10"))
+        self.support_circuit_failure_threshold = int(os.getenv("SUPPORT_CIRCUIT_FAILURE_THRESHOLD", "5"))
+        self.support_circuit_reset_seconds = float(os.getenv("SUPPORT_CIRCUIT_RESET_SECONDS", "30"))
         
         # CORS
         cors_origins = os.getenv("CORS_ORIGINS", "http://localhost:3000,http://localhost:3001,http://localhost:3002,http://localhost:3003")
         self.cors_origins = cors_origins.split(",") if "," in cors_origins else [cors_origins]
         
+        # Evidence file storage
+        self.evidence_upload_dir = os.getenv("EVIDENCE_UPLOAD_DIR", "uploads")
+        self.evidence_content_addressed = os.getenv("EVIDENCE_CONTENT_ADDRESSED", "false").lower() == "true"
+        self.evidence_max_file_size_mb = int(os.getenv("EVIDENCE_MAX_FILE_SIZE_MB", "10"))
+        self.evidence_allowed_types = os.getenv("EVIDENCE_ALLOWED_TYPES", "jpg,jpeg,png,gif,webp,heic,pdf").split(",")
+        self.evidence_upload_concurrency = int(os.getenv("EVIDENCE_UPLOAD_CONCURRENCY", "4"))
+        
+        # Agent work queue
+        self.refund_queue_lease_seconds = int(os.getenv("REFUND_QUEUE_LEASE_SECONDS", "900"))
+        
+        # Bulk import
+        self.refund_import_chunk_size = int(os.getenv("REFUND_IMPORT_CHUNK_SIZE", "500"))
+        
+        # Read view caching
+        self.customer_overview_cache_ttl_seconds = float(os.getenv("CUSTOMER_OVERVIEW_CACHE_TTL_SECONDS", "5"))
+        self.customer_overview_cache_size = int(os.getenv("CUSTOMER_OVERVIEW_CACHE_SIZE", "1024"))
+        self.refund_detail_cache_ttl_seconds = float(os.getenv("REFUND_DETAIL_CACHE_TTL_SECONDS", "30"))
+        self.refund_detail_cache_size = int(os.getenv("REFUND_DETAIL_CACHE_SIZE", "1024"))
+        
         # Logging
         self.log_level = os.getenv("LOG_LEVEL", "INFO")
         
         # Security
         self.auth_jwt_secret = os.getenv("AUTH_JWT_SECRET", "development-secret")
+        self.auth_jwt_algorithm = os.getenv("AUTH_JWT_ALGORITHM", "HS256")
+        self.auth_token_cache_size = int(os.getenv("AUTH_TOKEN_CACHE_SIZE", "1024"))
         
     @property
     def is_development(self) -> bool:
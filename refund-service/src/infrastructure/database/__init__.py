@@ -1,6 +1,6 @@
 """Database configuration and schema for Refund Service"""
 
-from .database_config import get_connection, init_database
+from .database_config import get_connection, init_database, unit_of_work
 from .schema import (
     CREATE_REFUND_CASES_TABLE,
     CREATE_REFUND_REQUESTS_TABLE,
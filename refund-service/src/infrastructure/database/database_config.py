@@ -3,16 +3,15 @@
 import sqlite3
 import os
 import threading
-from typing import Optional
+from typing import Callable, Iterator, Optional, TypeVar
 from contextlib import contextmanager
+from contextvars import ContextVar
 
 from ..config import get_config
-from .schema import (
-    CREATE_REFUND_CASES_TABLE,
-    CREATE_REFUND_REQUESTS_TABLE,
-    CREATE_REFUND_RESPONSES_TABLE,
-    REFUND_SERVICE_INDEXES
-)
+from .group_commit import GroupCommitWriter
+from .reader_pool import ReaderPool
+
+T = TypeVar("T")
 
 def get_database_path() -> str:
     """Get database file path"""
@@ -38,49 +37,249 @@ def get_connection() -> sqlite3.Connection:
     
     return conn
 
+
+def get_read_connection() -> sqlite3.Connection:
+    """Get a read-only connection that may be lent to other threads
+
+    ``query_only`` makes any write on it fail, so it never takes the write
+    lock. The journal mode is left alone: WAL is persistent once the
+    database has been initialized.
+    """
+    conn = sqlite3.connect(get_database_path(), check_same_thread=False)
+    conn.row_factory = sqlite3.Row
+    conn.execute("PRAGMA cache_size = -64000")  # 64MB cache
+    conn.execute("PRAGMA query_only = ON")
+    return conn
+
+
+# Process-wide reader pool, created on first read
+_reader_pool: Optional[ReaderPool] = None
+_reader_pool_lock = threading.Lock()
+
+
+def get_reader_pool() -> Optional[ReaderPool]:
+    """Get the process-wide reader pool, or None when pooling is disabled"""
+    global _reader_pool
+    config = get_config()
+    if config.read_pool_size <= 0:
+        return None
+
+    with _reader_pool_lock:
+        if _reader_pool is None:
+            _reader_pool = ReaderPool(get_read_connection, size=config.read_pool_size)
+    return _reader_pool
+
+
+def close_reader_pool() -> None:
+    """Close the pooled reader connections; a later read opens a new pool"""
+    global _reader_pool
+    with _reader_pool_lock:
+        pool, _reader_pool = _reader_pool, None
+    if pool is not None:
+        pool.close()
+
+
 @contextmanager
-def transaction():
-    """Context manager for database transactions"""
+def read_connection() -> Iterator[sqlite3.Connection]:
+    """Read-only connection for one repository read
+
+    Borrowed from the reader pool, or a fresh connection closed afterwards
+    when pooling is disabled.
+    """
+    pool = get_reader_pool()
+    if pool is not None:
+        with pool.connection() as conn:
+            yield conn
+        return
+    
     conn = get_connection()
     try:
         yield conn
-        conn.commit()
-    except Exception:
-        conn.rollback()
+    finally:
+        conn.close()
+
+
+class UnitOfWork:
+    """One connection and one transaction shared by repository calls
+
+    The connection is opened, and its immediate transaction begun, by the
+    first repository call, so work done before touching the database (such
+    as calling another service) does not hold the write lock.
+    """
+
+    def __init__(self):
+        self._conn: Optional[sqlite3.Connection] = None
+
+    @property
+    def connection(self) -> sqlite3.Connection:
+        """The shared connection, inside the unit's transaction"""
+        if self._conn is None:
+            conn = get_connection()
+            try:
+                conn.execute("BEGIN IMMEDIATE")
+            except Exception:
+                conn.close()
+                raise
+            self._conn = conn
+        return self._conn
+
+    def commit(self) -> None:
+        """Commit and close, if any repository call was made"""
+        if self._conn is not None:
+            try:
+                self._conn.commit()
+            finally:
+                self._close()
+
+    def rollback(self) -> None:
+        """Roll back and close, if any repository call was made"""
+        if self._conn is not None:
+            try:
+                self._conn.rollback()
+            finally:
+                self._close()
+
+    def _close(self) -> None:
+        self._conn.close()
+        self._conn = None
+
+
+# Unit of work running in the current task, if any
+_current_unit_of_work: ContextVar[Optional[UnitOfWork]] = ContextVar("refund_unit_of_work", default=None)
+
+
+@contextmanager
+def unit_of_work() -> Iterator[UnitOfWork]:
+    """Run every repository call in the block on one connection and one transaction
+
+    Reads inside the block see the state its writes are applied to, and
+    everything commits once when the block exits normally; any exception
+    rolls back everything the block wrote. Nested units join the
+    outermost one.
+
+    Once the first repository call is made the block holds the write
+    lock, so awaits on other services belong outside it. The connection is
+    bound to the current thread and must not be shared with worker
+    threads.
+    """
+    unit = _current_unit_of_work.get()
+    if unit is not None:
+        yield unit
+        return
+    
+    unit = UnitOfWork()
+    token = _current_unit_of_work.set(unit)
+    try:
+        yield unit
+    except BaseException:
+        unit.rollback()
         raise
+    else:
+        unit.commit()
+    finally:
+        _current_unit_of_work.reset(token)
 
 
-def init_database() -> None:
-    """Initialize database with schema and indexes"""
-    # Create a new connection for initialization
-    db_path = get_database_path()
-    os.makedirs(os.path.dirname(db_path), exist_ok=True)
+@contextmanager
+def connection() -> Iterator[sqlite3.Connection]:
+    """Connection for one repository read
+
+    The current unit of work's connection when there is one, so the read
+    sees the unit's own writes, otherwise a read-only connection.
+    """
+    unit = _current_unit_of_work.get()
+    if unit is not None:
+        yield unit.connection
+        return
     
-    conn = sqlite3.connect(db_path)
-    conn.row_factory = sqlite3.Row
+    with read_connection() as conn:
+        yield conn
+
+
+@contextmanager
+def transaction() -> Iterator[sqlite3.Connection]:
+    """Atomic write for one repository call
+
+    Inside a unit of work the write runs in a savepoint of the unit's
+    transaction: a failing call undoes only its own changes, and nothing
+    commits until the unit does. Otherwise it runs in its own immediate
+    transaction on a fresh connection.
+    """
+    unit = _current_unit_of_work.get()
+    if unit is not None:
+        conn = unit.connection
+        conn.execute("SAVEPOINT repository_write")
+        try:
+            yield conn
+        except BaseException:
+            conn.execute("ROLLBACK TO repository_write")
+            raise
+        finally:
+            conn.execute("RELEASE repository_write")
+        return
     
+    conn = get_connection()
     try:
-        # Create tables with debug logging
-        print("Creating refund_cases table...")
-        conn.execute(CREATE_REFUND_CASES_TABLE)
-        
-        print("Creating refund_requests table...")
-        conn.execute(CREATE_REFUND_REQUESTS_TABLE)
-        
-        print("Creating refund_responses table...")
-        conn.execute(CREATE_REFUND_RESPONSES_TABLE)
-        
-        # Create indexes
-        for index_sql in REFUND_SERVICE_INDEXES:
-            conn.execute(index_sql)
-        
+        conn.execute("BEGIN IMMEDIATE")
+        yield conn
         conn.commit()
-        print("Refund Service database initialized successfully")
-        
-    except Exception as e:
+    except BaseException:
         conn.rollback()
-        print(f"Error initializing database: {e}")
         raise
-    
     finally:
-        conn.close()
\ No newline at end of file
+        conn.close()
+
+
+def run_write(
+    operation: Callable[[sqlite3.Connection], T],
+    writer: Optional[GroupCommitWriter] = None
+) -> T:
+    """Run a repository write operation on a connection and return its result
+
+    Inside a unit of work the operation joins the unit's transaction, like
+    any other write there. Otherwise it is committed in a batch by the
+    group commit writer when one is given, or in its own transaction.
+    """
+    if writer is None or _current_unit_of_work.get() is not None:
+        with transaction() as conn:
+            return operation(conn)
+    return writer.execute(operation)
+
+
+# Process-wide group commit writer, created on first use when enabled
+_database_writer: Optional[GroupCommitWriter] = None
+_database_writer_lock = threading.Lock()
+
+
+def get_database_writer() -> Optional[GroupCommitWriter]:
+    """Get the process-wide group commit writer, or None when group commit is disabled"""
+    global _database_writer
+    config = get_config()
+    if not config.group_commit_enabled:
+        return None
+
+    with _database_writer_lock:
+        if _database_writer is None:
+            _database_writer = GroupCommitWriter(
+                get_connection,
+                window_seconds=config.group_commit_window_ms / 1000,
+                max_batch=config.group_commit_max_batch,
+                name="refund-db-writer"
+            )
+    return _database_writer
+
+
+def shutdown_database_writer() -> None:
+    """Commit the queued writes and stop the writer thread if it was started"""
+    if _database_writer is not None:
+        _database_writer.close()
+
+
+def init_database() -> None:
+    """Create the database schema, or bring an existing one up to date
+
+    Runs the versioned migrations, which return at once when the schema is
+    current.
+    """
+    from .migrations import migrate_schema  # migrations imports this module
+    migrate_schema()
@@ -0,0 +1,190 @@
+"""Versioned schema migrations for SQLite
+
+A database records every migration applied to it in the schema_version
+table. At startup the runner reads the highest applied version and returns
+straight away when it is the latest, so a current database costs one query
+instead of re-running every CREATE statement and column check. Otherwise
+the missing migrations are applied in version order.
+
+A migration's schema changes run in one immediate transaction. Its
+backfills then run a chunk of rows at a time, each chunk in its own short
+transaction with a pause after it, so other processes using the database
+(such as the previous release during a rolling restart) keep writing in
+between. The version is recorded once the backfills are done. A migration
+interrupted before that runs again from the start, so schema changes must
+be safe to repeat: CREATE ... IF NOT EXISTS and add_column are.
+"""
+
+import sqlite3
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Callable, Iterator, List, Sequence
+
+CREATE_SCHEMA_VERSION_TABLE = """
+CREATE TABLE IF NOT EXISTS schema_version (
+    version INTEGER PRIMARY KEY,
+    name TEXT NOT NULL,
+    applied_at TIMESTAMP NOT NULL
+)
+"""
+
+# Below every rowid, so the first backfill chunk starts at the beginning
+_BEFORE_FIRST_ROWID = -(2 ** 63)
+
+
+@dataclass(frozen=True, slots=True)
+class Backfill:
+    """Change to existing rows, applied a chunk of rows at a time
+
+    A chunk is the next run of rows of ``table`` matching ``condition``, in
+    rowid order. ``statement`` runs once per chunk, with the :first_rowid
+    and :last_rowid parameters bounding it, and should only touch rows
+    matching ``condition``. Chunks never go back to an earlier rowid, so a
+    row the statement cannot fix, such as one whose text does not parse,
+    does not stall the backfill.
+    """
+    table: str
+    condition: str
+    statement: str
+
+    @classmethod
+    def update(cls, table: str, assignments: str, condition: str) -> "Backfill":
+        """Backfill setting ``assignments`` on the rows matching ``condition``"""
+        return cls(
+            table,
+            condition,
+            f"""
+            UPDATE {table} SET {assignments}
+            WHERE rowid BETWEEN :first_rowid AND :last_rowid AND ({condition})
+            """
+        )
+
+
+@dataclass(frozen=True, slots=True)
+class Migration:
+    """One schema version: its schema changes and the backfills that follow"""
+    version: int
+    name: str
+    apply: Callable[[sqlite3.Connection], None]
+    backfills: Sequence[Backfill] = ()
+
+
+def add_column(conn: sqlite3.Connection, table: str, column: str, definition: str) -> bool:
+    """Add a column unless the table already has it
+
+    Returns:
+        True if the column was added
+    """
+    columns = {row[1] for row in conn.execute(f"PRAGMA table_info({table})")}
+    if column in columns:
+        return False
+
+    conn.execute(f"ALTER TABLE {table} ADD COLUMN {column} {definition}")
+    print(f"Added {column} column to {table} table")
+    return True
+
+
+def current_version(conn: sqlite3.Connection) -> int:
+    """Highest applied migration version, or 0 for an unversioned database"""
+    exists = conn.execute(
+        "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'schema_version'"
+    ).fetchone()
+    if exists is None:
+        return 0
+    return conn.execute("SELECT COALESCE(MAX(version), 0) FROM schema_version").fetchone()[0]
+
+
+def run_migrations(
+    conn: sqlite3.Connection,
+    migrations: Sequence[Migration],
+    batch_size: int = 1000
+) -> List[int]:
+    """Apply the migrations the database has not had yet, in version order
+
+    Safe to run from several processes at once: each migration is
+    re-checked under the write lock, and backfills only touch rows still
+    matching their condition.
+
+    Args:
+        conn: Connection in autocommit mode (``isolation_level=None``); the
+            runner issues its own BEGIN and COMMIT
+        migrations: Every migration of the service
+        batch_size: Most rows changed per backfill transaction
+
+    Returns:
+        Versions applied by this call, empty when the schema was current
+    """
+    migrations = sorted(migrations, key=lambda migration: migration.version)
+    if not migrations or current_version(conn) >= migrations[-1].version:
+        return []
+
+    conn.execute(CREATE_SCHEMA_VERSION_TABLE)
+    applied = []
+    for migration in migrations:
+        with _transaction(conn):
+            if _is_applied(conn, migration.version):
+                continue
+            migration.apply(conn)
+
+        for backfill in migration.backfills:
+            _run_backfill(conn, migration, backfill, batch_size)
+
+        with _transaction(conn):
+            recorded = conn.execute(
+                "INSERT OR IGNORE INTO schema_version (version, name, applied_at) VALUES (?, ?, ?)",
+                (migration.version, migration.name, datetime.utcnow().isoformat())
+            ).rowcount > 0
+        if recorded:
+            applied.append(migration.version)
+            print(f"Applied migration {migration.version} ({migration.name})")
+    return applied
+
+
+@contextmanager
+def _transaction(conn: sqlite3.Connection) -> Iterator[None]:
+    conn.execute("BEGIN IMMEDIATE")
+    try:
+        yield
+    except BaseException:
+        conn.execute("ROLLBACK")
+        raise
+    conn.execute("COMMIT")
+
+
+def _is_applied(conn: sqlite3.Connection, version: int) -> bool:
+    return conn.execute("SELECT 1 FROM schema_version WHERE version = ?", (version,)).fetchone() is not None
+
+
+def _run_backfill(conn: sqlite3.Connection, migration: Migration, backfill: Backfill, batch_size: int) -> None:
+    """Apply a backfill one chunk per transaction
+
+    After each chunk the write lock is left free for as long as the chunk
+    held it. Waiting writers retry on a backoff, so without the pause the
+    next chunk would usually take the lock again before they got it.
+    """
+    last_rowid = _BEFORE_FIRST_ROWID
+    changed = 0
+    while True:
+        started = time.perf_counter()
+        with _transaction(conn):
+            chunk = conn.execute(
+                f"""
+                SELECT rowid FROM {backfill.table}
+                WHERE rowid > ? AND ({backfill.condition})
+                ORDER BY rowid LIMIT ?
+                """,
+                (last_rowid, batch_size)
+            ).fetchall()
+            if not chunk:
+                break
+            changed += conn.execute(
+                backfill.statement,
+                {"first_rowid": chunk[0][0], "last_rowid": chunk[-1][0]}
+            ).rowcount
+        last_rowid = chunk[-1][0]
+        time.sleep(time.perf_counter() - started)
+
+    if changed:
+        print(f"Backfilled {changed} {backfill.table} rows for migration {migration.version} ({migration.name})")
@@ -0,0 +1,285 @@
+"""Schema migrations for Refund Service
+
+Every schema change is a numbered migration, applied once per database and
+recorded in schema_version (see migration_runner). A new change is added
+at the end of MIGRATIONS under the next version; migrations already
+released are never edited. Versions 1-7 replay what startup used to run on
+every boot. Each only adds what is missing, so they also bring unversioned
+databases of any age up to date.
+"""
+
+import os
+import sqlite3
+
+from .database_config import get_database_path
+from .migration_runner import Backfill, Migration, add_column, run_migrations
+from .schema import (
+    CHANGE_TRACKING_INDEXES,
+    CREATE_EVIDENCE_BLOBS_TABLE,
+    CREATE_EVIDENCE_REFERENCES_TABLE,
+    CREATE_REFUND_CASES_TABLE,
+    CREATE_REFUND_REQUEST_SUMMARIES_TRIGGERS,
+    CREATE_REFUND_REQUESTS_TABLE,
+    CREATE_REFUND_RESPONSES_TABLE,
+    NEXT_CHANGE_SEQ_SQL,
+    REFUND_QUEUE_INDEXES,
+    REFUND_REQUEST_SUMMARIES_INDEXES,
+    REFUND_SERVICE_INDEXES,
+    TIMESTAMP_INDEXES
+)
+from .timestamps import iso_to_epoch_us
+
+
+def _create_initial_schema(conn: sqlite3.Connection) -> None:
+    """Create the tables and their base indexes"""
+    for sql in (
+        CREATE_REFUND_CASES_TABLE,
+        CREATE_REFUND_REQUESTS_TABLE,
+        CREATE_REFUND_RESPONSES_TABLE,
+        CREATE_EVIDENCE_BLOBS_TABLE,
+        CREATE_EVIDENCE_REFERENCES_TABLE
+    ):
+        conn.execute(sql)
+    for index_sql in REFUND_SERVICE_INDEXES:
+        conn.execute(index_sql)
+
+
+def _add_work_queue(conn: sqlite3.Connection) -> None:
+    """Add the agent work queue priority and lease columns"""
+    add_column(conn, "refund_requests", "priority", "INTEGER NOT NULL DEFAULT 0")
+    add_column(conn, "refund_requests", "claimed_by", "TEXT")
+    add_column(conn, "refund_requests", "claim_expires_at", "TIMESTAMP")
+    for index_sql in REFUND_QUEUE_INDEXES:
+        conn.execute(index_sql)
+
+
+def _add_epoch_timestamps(conn: sqlite3.Connection) -> None:
+    """Add the integer epoch-microsecond timestamp columns
+
+    Rows written before the columns existed are encoded from their ISO
+    text by the migration's backfills.
+    """
+    add_column(conn, "refund_requests", "created_at_us", "INTEGER")
+    add_column(conn, "refund_responses", "timestamp_us", "INTEGER")
+    for index_sql in TIMESTAMP_INDEXES:
+        conn.execute(index_sql)
+
+
+def _add_updated_at(conn: sqlite3.Connection) -> None:
+    """Add updated_at to refund requests
+
+    Existing rows were last changed no later than their creation as far as
+    anyone can tell, so the backfill copies created_at.
+    """
+    add_column(conn, "refund_requests", "updated_at", "TIMESTAMP")
+    add_column(conn, "refund_requests", "updated_at_us", "INTEGER")
+
+
+def _add_change_feed(conn: sqlite3.Connection) -> None:
+    """Add the change feed position to refund requests
+
+    Existing rows are numbered by the migration's backfill, in updated_at
+    order within each chunk; the repository numbers every later write
+    itself.
+    """
+    add_column(conn, "refund_requests", "change_seq", "INTEGER")
+    for index_sql in CHANGE_TRACKING_INDEXES:
+        conn.execute(index_sql)
+
+
+# The read model statements as migration 6 released them, before the
+# summaries carried the request version. A released migration keeps its own
+# copy of what it ran, so later changes to schema.py cannot change it.
+_CREATE_REFUND_REQUEST_SUMMARIES_TABLE_V6 = """
+CREATE TABLE IF NOT EXISTS refund_request_summaries (
+    refund_request_id TEXT PRIMARY KEY,
+    support_case_number TEXT NOT NULL,
+    customer_id TEXT NOT NULL,
+    order_id TEXT,
+    status TEXT NOT NULL,
+    latest_response_type TEXT,
+    refund_amount TEXT,
+    refund_method TEXT,
+    agent_id TEXT,
+    latest_response_at TIMESTAMP,
+    created_at TIMESTAMP,
+    updated_at TIMESTAMP,
+    created_at_us INTEGER,
+    updated_at_us INTEGER
+);
+"""
+
+_REFRESH_REFUND_REQUEST_SUMMARIES_SQL_V6 = """
+    INSERT OR REPLACE INTO refund_request_summaries
+    (refund_request_id, support_case_number, customer_id, order_id, status,
+     latest_response_type, refund_amount, refund_method, agent_id, latest_response_at,
+     created_at, updated_at, created_at_us, updated_at_us)
+    SELECT r.refund_request_id, r.support_case_number, r.customer_id, r.order_id, r.status,
+           s.response_type, s.refund_amount, s.refund_method, s.agent_id, s.timestamp,
+           r.created_at, r.updated_at, r.created_at_us, r.updated_at_us
+    FROM refund_requests r
+    LEFT JOIN refund_responses s ON s.response_id = (
+        SELECT response_id FROM refund_responses
+        WHERE refund_request_id = r.refund_request_id
+        ORDER BY timestamp_us DESC
+        LIMIT 1
+    )
+    WHERE {condition};
+"""
+
+_CREATE_REFUND_REQUEST_SUMMARIES_TRIGGERS_V6 = [
+    f"""
+    CREATE TRIGGER IF NOT EXISTS {name} AFTER {event} BEGIN
+        {_REFRESH_REFUND_REQUEST_SUMMARIES_SQL_V6.format(condition=f'r.refund_request_id = {row}.refund_request_id')}
+    END;
+    """
+    for name, event, row in (
+        ("refund_request_summaries_insert", "INSERT ON refund_requests", "new"),
+        ("refund_request_summaries_update", "UPDATE ON refund_requests", "new"),
+        ("refund_request_summaries_response_insert", "INSERT ON refund_responses", "new"),
+        ("refund_request_summaries_response_delete", "DELETE ON refund_responses", "old"),
+    )
+] + [
+    """
+    CREATE TRIGGER IF NOT EXISTS refund_request_summaries_delete AFTER DELETE ON refund_requests BEGIN
+        DELETE FROM refund_request_summaries WHERE refund_request_id = old.refund_request_id;
+    END;
+    """
+]
+
+
+def _add_refund_request_summaries(conn: sqlite3.Connection) -> None:
+    """Create the refund request read model
+
+    The triggers only project rows written from now on, so the summaries
+    of existing refund requests are built by the migration's backfill.
+    """
+    conn.execute(_CREATE_REFUND_REQUEST_SUMMARIES_TABLE_V6)
+    for sql in REFUND_REQUEST_SUMMARIES_INDEXES + _CREATE_REFUND_REQUEST_SUMMARIES_TRIGGERS_V6:
+        conn.execute(sql)
+    conn.execute(
+        """
+        DELETE FROM refund_request_summaries
+        WHERE refund_request_id NOT IN (SELECT refund_request_id FROM refund_requests)
+        """
+    )
+
+
+# Refund requests the read model has no row for yet
+_MISSING_SUMMARY = "refund_request_id NOT IN (SELECT refund_request_id FROM refund_request_summaries)"
+
+
+def _add_version(conn: sqlite3.Connection) -> None:
+    """Add the optimistic concurrency version; existing rows start at 1"""
+    add_column(conn, "refund_requests", "version", "INTEGER NOT NULL DEFAULT 1")
+
+
+def _add_refund_request_summary_version(conn: sqlite3.Connection) -> None:
+    """Carry the refund request version in the read model
+
+    Triggers keep the statement they were created with, so they are
+    recreated to copy the version on every write. Existing summaries are
+    brought up to their request's version by the migration's backfill.
+    """
+    add_column(conn, "refund_request_summaries", "version", "INTEGER NOT NULL DEFAULT 1")
+    triggers = conn.execute(
+        "SELECT name FROM sqlite_master WHERE type = 'trigger' AND name LIKE 'refund_request_summaries_%'"
+    ).fetchall()
+    for (name,) in triggers:
+        conn.execute(f"DROP TRIGGER {name}")
+    for trigger_sql in CREATE_REFUND_REQUEST_SUMMARIES_TRIGGERS:
+        conn.execute(trigger_sql)
+
+
+# Current version of the refund request a summary row projects
+_REQUEST_VERSION = (
+    "(SELECT r.version FROM refund_requests r"
+    " WHERE r.refund_request_id = refund_request_summaries.refund_request_id)"
+)
+
+
+MIGRATIONS = [
+    Migration(1, "initial_schema", _create_initial_schema),
+    Migration(2, "work_queue", _add_work_queue),
+    Migration(3, "epoch_timestamps", _add_epoch_timestamps, backfills=(
+        Backfill.update(
+            "refund_requests",
+            "created_at_us = iso_to_epoch_us(created_at)",
+            "created_at_us IS NULL AND created_at IS NOT NULL"
+        ),
+        Backfill.update(
+            "refund_responses",
+            "timestamp_us = iso_to_epoch_us(timestamp)",
+            "timestamp_us IS NULL AND timestamp IS NOT NULL"
+        ),
+    )),
+    Migration(4, "updated_at", _add_updated_at, backfills=(
+        Backfill.update(
+            "refund_requests",
+            "updated_at = created_at, updated_at_us = created_at_us",
+            "updated_at IS NULL"
+        ),
+    )),
+    Migration(5, "change_feed", _add_change_feed, backfills=(
+        Backfill(
+            "refund_requests",
+            "change_seq IS NULL",
+            f"""
+            UPDATE refund_requests SET change_seq = numbered.position
+            FROM (
+                SELECT rowid AS row_id,
+                       {NEXT_CHANGE_SEQ_SQL} - 1 + ROW_NUMBER() OVER (ORDER BY updated_at_us, rowid) AS position
+                FROM refund_requests
+                WHERE rowid BETWEEN :first_rowid AND :last_rowid AND change_seq IS NULL
+            ) AS numbered
+            WHERE refund_requests.rowid = numbered.row_id
+            """
+        ),
+    )),
+    Migration(6, "refund_request_summaries", _add_refund_request_summaries, backfills=(
+        Backfill(
+            "refund_requests",
+            _MISSING_SUMMARY,
+            _REFRESH_REFUND_REQUEST_SUMMARIES_SQL_V6.format(
+                condition=f"r.rowid BETWEEN :first_rowid AND :last_rowid AND r.{_MISSING_SUMMARY}"
+            )
+        ),
+    )),
+    Migration(7, "optimistic_concurrency", _add_version),
+    Migration(8, "refund_request_summary_version", _add_refund_request_summary_version, backfills=(
+        Backfill.update(
+            "refund_request_summaries",
+            f"version = {_REQUEST_VERSION}",
+            f"version <> {_REQUEST_VERSION}"
+        ),
+    )),
+]
+
+
+def _connect() -> sqlite3.Connection:
+    """Open the migration connection; the runner manages its transactions"""
+    db_path = get_database_path()
+    os.makedirs(os.path.dirname(db_path), exist_ok=True)
+
+    conn = sqlite3.connect(db_path, isolation_level=None)
+    conn.row_factory = sqlite3.Row
+    conn.execute("PRAGMA foreign_keys = ON")
+    conn.execute("PRAGMA journal_mode = WAL")
+    conn.create_function("iso_to_epoch_us", 1, iso_to_epoch_us, deterministic=True)
+    return conn
+
+
+def migrate_schema() -> None:
+    """Apply the migrations this database has not had yet
+
+    A no-op costing one query when the schema is current.
+    """
+    conn = _connect()
+    try:
+        if run_migrations(conn, MIGRATIONS):
+            print("Schema migration completed successfully")
+    except Exception as e:
+        print(f"Migration error: {e}")
+        raise
+    finally:
+        conn.close()
@@ -23,7 +23,15 @@ CREATE TABLE IF NOT EXISTS refund_requests (
     status TEXT NOT NULL CHECK(status IN ('pending', 'approved', 'rejected', 'decision_made', 'completed', 'cancelled')),
     order_id TEXT,
     created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-    refund_id TEXT
+    refund_id TEXT,
+    priority INTEGER NOT NULL DEFAULT 0, -- higher is claimed first from the work queue
+    claimed_by TEXT, -- agent holding the work queue lease
+    claim_expires_at TIMESTAMP, -- lease expiry; NULL or past means claimable
+    created_at_us INTEGER, -- created_at as microseconds since the Unix epoch (UTC)
+    updated_at TIMESTAMP,
+    updated_at_us INTEGER, -- updated_at as microseconds since the Unix epoch (UTC)
+    change_seq INTEGER, -- position in the change feed; bumped on every write to the row
+    version INTEGER NOT NULL DEFAULT 1 -- optimistic concurrency; bumped on every write to the row
 );
 """
 
@@ -38,15 +46,149 @@ CREATE TABLE IF NOT EXISTS refund_responses (
     refund_amount TEXT,
     refund_method TEXT CHECK(refund_method IN ('money', 'voucher', 'replacement')),
     timestamp TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    timestamp_us INTEGER, -- timestamp as microseconds since the Unix epoch (UTC)
     FOREIGN KEY (refund_request_id) REFERENCES refund_requests(refund_request_id)
 );
 """
 
+CREATE_EVIDENCE_BLOBS_TABLE = """
+CREATE TABLE IF NOT EXISTS evidence_blobs (
+    checksum TEXT PRIMARY KEY, -- hex SHA-256 of the blob content
+    blob_path TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    ref_count INTEGER NOT NULL DEFAULT 0,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+"""
+
+CREATE_EVIDENCE_REFERENCES_TABLE = """
+CREATE TABLE IF NOT EXISTS evidence_references (
+    file_path TEXT PRIMARY KEY, -- path handed out to callers
+    checksum TEXT NOT NULL,
+    original_filename TEXT,
+    content_type TEXT,
+    is_hard_link BOOLEAN DEFAULT FALSE, -- FALSE means a pointer record resolved through evidence_blobs
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    FOREIGN KEY (checksum) REFERENCES evidence_blobs(checksum)
+);
+"""
+
 # Case timeline table removed - using refund_responses for audit trail instead
 
 # Indexes for performance
 REFUND_SERVICE_INDEXES = [
     "CREATE INDEX IF NOT EXISTS idx_refund_requests_case ON refund_requests(support_case_number);",
     "CREATE INDEX IF NOT EXISTS idx_refund_requests_customer ON refund_requests(customer_id);",
-    "CREATE INDEX IF NOT EXISTS idx_refund_requests_status ON refund_requests(status);"
+    "CREATE INDEX IF NOT EXISTS idx_refund_requests_status ON refund_requests(status);",
+    "CREATE INDEX IF NOT EXISTS idx_evidence_references_checksum ON evidence_references(checksum);"
+]
+
+# Agent work queue: partial indexes only cover pending requests, so claiming
+# walks the queue in order without touching decided rows
+REFUND_QUEUE_INDEXES = [
+    """CREATE INDEX IF NOT EXISTS idx_refund_requests_queue
+       ON refund_requests(priority DESC, created_at, claim_expires_at)
+       WHERE status = 'pending';""",
+    """CREATE INDEX IF NOT EXISTS idx_refund_requests_claimed_by
+       ON refund_requests(claimed_by)
+       WHERE status = 'pending' AND claimed_by IS NOT NULL;"""
+]
+
+# Integer epoch-microsecond timestamps: creation-date range filters and
+# per-request response timelines are served straight from these indexes
+TIMESTAMP_INDEXES = [
+    "CREATE INDEX IF NOT EXISTS idx_refund_requests_created ON refund_requests(created_at_us);",
+    """CREATE INDEX IF NOT EXISTS idx_refund_responses_timeline
+       ON refund_responses(refund_request_id, timestamp_us);"""
+]
+
+# Change tracking: the delta-sync feed walks change_seq, and updated-since
+# filters use updated_at_us
+CHANGE_TRACKING_INDEXES = [
+    "CREATE INDEX IF NOT EXISTS idx_refund_requests_updated ON refund_requests(updated_at_us);",
+    "CREATE UNIQUE INDEX IF NOT EXISTS idx_refund_requests_change_seq ON refund_requests(change_seq);"
+]
+
+# Next change feed position, evaluated under the write lock by the statement
+# that changes a refund request, so positions follow commit order
+NEXT_CHANGE_SEQ_SQL = "(SELECT COALESCE(MAX(change_seq), 0) + 1 FROM refund_requests)"
+
+# Read model for agent dashboards: one row per refund request with its
+# current status and latest response, kept in step by the triggers below
+CREATE_REFUND_REQUEST_SUMMARIES_TABLE = """
+CREATE TABLE IF NOT EXISTS refund_request_summaries (
+    refund_request_id TEXT PRIMARY KEY,
+    support_case_number TEXT NOT NULL,
+    customer_id TEXT NOT NULL,
+    order_id TEXT,
+    status TEXT NOT NULL,
+    latest_response_type TEXT, -- NULL until the first response
+    refund_amount TEXT,
+    refund_method TEXT,
+    agent_id TEXT, -- agent who wrote the latest response
+    latest_response_at TIMESTAMP,
+    created_at TIMESTAMP,
+    updated_at TIMESTAMP,
+    created_at_us INTEGER,
+    updated_at_us INTEGER,
+    version INTEGER NOT NULL DEFAULT 1 -- the refund request's optimistic concurrency version
+);
+"""
+
+REFUND_REQUEST_SUMMARIES_INDEXES = [
+    "CREATE INDEX IF NOT EXISTS idx_refund_request_summaries_created ON refund_request_summaries(created_at_us);",
+    """CREATE INDEX IF NOT EXISTS idx_refund_request_summaries_customer
+       ON refund_request_summaries(customer_id, created_at_us);"""
+]
+
+# Rebuilds the summary rows of the refund requests matching {condition},
+# taking the latest response from the per-request timeline index
+REFRESH_REFUND_REQUEST_SUMMARIES_SQL = """
+    INSERT OR REPLACE INTO refund_request_summaries
+    (refund_request_id, support_case_number, customer_id, order_id, status,
+     latest_response_type, refund_amount, refund_method, agent_id, latest_response_at,
+     created_at, updated_at, created_at_us, updated_at_us, version)
+    SELECT r.refund_request_id, r.support_case_number, r.customer_id, r.order_id, r.status,
+           s.response_type, s.refund_amount, s.refund_method, s.agent_id, s.timestamp,
+           r.created_at, r.updated_at, r.created_at_us, r.updated_at_us, r.version
+    FROM refund_requests r
+    LEFT JOIN refund_responses s ON s.response_id = (
+        SELECT response_id FROM refund_responses
+        WHERE refund_request_id = r.refund_request_id
+        ORDER BY timestamp_us DESC
+        LIMIT 1
+    )
+    WHERE {condition};
+"""
+
+# The summary is refreshed inside the statement that changes its sources, so
+# it commits or rolls back with every repository write. INSERT OR REPLACE only
+# fires the delete triggers with recursive_triggers on, so the insert trigger
+# covers replaced refund requests.
+CREATE_REFUND_REQUEST_SUMMARIES_TRIGGERS = [
+    f"""
+    CREATE TRIGGER IF NOT EXISTS refund_request_summaries_insert AFTER INSERT ON refund_requests BEGIN
+        {REFRESH_REFUND_REQUEST_SUMMARIES_SQL.format(condition="r.refund_request_id = new.refund_request_id")}
+    END;
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS refund_request_summaries_update AFTER UPDATE ON refund_requests BEGIN
+        {REFRESH_REFUND_REQUEST_SUMMARIES_SQL.format(condition="r.refund_request_id = new.refund_request_id")}
+    END;
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS refund_request_summaries_delete AFTER DELETE ON refund_requests BEGIN
+        DELETE FROM refund_request_summaries WHERE refund_request_id = old.refund_request_id;
+    END;
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS refund_request_summaries_response_insert AFTER INSERT ON refund_responses BEGIN
+        {REFRESH_REFUND_REQUEST_SUMMARIES_SQL.format(condition="r.refund_request_id = new.refund_request_id")}
+    END;
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS refund_request_summaries_response_delete AFTER DELETE ON refund_responses BEGIN
+        {REFRESH_REFUND_REQUEST_SUMMARIES_SQL.format(condition="r.refund_request_id = old.refund_request_id")}
+    END;
+    """
 ]
@@ -1,60 +1,171 @@
 """Authentication middleware for Refund Service"""
 
-from fastapi import Request, HTTPException, status, Depends
+import hashlib
+import threading
+import time
+from collections import OrderedDict
 from typing import Optional
-import httpx
+
+from fastapi import Request, HTTPException, status, Depends
+from jose import jwt, JWTError, ExpiredSignatureError
+
+from ..config import get_config
+
+
+class VerifiedTokenCache:
+    """LRU cache of verified JWT claims keyed by token hash
+
+    Entries never outlive the token's own ``exp`` claim, so a cached token is
+    rejected at exactly the moment signature verification would reject it.
+    """
+
+    def __init__(self, max_size: int = 1024):
+        """Initialize with the maximum number of cached tokens"""
+        self.max_size = max_size
+        self._entries: "OrderedDict[str, tuple[float, dict]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _key(token: str) -> str:
+        """Hash the token so raw credentials are never kept in memory"""
+        return hashlib.sha256(token.encode("utf-8")).hexdigest()
+
+    def get(self, token: str) -> Optional[dict]:
+        """Return cached user info for a token that has not expired yet"""
+        key = self._key(token)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+
+            expires_at, user_info = entry
+            if expires_at <= time.time():
+                del self._entries[key]
+                return None
+
+            self._entries.move_to_end(key)
+            return user_info
+
+    def put(self, token: str, user_info: dict, expires_at: float) -> None:
+        """Cache user info for a verified token until its expiry"""
+        if self.max_size <= 0 or expires_at <= time.time():
+            return
+
+        key = self._key(token)
+        with self._lock:
+            self._entries[key] = (expires_at, user_info)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        """Drop all cached tokens"""
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+_token_cache: Optional[VerifiedTokenCache] = None
+
+
+def get_token_cache() -> VerifiedTokenCache:
+    """Get the process-wide verified token cache"""
+    global _token_cache
+    if _token_cache is None:
+        _token_cache = VerifiedTokenCache(get_config().auth_token_cache_size)
+    return _token_cache
+
+
+def _claims_to_user_info(claims: dict) -> dict:
+    """Map verified JWT claims to the user info dict used by route dependencies"""
+    roles = claims.get("roles")
+    if roles is None:
+        roles = [claims["role"]] if claims.get("role") else []
+    elif isinstance(roles, str):
+        roles = [roles]
+
+    return {
+        "user_id": claims["sub"],
+        "roles": list(roles),
+        "email": claims.get("email")
+    }
+
+
+def verify_token(token: str) -> dict:
+    """Verify a JWT and return the user info it carries
+
+    Verified tokens are served from the LRU cache until they expire, so
+    repeated calls within one session only pay for the signature check once.
+    """
+    cache = get_token_cache()
+    user_info = cache.get(token)
+    if user_info is not None:
+        return user_info
+
+    config = get_config()
+    try:
+        claims = jwt.decode(
+            token,
+            config.auth_jwt_secret,
+            algorithms=[config.auth_jwt_algorithm]
+        )
+    except ExpiredSignatureError:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Token expired"
+        )
+    except JWTError:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Token validation failed"
+        )
+
+    if not claims.get("sub"):
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Token is missing subject claim"
+        )
+
+    user_info = _claims_to_user_info(claims)
+
+    # Only tokens with an expiry are cached; the cache entry is bounded by it
+    if isinstance(claims.get("exp"), (int, float)):
+        cache.put(token, user_info, float(claims["exp"]))
+
+    return user_info
 
 
 async def get_current_user(request: Request) -> dict:
     """Extract and validate user from request headers"""
-    
+
     # Get authorization header
     auth_header = request.headers.get("Authorization")
-    
+
     if not auth_header:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Authorization header required"
         )
-    
+
     # Extract token (assuming Bearer token)
     if not auth_header.startswith("Bearer "):
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Bearer token required"
         )
-    
+
     token = auth_header[7:]  # Remove "Bearer " prefix
-    
-    # Verify token with external auth service
-    try:
-        # In production, this would call the actual auth service
-        # For now, we'll validate the format and extract basic info
-        
-        # Mock validation - extract user info from token format
-        # This would normally be a JWT validation call
-        if not token or len(token) < 10:
-            raise HTTPException(
-                status_code=status.HTTP_401_UNAUTHORIZED,
-                detail="Invalid token format"
-            )
-        
-        # Mock user extraction - in real implementation
-        # this would decode JWT or call auth service API
-        user_info = {
-            "user_id": "user-123",  # Extract from token
-            "roles": ["customer"],  # Extract role information
-            "email": "customer@example.com"
-        }
-        
-        return user_info
-        
-    except Exception as e:
+
+    if not token:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="Token validation failed"
+            detail="Invalid token format"
         )
 
+    return verify_token(token)
+
 
 def require_role(required_role: str):
     """Create dependency to require specific role"""
@@ -75,4 +186,4 @@ def require_agent_role():
 
 def require_customer_role():
     """Shortcut for requiring customer role"""
-    return require_role("customer")
\ No newline at end of file
+    return require_role("customer")
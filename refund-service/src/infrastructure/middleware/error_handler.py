@@ -1,35 +1,34 @@
-"""Error handling middleware for Refund Service"""
+"""Error handling for Refund Service"""
 
-from fastapi import Request, HTTPException
+from fastapi import Request
 from fastapi.responses import JSONResponse
 import logging
+import traceback
 
 logger = logging.getLogger(__name__)
 
 
-async def error_handler(request: Request, call_next):
-    """Global error handler middleware"""
-    try:
-        response = await call_next(request)
-        return response
-        
-    except HTTPException as e:
-        # FastAPI's HTTP exceptions - pass through
-        raise e
-        
-    except Exception as e:
-        # Log unexpected errors with full traceback
-        logger.error(f"Unexpected error: {e}", exc_info=True)
-        logger.error(f"Full error details: {type(e).__name__}: {str(e)}")
-        
-        import traceback
-        logger.error(f"Full traceback:\n{traceback.format_exc()}")
-        
-        return JSONResponse(
-            status_code=500,
-            content={
-                "error": "Internal Server Error",
-                "message": f"An unexpected error occurred: {type(e).__name__}: {str(e)}",
-                "request_id": str(request.scope.get("request_id", "unknown"))
-            }
-        )
\ No newline at end of file
+async def error_handler(request: Request, exc: Exception) -> JSONResponse:
+    """Global handler for unexpected errors
+
+    Registered with ``app.add_exception_handler(Exception, error_handler)``
+    rather than as an HTTP middleware: ``BaseHTTPMiddleware`` only relays
+    ``http.response.body`` messages, so it would break evidence downloads
+    sent with the zero-copy or pathsend ASGI extensions. HTTPExceptions are
+    handled by FastAPI before they get here.
+    """
+    # Log unexpected errors with full traceback
+    logger.error(f"Unexpected error: {exc}", exc_info=exc)
+    logger.error(f"Full error details: {type(exc).__name__}: {str(exc)}")
+
+    formatted = "".join(traceback.format_exception(exc))
+    logger.error(f"Full traceback:\n{formatted}")
+
+    return JSONResponse(
+        status_code=500,
+        content={
+            "error": "Internal Server Error",
+            "message": f"An unexpected error occurred: {type(exc).__name__}: {str(exc)}",
+            "request_id": str(request.scope.get("request_id", "unknown"))
+        }
+    )
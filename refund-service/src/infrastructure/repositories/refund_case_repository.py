@@ -2,7 +2,7 @@
 import sqlite3
 from typing import List, Optional
 from uuid import uuid4
-from ..database.database_config import get_connection
+from ..database.database_config import connection, transaction
 
 
 class RefundCaseRepository:
@@ -10,8 +10,7 @@ class RefundCaseRepository:
 
     def save(self, refund_case) -> None:
         """Save a refund case to the database"""
-        conn = get_connection()
-        try:
+        with transaction() as conn:
             cursor = conn.cursor()
             cursor.execute(
                 """
@@ -29,15 +28,11 @@ class RefundCaseRepository:
                     refund_case.updated_at.isoformat() if hasattr(refund_case.updated_at, 'isoformat') else refund_case.updated_at
                 )
             )
-            conn.commit()
             print(f"Saved refund case {refund_case.refund_case_id}")
-        finally:
-            conn.close()
 
     def find_by_case_id(self, refund_case_id: str):
         """Find a refund case by ID"""
-        conn = get_connection()
-        try:
+        with connection() as conn:
             cursor = conn.cursor()
             cursor.execute(
                 "SELECT * FROM refund_cases WHERE refund_case_id = ?",
@@ -57,13 +52,10 @@ class RefundCaseRepository:
             else:
                 print(f"Refund case {refund_case_id} not found")
                 return None
-        finally:
-            conn.close()
 
     def find_by_customer_id(self, customer_id: str) -> List:
         """Find all refund cases for a customer"""
-        conn = get_connection()
-        try:
+        with connection() as conn:
             cursor = conn.cursor()
             cursor.execute(
                 "SELECT * FROM refund_cases WHERE customer_id = ?",
@@ -82,13 +74,10 @@ class RefundCaseRepository:
                 cases.append(SimpleRefundCase(dict(row)))
             
             return cases
-        finally:
-            conn.close()
 
     def find_all(self) -> List:
         """Find all refund cases"""
-        conn = get_connection()
-        try:
+        with connection() as conn:
             cursor = conn.cursor()
             cursor.execute("SELECT * FROM refund_cases")
             rows = cursor.fetchall()
@@ -104,39 +93,30 @@ class RefundCaseRepository:
                 cases.append(SimpleRefundCase(dict(row)))
             
             return cases
-        finally:
-            conn.close()
 
     def update_status(self, refund_case_id: str, new_status: str) -> bool:
         """Update the status of a refund case"""
-        conn = get_connection()
-        try:
+        with transaction() as conn:
             cursor = conn.cursor()
             cursor.execute(
                 "UPDATE refund_cases SET status = ?, updated_at = CURRENT_TIMESTAMP WHERE refund_case_id = ?",
                 (new_status, refund_case_id)
             )
-            conn.commit()
-            
             if cursor.rowcount > 0:
                 print(f"Successfully updated refund case {refund_case_id} status to {new_status}")
                 return True
             else:
                 print(f"Failed to update refund case {refund_case_id} - not found")
                 return False
-        finally:
-            conn.close()
 
     def delete_by_case_id(self, refund_case_id: str) -> bool:
         """Delete a refund case by ID"""
-        conn = get_connection()
-        try:
+        with transaction() as conn:
             cursor = conn.cursor()
             cursor.execute(
                 "DELETE FROM refund_cases WHERE refund_case_id = ?",
                 (refund_case_id,)
             )
-            conn.commit()
             deleted = cursor.rowcount > 0
             
             if deleted:
@@ -145,5 +125,3 @@ class RefundCaseRepository:
                 print(f"Refund case {refund_case_id} not found for deletion")
             
             return deleted
-        finally:
-            conn.close()
\ No newline at end of file
@@ -1,160 +1,426 @@
-from datetime import datetime
+from datetime import datetime, timedelta
 
-from domain.refund_request import RefundRequest, RefundRequestStatus
+from domain.refund_request import RefundRequest
+from domain.refund_response import RefundResponse
 
-from ..database.database_config import get_connection
+from ..database.database_config import connection, run_write, transaction
+from ..database.group_commit import GroupCommitWriter
+from ..database.schema import NEXT_CHANGE_SEQ_SQL
+from ..database.timestamps import to_epoch_us
+from .refund_response_repository import INSERT_RESPONSE_SQL, response_to_row
+from .row_mappers import REFUND_REQUEST_COLUMNS, map_refund_request, map_refund_request_lazy
+
+
+INSERT_REFUND_REQUEST_SQL = f"""
+    INSERT INTO refund_requests
+    (refund_request_id, support_case_number, customer_id, product_ids, request_reason,
+     evidence_photos, status, order_id, created_at, refund_id,
+     priority, claimed_by, claim_expires_at, created_at_us,
+     updated_at, updated_at_us, change_seq, version)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, {NEXT_CHANGE_SEQ_SQL}, 1)
+"""
+
+# Inserts a new refund request unless its ID is taken, which leaves rowcount 0
+INSERT_NEW_REFUND_REQUEST_SQL = INSERT_REFUND_REQUEST_SQL + "    ON CONFLICT (refund_request_id) DO NOTHING\n"
+
+# Compare-and-swap: only applies if the row is still at the version the
+# aggregate was loaded at. Takes the INSERT_REFUND_REQUEST_SQL parameters
+# followed by the expected version.
+UPDATE_REFUND_REQUEST_SQL = f"""
+    UPDATE refund_requests
+    SET support_case_number = ?2, customer_id = ?3, product_ids = ?4, request_reason = ?5,
+        evidence_photos = ?6, status = ?7, order_id = ?8, created_at = ?9, refund_id = ?10,
+        priority = ?11, claimed_by = ?12, claim_expires_at = ?13, created_at_us = ?14,
+        updated_at = ?15, updated_at_us = ?16, change_seq = {NEXT_CHANGE_SEQ_SQL},
+        version = version + 1
+    WHERE refund_request_id = ?1 AND version = ?17
+"""
+
+
+class ConcurrentUpdateError(Exception):
+    """Raised when a refund request changed since it was loaded"""
+
+    def __init__(self, refund_request_id: str, expected_version: int):
+        self.refund_request_id = refund_request_id
+        self.expected_version = expected_version
+        if expected_version == 0:
+            message = f"Refund request {refund_request_id} already exists"
+        else:
+            message = (
+                f"Refund request {refund_request_id} was changed by another writer "
+                f"since version {expected_version}; reload it and retry"
+            )
+        super().__init__(message)
 
 
 class RefundRequestRepository:
     """Repository for RefundRequest aggregate persistence"""
 
+    def __init__(self, lazy: bool = False, writer: GroupCommitWriter | None = None):
+        """Initialize the repository
+
+        Args:
+            lazy: Return refund requests that parse timestamps and list
+                columns on first access instead of while loading
+            writer: Group commit writer for saves made outside a unit of
+                work; without one each save commits on its own
+        """
+        self._map_row = map_refund_request_lazy if lazy else map_refund_request
+        self._writer = writer
+
     def save(self, refund_request: RefundRequest) -> None:
-        """Save a refund request to the database"""
-        conn = get_connection()
-        try:
-            cursor = conn.cursor()
+        """Save a refund request to the database
+
+        A new refund request (version 0) is inserted. A loaded one is
+        written back only if nobody else changed it since it was loaded,
+        so concurrent writers never overwrite each other without holding
+        a lock between read and write. The aggregate's version is advanced
+        to match the stored row.
+
+        Raises:
+            ConcurrentUpdateError: The stored row changed since it was
+                loaded, or a new refund request's ID is already taken
+        """
+        row = self._refund_request_to_row(refund_request)
+        version = refund_request.version
+
+        def write(conn):
+            if version == 0:
+                cursor = conn.execute(INSERT_NEW_REFUND_REQUEST_SQL, row)
+            else:
+                cursor = conn.execute(UPDATE_REFUND_REQUEST_SQL, row + (version,))
+            if cursor.rowcount == 0:
+                raise ConcurrentUpdateError(refund_request.refund_request_id, version)
+
+        run_write(write, self._writer)
+        refund_request.version = version + 1
+
+    def save_many(self, refund_requests: list[RefundRequest]) -> None:
+        """Insert many new refund requests in a single transaction"""
+        if not refund_requests:
+            return
+
+        rows = [self._refund_request_to_row(refund_request) for refund_request in refund_requests]
+        run_write(lambda conn: conn.executemany(INSERT_REFUND_REQUEST_SQL, rows), self._writer)
+        for refund_request in refund_requests:
+            refund_request.version = 1
+
+    def add_evidence_photos(
+        self,
+        refund_request_id: str,
+        file_paths: list[str],
+        updated_at: datetime | None = None
+    ) -> bool:
+        """Append evidence photo paths to a refund request in a single write
+
+        Appends in SQL rather than rewriting the row, so concurrent uploads
+        to the same request never drop each other's files.
+        """
+        if not file_paths:
+            return False
 
-            # Convert refund request to dictionary
-            data = refund_request.to_dict()
-            
+        updated_at = updated_at or datetime.utcnow()
 
+        joined_paths = ",".join(file_paths)
+        with transaction() as conn:
+            cursor = conn.execute(
+                f"""
+                UPDATE refund_requests
+                SET evidence_photos = CASE
+                        WHEN evidence_photos IS NULL OR evidence_photos = '' THEN ?
+                        ELSE evidence_photos || ',' || ?
+                    END,
+                    updated_at = ?, updated_at_us = ?, change_seq = {NEXT_CHANGE_SEQ_SQL},
+                    version = version + 1
+                WHERE refund_request_id = ?
+                """,
+                (joined_paths, joined_paths, updated_at.isoformat(), to_epoch_us(updated_at), refund_request_id)
+            )
+            return cursor.rowcount > 0
+
+    def find_evidence_photos(self, refund_request_id: str) -> list[str] | None:
+        """Find the evidence photo paths of a refund request
+
+        Returns None if the refund request does not exist.
+        """
+        with connection() as conn:
+            row = conn.execute(
+                "SELECT evidence_photos FROM refund_requests WHERE refund_request_id = ?",
+                (refund_request_id,)
+            ).fetchone()
+        if row is None:
+            return None
+        return row["evidence_photos"].split(",") if row["evidence_photos"] else []
+
+    def claim_next(self, agent_id: str, lease_seconds: int, now: datetime | None = None) -> RefundRequest | None:
+        """Atomically claim the next pending refund request for an agent
+
+        Picks the highest-priority, then oldest, pending request whose lease
+        is free or expired, walking the partial queue index. The select and
+        the update run in one statement inside an immediate transaction, so
+        concurrent agents can never claim the same request. An agent that
+        already holds a live claim gets that request back with a renewed
+        lease instead of a second one, which makes retries safe.
+        """
+        now = now or datetime.utcnow()
+        now_str = now.isoformat(timespec="microseconds")
+        expires_str = (now + timedelta(seconds=lease_seconds)).isoformat(timespec="microseconds")
+        params = {"agent_id": agent_id, "now": now_str, "now_us": to_epoch_us(now), "expires": expires_str}
+
+        with transaction() as conn:
+            cursor = conn.cursor()
 
+            # Renew the agent's current claim, if any
             cursor.execute(
-                """
-                INSERT OR REPLACE INTO refund_requests
-                (refund_request_id, support_case_number, customer_id, product_ids, request_reason,
-                 evidence_photos, status, order_id, created_at, refund_id)
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                f"""
+                UPDATE refund_requests
+                SET claim_expires_at = :expires,
+                    updated_at = :now, updated_at_us = :now_us, change_seq = {NEXT_CHANGE_SEQ_SQL},
+                    version = version + 1
+                WHERE refund_request_id = (
+                    SELECT refund_request_id FROM refund_requests
+                    WHERE status = 'pending' AND claimed_by = :agent_id AND claim_expires_at > :now
+                    LIMIT 1
+                )
+                RETURNING {REFUND_REQUEST_COLUMNS}
                 """,
-                (
-                    data["refund_request_id"],
-                    data["support_case_number"],
-                    data["customer_id"],
-                    ",".join(data["product_ids"]),
-                    data["request_reason"],
-                    ",".join(data["evidence_photos"]),
-                    data["status"],
-                    data["order_id"] or None,  # Convert empty string or None to SQL NULL
-                    data["created_at"],
-                    data["refund_id"] or None  # Convert empty string or None to SQL NULL
+                params
+            )
+            rows = cursor.fetchall()
+
+            if not rows:
+                # Pin the partial index: it yields pending rows already in queue
+                # order, so the scan stops at the first free lease without a sort
+                cursor.execute(
+                    f"""
+                    UPDATE refund_requests
+                    SET claimed_by = :agent_id, claim_expires_at = :expires,
+                        updated_at = :now, updated_at_us = :now_us, change_seq = {NEXT_CHANGE_SEQ_SQL},
+                    version = version + 1
+                    WHERE refund_request_id = (
+                        SELECT refund_request_id FROM refund_requests INDEXED BY idx_refund_requests_queue
+                        WHERE status = 'pending'
+                          AND (claim_expires_at IS NULL OR claim_expires_at <= :now)
+                        ORDER BY priority DESC, created_at
+                        LIMIT 1
+                    )
+                    RETURNING {REFUND_REQUEST_COLUMNS}
+                    """,
+                    params
                 )
+                rows = cursor.fetchall()
+
+        return self._map_row(rows[0]) if rows else None
+
+    def release_claim(self, refund_request_id: str, agent_id: str) -> bool:
+        """Release an agent's claim so the request returns to the queue
+
+        Returns False if the agent does not hold the claim.
+        """
+        now = datetime.utcnow()
+        with transaction() as conn:
+            cursor = conn.execute(
+                f"""
+                UPDATE refund_requests
+                SET claimed_by = NULL, claim_expires_at = NULL,
+                    updated_at = ?, updated_at_us = ?, change_seq = {NEXT_CHANGE_SEQ_SQL},
+                    version = version + 1
+                WHERE refund_request_id = ? AND claimed_by = ?
+                """,
+                (now.isoformat(), to_epoch_us(now), refund_request_id, agent_id)
             )
-            conn.commit()
-        finally:
-            conn.close()
+            return cursor.rowcount > 0
 
     def find_by_id(self, refund_request_id: str) -> RefundRequest | None:
         """Find a refund request by ID"""
-        conn = get_connection()
-        try:
-            cursor = conn.cursor()
-            cursor.execute(
-                "SELECT * FROM refund_requests WHERE refund_request_id = ?",
+        with connection() as conn:
+            row = conn.execute(
+                f"SELECT {REFUND_REQUEST_COLUMNS} FROM refund_requests WHERE refund_request_id = ?",
                 (refund_request_id,)
-            )
-            row = cursor.fetchone()
+            ).fetchone()
 
-            if row:
-                return self._row_to_refund_request(row)
-            return None
-        finally:
-            conn.close()
+        return self._map_row(row) if row else None
 
-    def find_by_support_case_number(self, case_number: str) -> list[RefundRequest]:
-        """Find all refund requests for a support case"""
-        conn = get_connection()
-        try:
+    def find_change_marker(self, refund_request_id: str) -> tuple[str, str] | None:
+        """Find a refund request's support case number and a marker of its last change
+
+        The marker combines the request's change feed position, which every
+        write to the row advances, with the count and newest timestamp of its
+        responses, so it changes whenever the assembled refund view would.
+        Reads one row and the response index only.
+
+        Returns:
+            (support_case_number, marker), or None if the request does not exist
+        """
+        with connection() as conn:
+            row = conn.execute(
+                """
+                SELECT r.support_case_number,
+                       COALESCE(r.change_seq, '') || '|' ||
+                       (SELECT COUNT(*) || '|' || COALESCE(MAX(timestamp_us), '')
+                        FROM refund_responses WHERE refund_request_id = r.refund_request_id) AS marker
+                FROM refund_requests r
+                WHERE r.refund_request_id = ?
+                """,
+                (refund_request_id,)
+            ).fetchone()
+        return (row["support_case_number"], row["marker"]) if row else None
+
+    def find_by_ids(self, refund_request_ids: list[str]) -> dict[str, RefundRequest]:
+        """Find many refund requests with a single query, keyed by ID"""
+        if not refund_request_ids:
+            return {}
+
+        placeholders = ",".join("?" for _ in refund_request_ids)
+        requests = self._find_where(f"refund_request_id IN ({placeholders})", list(refund_request_ids))
+        return {req.refund_request_id: req for req in requests}
+
+    def apply_decisions(
+        self,
+        refund_requests: list[RefundRequest],
+        responses: list[RefundResponse]
+    ) -> set[str]:
+        """Persist decided refund requests and their responses in one transaction
+
+        Requests are re-checked under the write lock: any that stopped being
+        pending or moved past the version they were loaded at (changed
+        concurrently) are skipped together with their responses. Status
+        updates and response inserts are each written with a single
+        executemany, and applied requests advance to their new version.
+
+        Returns:
+            IDs of the refund requests that were applied
+        """
+        if not refund_requests:
+            return set()
+
+        with transaction() as conn:
             cursor = conn.cursor()
+
+            ids = [req.refund_request_id for req in refund_requests]
+            placeholders = ",".join("?" for _ in ids)
             cursor.execute(
-                "SELECT * FROM refund_requests WHERE support_case_number = ?",
-                (case_number,)
+                f"""
+                SELECT refund_request_id, version FROM refund_requests
+                WHERE refund_request_id IN ({placeholders}) AND status = 'pending'
+                """,
+                ids
+            )
+            loaded_versions = {req.refund_request_id: req.version for req in refund_requests}
+            applied = {
+                row["refund_request_id"] for row in cursor.fetchall()
+                if row["version"] == loaded_versions[row["refund_request_id"]]
+            }
+
+            cursor.executemany(
+                f"""
+                UPDATE refund_requests
+                SET status = ?, claimed_by = ?, claim_expires_at = ?,
+                    updated_at = ?, updated_at_us = ?, change_seq = {NEXT_CHANGE_SEQ_SQL},
+                    version = version + 1
+                WHERE refund_request_id = ?
+                """,
+                [
+                    (
+                        data["status"],
+                        data["claimed_by"],
+                        data["claim_expires_at"],
+                        data["updated_at"],
+                        to_epoch_us(req.updated_at),
+                        data["refund_request_id"]
+                    )
+                    for req, data in ((req, req.to_dict()) for req in refund_requests)
+                    if data["refund_request_id"] in applied
+                ]
+            )
+            cursor.executemany(
+                INSERT_RESPONSE_SQL,
+                [
+                    response_to_row(response)
+                    for response in responses
+                    if response.refund_request_id in applied
+                ]
             )
-            rows = cursor.fetchall()
 
-            requests = [self._row_to_refund_request(row) for row in rows if row]
-            return [req for req in requests if req is not None]
-        finally:
-            conn.close()
+        for req in refund_requests:
+            if req.refund_request_id in applied:
+                req.version += 1
+        return applied
+
+    def find_by_support_case_number(self, case_number: str) -> list[RefundRequest]:
+        """Find all refund requests for a support case"""
+        return self._find_where("support_case_number = ?", (case_number,))
 
     def find_by_customer_id(self, customer_id: str) -> list[RefundRequest]:
         """Find all refund requests for a customer"""
-        conn = get_connection()
-        try:
-            cursor = conn.cursor()
-            cursor.execute(
-                "SELECT * FROM refund_requests WHERE customer_id = ?",
-                (customer_id,)
-            )
-            rows = cursor.fetchall()
+        return self._find_where("customer_id = ?", (customer_id,))
+
+    def find_created_between(
+        self,
+        start: datetime | None = None,
+        end: datetime | None = None
+    ) -> list[RefundRequest]:
+        """Find refund requests created in [start, end), oldest first
 
-            requests = [self._row_to_refund_request(row) for row in rows if row]
-            return [req for req in requests if req is not None]
-        finally:
-            conn.close()
+        Either bound may be omitted. Served from the created_at_us index.
+        """
+        conditions, params = [], []
+        if start is not None:
+            conditions.append("created_at_us >= ?")
+            params.append(to_epoch_us(start))
+        if end is not None:
+            conditions.append("created_at_us < ?")
+            params.append(to_epoch_us(end))
+
+        return self._find_where(" AND ".join(conditions), params, order_by="created_at_us")
 
     def find_all(self) -> list[RefundRequest]:
         """Find all refund requests"""
-        conn = get_connection()
-        try:
+        return self._find_where()
+
+    def _find_where(
+        self,
+        condition: str | None = None,
+        params: tuple | list = (),
+        order_by: str | None = None
+    ) -> list[RefundRequest]:
+        """Load and map the refund requests matching a WHERE condition
+
+        Rows are fetched as plain tuples, the cheapest form for the
+        positional row mappers.
+        """
+        sql = f"SELECT {REFUND_REQUEST_COLUMNS} FROM refund_requests"
+        if condition:
+            sql += f" WHERE {condition}"
+        if order_by:
+            sql += f" ORDER BY {order_by}"
+
+        with connection() as conn:
             cursor = conn.cursor()
-            cursor.execute("SELECT * FROM refund_requests")
-            rows = cursor.fetchall()
+            cursor.row_factory = None
+            rows = cursor.execute(sql, params).fetchall()
 
-            requests = [self._row_to_refund_request(row) for row in rows if row]
-            return [req for req in requests if req is not None]
-        finally:
-            conn.close()
-
-    def _map_db_status_to_enum(self, db_status: str) -> RefundRequestStatus:
-        """Map database status values to RefundRequestStatus enum"""
-        status_mapping = {
-            "pending": RefundRequestStatus.SUBMITTED,
-            "approved": RefundRequestStatus.APPROVED,
-            "rejected": RefundRequestStatus.REJECTED,
-            "under_review": RefundRequestStatus.UNDER_REVIEW,
-            "decision_made": RefundRequestStatus.DECISION_MADE,
-            "completed": RefundRequestStatus.COMPLETED,
-            "cancelled": RefundRequestStatus.CANCELLED
-        }
-        return status_mapping.get(db_status, RefundRequestStatus.SUBMITTED)
-
-    def _row_to_refund_request(self, row) -> RefundRequest | None:
-        """Convert database row to RefundRequest object"""
-        if not row:
-            return None
+        map_row = self._map_row
+        return [map_row(row) for row in rows]
 
-        # Convert row to dictionary
-        data = dict(row)
-        
-
-
-        # Parse dates from strings
-        created_at = None
-        if data.get("created_at"):
-            created_at = datetime.fromisoformat(data["created_at"])
-        
-        # Handle decision_date for backward compatibility (if present)
-        decision_date = None
-        if data.get("decision_date"):
-            try:
-                decision_date = datetime.fromisoformat(data["decision_date"])
-            except ValueError:
-                pass
-
-        # Extract from comma-separated strings
-        product_ids = data.get("product_ids", "").split(",") if data.get("product_ids") else []
-        evidence_photos = data.get("evidence_photos", "").split(",") if data.get("evidence_photos") else []
-
-        return RefundRequest(
-            refund_request_id=data["refund_request_id"],
-            support_case_number=data.get("support_case_number", "unknown-case"),
-            customer_id=data.get("customer_id", "unknown-customer"),
-            product_ids=product_ids,
-            request_reason=data["request_reason"],
-            evidence_photos=evidence_photos,
-            status=self._map_db_status_to_enum(data.get("status", "pending")),
-            order_id=data.get("order_id"),
-            created_at=created_at,
-            updated_at=decision_date or created_at,  # Use decision_date if available, else created_at
-            refund_id=data.get("refund_id")
+    def _refund_request_to_row(self, refund_request: RefundRequest) -> tuple:
+        """Convert a refund request to the parameters of INSERT_REFUND_REQUEST_SQL"""
+        data = refund_request.to_dict()
+        return (
+            data["refund_request_id"],
+            data["support_case_number"],
+            data["customer_id"],
+            ",".join(data["product_ids"]),
+            data["request_reason"],
+            ",".join(data["evidence_photos"]),
+            data["status"],
+            data["order_id"] or None,  # Convert empty string or None to SQL NULL
+            data["created_at"],
+            data["refund_id"] or None,  # Convert empty string or None to SQL NULL
+            data["priority"],
+            data["claimed_by"],
+            data["claim_expires_at"],
+            to_epoch_us(refund_request.created_at),
+            data["updated_at"],
+            to_epoch_us(refund_request.updated_at)
         )
@@ -0,0 +1,129 @@
+"""Refund request read model repository
+
+Reads the refund_request_summaries projection, which database triggers keep
+in step with refund_requests and refund_responses inside every write. A list
+of refunds with their latest decision is one indexed query, with no
+per-refund response lookups and no aggregate mapping.
+"""
+
+from datetime import datetime
+
+from ..database.database_config import connection
+from ..database.timestamps import to_epoch_us
+from .row_mappers import DECISIONS_BY_RESPONSE_TYPE
+
+REFUND_REQUEST_SUMMARY_COLUMNS = """
+    refund_request_id, support_case_number, customer_id, order_id, status,
+    latest_response_type, refund_amount, refund_method, agent_id, latest_response_at,
+    created_at, updated_at, version
+"""
+
+# Stored response type -> decision value as the API reports it
+_LATEST_DECISIONS = {response_type: value.value for response_type, value in DECISIONS_BY_RESPONSE_TYPE.items()}
+
+
+def map_refund_request_summary(row) -> dict:
+    """Map a REFUND_REQUEST_SUMMARY_COLUMNS row to a read model dict"""
+    (
+        refund_request_id, support_case_number, customer_id, order_id, status,
+        latest_response_type, refund_amount, refund_method, agent_id, latest_response_at,
+        created_at, updated_at, version
+    ) = row
+
+    return {
+        "refund_request_id": refund_request_id,
+        "support_case_number": support_case_number,
+        "customer_id": customer_id,
+        "order_id": order_id,
+        "status": status,
+        "latest_decision": _LATEST_DECISIONS.get(latest_response_type),
+        "refund_amount": refund_amount,
+        "refund_method": refund_method,
+        "agent_id": agent_id,
+        "latest_response_at": latest_response_at,
+        "created_at": created_at,
+        "updated_at": updated_at or created_at,
+        "version": version
+    }
+
+
+class RefundSummaryRepository:
+    """Read-only access to the refund request read model"""
+
+    def find_all(self, created_from: datetime | None = None, created_to: datetime | None = None) -> list[dict]:
+        """Find refund request summaries, oldest first
+
+        Optionally restricted to requests created in [created_from, created_to).
+        """
+        conditions, params = [], []
+        if created_from is not None:
+            conditions.append("created_at_us >= ?")
+            params.append(to_epoch_us(created_from))
+        if created_to is not None:
+            conditions.append("created_at_us < ?")
+            params.append(to_epoch_us(created_to))
+
+        return self._find_where(" AND ".join(conditions), params)
+
+    def find_by_customer_id(self, customer_id: str) -> list[dict]:
+        """Find a customer's refund request summaries, oldest first"""
+        return self._find_where("customer_id = ?", (customer_id,))
+
+    def find_changed_since(self, cursor: int, limit: int) -> tuple[list[dict], int, bool]:
+        """Find the summaries of refund requests changed after a change feed position
+
+        Every write to a refund request moves it to the next position under
+        the write lock, so positions follow commit order and a reader never
+        sees a later change before an earlier one. The triggers refresh the
+        summary in the same write, so each entry carries the same latest
+        decision as the list endpoints. Feeding the returned cursor back in
+        yields each request's latest state once per change.
+
+        Args:
+            cursor: Change feed position already seen; 0 for everything
+            limit: Maximum number of summaries to return
+
+        Returns:
+            Tuple of the changed refund request summaries in change order,
+            the cursor to resume from and whether more changes are waiting
+        """
+        with connection() as conn:
+            db_cursor = conn.cursor()
+            db_cursor.row_factory = None
+            db_cursor.execute(
+                f"""
+                SELECT {REFUND_REQUEST_SUMMARY_COLUMNS}, change_seq
+                FROM refund_request_summaries
+                JOIN (
+                    SELECT refund_request_id, change_seq FROM refund_requests
+                    WHERE change_seq > ?
+                    ORDER BY change_seq
+                    LIMIT ?
+                ) USING (refund_request_id)
+                ORDER BY change_seq
+                """,
+                (cursor, limit + 1)
+            )
+            rows = db_cursor.fetchall()
+
+        has_more = len(rows) > limit
+        rows = rows[:limit]
+        return (
+            [map_refund_request_summary(row[:-1]) for row in rows],
+            rows[-1][-1] if rows else cursor,
+            has_more
+        )
+
+    def _find_where(self, condition: str, params: tuple | list) -> list[dict]:
+        """Load the summaries matching a WHERE condition in creation order"""
+        sql = f"SELECT {REFUND_REQUEST_SUMMARY_COLUMNS} FROM refund_request_summaries"
+        if condition:
+            sql += f" WHERE {condition}"
+        sql += " ORDER BY created_at_us"
+
+        with connection() as conn:
+            cursor = conn.cursor()
+            cursor.row_factory = None
+            rows = cursor.execute(sql, params).fetchall()
+
+        return [map_refund_request_summary(row) for row in rows]
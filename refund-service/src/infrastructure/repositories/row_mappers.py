@@ -0,0 +1,175 @@
+"""Precompiled row mappers for refund requests and refund responses
+
+Repositories select the explicit column lists below instead of ``*`` so
+rows can be unpacked by position, with no ``dict(row)`` copy, no per-column
+name lookups, and enum lookup tables that are built once at import time.
+Mappers accept plain tuples as well as ``sqlite3.Row`` objects.
+
+The lazy refund request mapper keeps the raw row and defers timestamp
+parsing and comma-separated list splitting until the attribute is first
+read, for callers that touch only a few fields of many rows.
+"""
+
+from datetime import datetime
+from decimal import Decimal
+
+from domain.refund_request import RefundRequest, RefundRequestStatus
+from domain.refund_response import RefundMethod, RefundResponse
+from domain.value_objects.money import Money
+from domain.value_objects.refund_decision import RefundDecision, RefundDecisionValue
+
+
+REFUND_REQUEST_COLUMNS = """
+    refund_request_id, support_case_number, customer_id, product_ids, request_reason,
+    evidence_photos, status, order_id, created_at, refund_id,
+    priority, claimed_by, claim_expires_at, updated_at, version
+"""
+
+REFUND_RESPONSE_COLUMNS = """
+    response_id, refund_request_id, agent_id, response_type, response_content,
+    attachments, refund_amount, refund_method, timestamp
+"""
+
+# Stored status values; unknown values read as a new submission
+REFUND_REQUEST_STATUSES = {
+    "pending": RefundRequestStatus.SUBMITTED,
+    "approved": RefundRequestStatus.APPROVED,
+    "rejected": RefundRequestStatus.REJECTED,
+    "under_review": RefundRequestStatus.UNDER_REVIEW,
+    "decision_made": RefundRequestStatus.DECISION_MADE,
+    "completed": RefundRequestStatus.COMPLETED,
+    "cancelled": RefundRequestStatus.CANCELLED
+}
+
+# Decision values as stored in refund_responses.response_type
+RESPONSE_TYPES = {
+    RefundDecisionValue.ACCEPTED: "approval",
+    RefundDecisionValue.REJECTED: "rejection",
+    RefundDecisionValue.NEED_MORE_INPUT: "request_additional_evidence"
+}
+DECISIONS_BY_RESPONSE_TYPE = {response_type: value for value, response_type in RESPONSE_TYPES.items()}
+
+REFUND_METHODS = {method.value: method for method in RefundMethod}
+
+_parse_timestamp = datetime.fromisoformat
+
+
+def _split(value: str | None) -> list[str]:
+    """Split a comma-separated column, treating NULL and '' as empty"""
+    return value.split(",") if value else []
+
+
+def _parse_optional_timestamp(value: str | None) -> datetime | None:
+    """Parse a nullable ISO timestamp column"""
+    return _parse_timestamp(value) if value else None
+
+
+def map_refund_request(row) -> RefundRequest:
+    """Map a REFUND_REQUEST_COLUMNS row to a RefundRequest"""
+    (
+        refund_request_id, support_case_number, customer_id, product_ids, request_reason,
+        evidence_photos, status, order_id, created_at, refund_id,
+        priority, claimed_by, claim_expires_at, updated_at, version
+    ) = row
+
+    created_at = _parse_timestamp(created_at) if created_at else None
+    return RefundRequest(
+        refund_request_id=refund_request_id,
+        support_case_number=support_case_number,
+        customer_id=customer_id,
+        product_ids=product_ids.split(",") if product_ids else [],
+        request_reason=request_reason,
+        evidence_photos=evidence_photos.split(",") if evidence_photos else [],
+        status=REFUND_REQUEST_STATUSES.get(status, RefundRequestStatus.SUBMITTED),
+        order_id=order_id,
+        created_at=created_at,
+        updated_at=_parse_timestamp(updated_at) if updated_at else created_at,
+        refund_id=refund_id,
+        priority=priority or 0,
+        claimed_by=claimed_by,
+        claim_expires_at=_parse_timestamp(claim_expires_at) if claim_expires_at else None,
+        version=version
+    )
+
+
+def _parse_timestamp_or_now(value: str | None) -> datetime:
+    """Parse a timestamp column, defaulting to now like the RefundRequest constructor"""
+    return _parse_timestamp(value) if value else datetime.utcnow()
+
+
+# Lazily parsed attribute -> (REFUND_REQUEST_COLUMNS index, parser)
+_LAZY_REFUND_REQUEST_COLUMNS = {
+    "product_ids": (3, _split),
+    "evidence_photos": (5, _split),
+    "created_at": (8, _parse_timestamp_or_now),
+    "updated_at": (13, _parse_timestamp_or_now),
+    "claim_expires_at": (12, _parse_optional_timestamp)
+}
+
+
+class LazyRefundRequest(RefundRequest):
+    """RefundRequest whose timestamps and list columns are parsed on first read
+
+    The lazy attributes start out as unset slots. Reading one falls
+    through to ``__getattr__``, which parses the raw column and fills the
+    slot, so every later read is a plain slot read. Behaves exactly like
+    an eagerly mapped RefundRequest; only when the parsing cost is paid
+    differs.
+    """
+
+    __slots__ = ("_row",)
+
+    def __getattr__(self, name: str):
+        try:
+            index, parse = _LAZY_REFUND_REQUEST_COLUMNS[name]
+        except KeyError:
+            raise AttributeError(f"'{type(self).__name__}' object has no attribute '{name}'") from None
+        value = parse(self._row[index])
+        setattr(self, name, value)
+        return value
+
+
+def map_refund_request_lazy(row) -> RefundRequest:
+    """Map a REFUND_REQUEST_COLUMNS row to a LazyRefundRequest"""
+    refund_request = object.__new__(LazyRefundRequest)
+    refund_request._row = row
+    refund_request.refund_request_id = row[0]
+    refund_request.support_case_number = row[1]
+    refund_request.customer_id = row[2]
+    refund_request.request_reason = row[4]
+    refund_request.status = REFUND_REQUEST_STATUSES.get(row[6], RefundRequestStatus.SUBMITTED)
+    refund_request.order_id = row[7]
+    refund_request.refund_id = row[9]
+    refund_request.priority = row[10] or 0
+    refund_request.claimed_by = row[11]
+    refund_request.version = row[14]
+    refund_request.responses = []
+    refund_request.decisions = []
+    return refund_request
+
+
+def map_refund_response(row) -> RefundResponse:
+    """Map a REFUND_RESPONSE_COLUMNS row to a RefundResponse"""
+    (
+        response_id, refund_request_id, agent_id, response_type, response_content,
+        attachments, refund_amount, refund_method, timestamp
+    ) = row
+
+    decision_value = DECISIONS_BY_RESPONSE_TYPE.get(response_type)
+    if decision_value is not None:
+        decision = RefundDecision(decision_value, response_content)
+    else:
+        decision = RefundDecision.from_string(response_type or "", response_content)
+
+    return RefundResponse(
+        response_id=response_id,
+        refund_request_id=refund_request_id,
+        agent_id=agent_id,
+        decision=decision,
+        response_content=response_content,
+        # Amounts are normalized through float, as they always have been
+        refund_amount=Money(Decimal(str(float(refund_amount))), "USD") if refund_amount else None,
+        attachments=attachments.split(",") if attachments else [],
+        refund_method=REFUND_METHODS[refund_method] if refund_method else None,
+        timestamp=_parse_timestamp(timestamp) if timestamp else datetime.utcnow()
+    )
@@ -0,0 +1,176 @@
+"""Circuit breaker and deadline budgets for calls to other services"""
+
+import threading
+import time
+from typing import Optional
+
+
+class CircuitOpenError(Exception):
+    """Raised instead of calling a dependency while its circuit is open"""
+
+    def __init__(self, name: str, retry_after: float):
+        super().__init__(f"Circuit '{name}' is open; retry in {retry_after:.1f}s")
+        self.name = name
+        self.retry_after = retry_after
+
+
+class DeadlineExceededError(TimeoutError):
+    """Raised when a call is attempted after its deadline budget is spent"""
+
+
+class Deadline:
+    """Time budget shared by every call made on behalf of one operation
+
+    Each call gets the smaller of its own timeout and what is left of the
+    budget, so retries and fallbacks can never stretch an operation past it.
+    """
+
+    def __init__(self, seconds: float):
+        """Start a budget of the given length"""
+        self.expires_at = time.monotonic() + seconds
+
+    def remaining(self) -> float:
+        """Seconds left in the budget, never negative"""
+        return max(self.expires_at - time.monotonic(), 0.0)
+
+    def timeout(self, cap: Optional[float] = None) -> float:
+        """Timeout for the next call, bounded by ``cap``
+
+        Raises:
+            DeadlineExceededError: If the budget is spent
+        """
+        remaining = self.remaining()
+        if remaining <= 0:
+            raise DeadlineExceededError("Deadline budget exhausted")
+        return min(remaining, cap) if cap is not None else remaining
+
+
+class CircuitBreaker:
+    """Consecutive-failure circuit breaker with half-open probing
+
+    While closed, calls pass through and consecutive failures are counted.
+    Reaching ``failure_threshold`` opens the circuit: calls fail fast with
+    CircuitOpenError for ``reset_timeout_seconds``. After that the circuit
+    is half-open and lets ``half_open_max_calls`` probes through; a
+    successful probe closes it again and a failed one reopens it.
+    Thread-safe, so sync calls from worker threads and async calls share
+    one breaker.
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(
+        self,
+        name: str,
+        failure_threshold: int = 5,
+        reset_timeout_seconds: float = 30.0,
+        half_open_max_calls: int = 1
+    ):
+        """Initialize a closed circuit"""
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.reset_timeout_seconds = reset_timeout_seconds
+        self.half_open_max_calls = half_open_max_calls
+        self._lock = threading.Lock()
+        self._state = self.CLOSED
+        self._opened_at = 0.0
+        self._consecutive_failures = 0
+        self._half_open_calls = 0
+        self._counters = {
+            "calls": 0,
+            "successes": 0,
+            "failures": 0,
+            "rejected": 0,
+            "opened": 0
+        }
+
+    @property
+    def state(self) -> str:
+        """Current state, moving an expired open circuit to half-open"""
+        with self._lock:
+            self._refresh_state()
+            return self._state
+
+    def _refresh_state(self) -> None:
+        """Move to half-open once the open period has elapsed (lock held)"""
+        if self._state == self.OPEN and time.monotonic() - self._opened_at >= self.reset_timeout_seconds:
+            self._state = self.HALF_OPEN
+            self._half_open_calls = 0
+
+    def _open(self) -> None:
+        """Open the circuit (lock held)"""
+        self._state = self.OPEN
+        self._opened_at = time.monotonic()
+        self._counters["opened"] += 1
+
+    def before_call(self) -> None:
+        """Admit a call or fail fast
+
+        Every admitted call must be followed by record_success,
+        record_failure or record_abandoned.
+
+        Raises:
+            CircuitOpenError: If the circuit is open or the half-open probes are taken
+        """
+        with self._lock:
+            self._refresh_state()
+            if self._state == self.OPEN:
+                self._counters["rejected"] += 1
+                retry_after = self.reset_timeout_seconds - (time.monotonic() - self._opened_at)
+                raise CircuitOpenError(self.name, max(retry_after, 0.0))
+
+            if self._state == self.HALF_OPEN:
+                if self._half_open_calls >= self.half_open_max_calls:
+                    self._counters["rejected"] += 1
+                    raise CircuitOpenError(self.name, 0.0)
+                self._half_open_calls += 1
+
+            self._counters["calls"] += 1
+
+    def record_success(self) -> None:
+        """Record a successful call, closing a half-open circuit"""
+        with self._lock:
+            self._counters["successes"] += 1
+            self._consecutive_failures = 0
+            if self._state == self.HALF_OPEN:
+                self._state = self.CLOSED
+                self._half_open_calls = 0
+
+    def record_failure(self) -> None:
+        """Record a failed call, opening the circuit when the threshold is hit"""
+        with self._lock:
+            self._counters["failures"] += 1
+            self._consecutive_failures += 1
+            if self._state == self.HALF_OPEN:
+                self._open()
+            elif self._state == self.CLOSED and self._consecutive_failures >= self.failure_threshold:
+                self._open()
+
+    def record_abandoned(self) -> None:
+        """Record a call that ended without an outcome, e.g. cancelled
+
+        Frees its half-open probe slot without counting against the service.
+        """
+        with self._lock:
+            if self._state == self.HALF_OPEN and self._half_open_calls > 0:
+                self._half_open_calls -= 1
+
+    def reset(self) -> None:
+        """Force the circuit closed"""
+        with self._lock:
+            self._state = self.CLOSED
+            self._consecutive_failures = 0
+            self._half_open_calls = 0
+
+    def metrics(self) -> dict:
+        """Snapshot of the breaker's state and counters"""
+        with self._lock:
+            self._refresh_state()
+            return {
+                "name": self.name,
+                "state": self._state,
+                "consecutive_failures": self._consecutive_failures,
+                **self._counters
+            }
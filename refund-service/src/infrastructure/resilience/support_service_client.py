@@ -0,0 +1,117 @@
+"""Guarded HTTP client for calls to the Support Service"""
+
+from typing import Optional
+
+import httpx
+
+from ..config import get_config
+from .circuit_breaker import CircuitBreaker, Deadline
+
+
+class SupportServiceClient:
+    """Sends Support Service requests through a shared circuit breaker
+
+    Every request gets a timeout from its deadline budget (or the default
+    per-call timeout), so a degraded Support Service costs callers at most
+    that long. Connection errors, timeouts and 5xx responses count as
+    failures; once the breaker opens, calls fail fast with CircuitOpenError
+    until a half-open probe succeeds. 4xx responses are returned as-is.
+    """
+
+    def __init__(self, base_url: str, breaker: CircuitBreaker, default_timeout: float = 5.0):
+        """Initialize with the service URL, breaker and default per-call timeout"""
+        self.base_url = base_url.rstrip("/")
+        self.breaker = breaker
+        self.default_timeout = default_timeout
+
+    def _timeout(self, deadline: Optional[Deadline]) -> float:
+        """Per-call timeout, bounded by the deadline budget"""
+        return deadline.timeout(self.default_timeout) if deadline else self.default_timeout
+
+    def _record(self, response: httpx.Response) -> httpx.Response:
+        """Record a response's outcome on the breaker"""
+        if response.status_code >= 500:
+            self.breaker.record_failure()
+        else:
+            self.breaker.record_success()
+        return response
+
+    def request(
+        self,
+        method: str,
+        path: str,
+        deadline: Optional[Deadline] = None,
+        **kwargs
+    ) -> httpx.Response:
+        """Send a blocking request
+
+        Raises:
+            CircuitOpenError: If the circuit is open
+            DeadlineExceededError: If the deadline budget is spent
+            httpx.HTTPError: If the request fails in transport
+        """
+        timeout = self._timeout(deadline)
+        self.breaker.before_call()
+        try:
+            response = httpx.request(method, f"{self.base_url}{path}", timeout=timeout, **kwargs)
+        except httpx.HTTPError:
+            self.breaker.record_failure()
+            raise
+        except BaseException:
+            self.breaker.record_abandoned()
+            raise
+        return self._record(response)
+
+    async def arequest(
+        self,
+        method: str,
+        path: str,
+        deadline: Optional[Deadline] = None,
+        client: Optional[httpx.AsyncClient] = None,
+        **kwargs
+    ) -> httpx.Response:
+        """Send a request without blocking the event loop
+
+        Pass ``client`` to reuse one connection pool across concurrent calls.
+
+        Raises:
+            CircuitOpenError: If the circuit is open
+            DeadlineExceededError: If the deadline budget is spent
+            httpx.HTTPError: If the request fails in transport
+        """
+        timeout = self._timeout(deadline)
+        self.breaker.before_call()
+        try:
+            if client is not None:
+                response = await client.request(method, f"{self.base_url}{path}", timeout=timeout, **kwargs)
+            else:
+                async with httpx.AsyncClient() as own_client:
+                    response = await own_client.request(method, f"{self.base_url}{path}", timeout=timeout, **kwargs)
+        except httpx.HTTPError:
+            self.breaker.record_failure()
+            raise
+        except BaseException:
+            # Cancellation is not the service's fault but must free a probe slot
+            self.breaker.record_abandoned()
+            raise
+        return self._record(response)
+
+
+_support_service_client: Optional[SupportServiceClient] = None
+
+
+def get_support_service_client() -> SupportServiceClient:
+    """Get the process-wide Support Service client and its circuit breaker"""
+    global _support_service_client
+    if _support_service_client is None:
+        config = get_config()
+        _support_service_client = SupportServiceClient(
+            config.support_service_url,
+            CircuitBreaker(
+                "support_service",
+                failure_threshold=config.support_circuit_failure_threshold,
+                reset_timeout_seconds=config.support_circuit_reset_seconds
+            ),
+            default_timeout=config.support_call_timeout_seconds
+        )
+    return _support_service_client
@@ -1,32 +1,57 @@
 """Dependency injection setup for refund service"""
 
+from infrastructure.database.database_config import get_database_writer
 from infrastructure.repositories.refund_request_repository import RefundRequestRepository
 from infrastructure.repositories.refund_response_repository import RefundResponseRepository
+from infrastructure.repositories.refund_summary_repository import RefundSummaryRepository
+from infrastructure.file_storage.file_storage import FileStorageService
+from infrastructure.config import get_config
 from domain.events.create_refund_request import CreateRefundRequest
 from domain.events.create_refund_response import CreateRefundResponse
 from domain.events.refund_decision_taken import RefundDecisionTaken
-import httpx
-import os
+from domain.events.upload_refund_evidence import UploadRefundEvidence
+from domain.events.claim_refund_request import ClaimRefundRequest
+from domain.events.batch_refund_decisions import BatchRefundDecisions
+from domain.events.import_refund_requests import ImportRefundRequests
+from domain.events.get_customer_overview import GetCustomerOverview
+from domain.events.get_refund_case_details import GetRefundCaseDetails
+from infrastructure.cache.ttl_cache import get_customer_overview_cache, get_refund_detail_cache
+from infrastructure.resilience.circuit_breaker import Deadline
+from infrastructure.resilience.support_service_client import get_support_service_client
 
 
 class Dependencies:
     """Container for application dependencies"""
     
     def __init__(self):
-        self.refund_request_repository = RefundRequestRepository()
-        self.refund_response_repository = RefundResponseRepository()
+        config = get_config()
+        
+        # One group commit writer per database, shared by its repositories
+        database_writer = get_database_writer()
+        
+        self.refund_request_repository = RefundRequestRepository(
+            lazy=config.lazy_row_mapping,
+            writer=database_writer
+        )
+        self.refund_response_repository = RefundResponseRepository(writer=database_writer)
+        self.refund_summary_repository = RefundSummaryRepository()
+        
+        self.file_storage = FileStorageService(
+            upload_dir=config.evidence_upload_dir,
+            content_addressed=config.evidence_content_addressed
+        )
         
         class SupportCaseRepository:
             """Repository that calls the actual Support Service API"""
             
             def __init__(self):
-                self.support_service_url = os.getenv("SUPPORT_SERVICE_URL", "http://support-service:8001")
+                self.client = get_support_service_client()
             
-            def find_by_case_number(self, case_number):
+            def find_by_case_number(self, case_number, deadline=None):
                 """Find support case by calling Support Service API"""
                 try:
                     # Make API call to support service
-                    response = httpx.get(f"{self.support_service_url}/support-cases/{case_number}", timeout=30.0)
+                    response = self.client.request("GET", f"/support-cases/{case_number}", deadline=deadline)
                     if response.status_code == 200:
                         data = response.json()
                         
@@ -85,6 +110,85 @@ class Dependencies:
                             print(f"Mock: Added refund request {refund_request_id} to support case {self.case_number}")
                     
                     return ExceptionMockSupportCase(case_number)
+            
+            def find_by_case_numbers(self, case_numbers):
+                """Find many support cases with one Support Service lookup call
+                
+                Returns support cases keyed by case number. Cases the lookup
+                reports as missing, or all cases if the lookup call fails, go
+                through find_by_case_number so they get the same fault
+                tolerance as single requests.
+                """
+                unique_case_numbers = list(dict.fromkeys(case_numbers))
+                if not unique_case_numbers:
+                    return {}
+                
+                class SupportCase:
+                    def __init__(self, data):
+                        self.case_number = data["case_number"]
+                        self.customer_id = data["customer_id"]
+                        self.case_type = data["case_type"]
+                        self.status = data["status"]
+                        self.is_closed = data["status"] == "closed"
+                        self.is_deleted = data.get("is_deleted", False)
+                        self.refund_request_ids = data.get("refund_request_ids", [])
+                
+                support_cases = {}
+                unresolved = []
+                # One budget for the lookups and their fallbacks together
+                deadline = Deadline(get_config().support_lookup_budget_seconds)
+                # The lookup endpoint accepts at most 500 case numbers per call
+                for start in range(0, len(unique_case_numbers), 500):
+                    batch = unique_case_numbers[start:start + 500]
+                    try:
+                        response = self.client.request(
+                            "POST",
+                            "/support-cases/lookup",
+                            deadline=deadline,
+                            json={"case_numbers": batch}
+                        )
+                        response.raise_for_status()
+                        data = response.json()
+                        support_cases.update(
+                            (record["case_number"], SupportCase(record)) for record in data["cases"]
+                        )
+                        unresolved.extend(data["missing"])
+                    except Exception as e:
+                        print(f"Support case lookup failed, resolving {len(batch)} cases one by one: {e}")
+                        unresolved.extend(batch)
+                
+                for case_number in unresolved:
+                    support_case = self.find_by_case_number(case_number, deadline=deadline)
+                    if support_case is not None:
+                        support_cases[case_number] = support_case
+                
+                return support_cases
+            
+            async def fetch_case(self, case_number):
+                """Fetch a support case as returned by the Support Service API
+                
+                Returns None if the Support Service does not know the case.
+                
+                Raises:
+                    httpx.HTTPError: If the Support Service cannot be reached or fails
+                    CircuitOpenError: If calls to the Support Service are failing fast
+                """
+                response = await self.client.arequest("GET", f"/support-cases/{case_number}")
+                if response.status_code == 404:
+                    return None
+                response.raise_for_status()
+                return response.json()
+            
+            async def fetch_customer_cases(self, customer_id):
+                """Fetch a customer's support cases as returned by the Support Service API
+                
+                Raises:
+                    httpx.HTTPError: If the Support Service cannot be reached or fails
+                    CircuitOpenError: If calls to the Support Service are failing fast
+                """
+                response = await self.client.arequest("GET", f"/support-cases/customer/{customer_id}")
+                response.raise_for_status()
+                return response.json()
         
         self.support_case_repository = SupportCaseRepository()
         self.create_refund_request = CreateRefundRequest(
@@ -97,6 +201,32 @@ class Dependencies:
         self.refund_decision_taken = RefundDecisionTaken(
             self.refund_request_repository
         )
+        self.upload_refund_evidence = UploadRefundEvidence(
+            self.refund_request_repository,
+            self.file_storage
+        )
+        self.claim_refund_request = ClaimRefundRequest(
+            self.refund_request_repository,
+            default_lease_seconds=config.refund_queue_lease_seconds
+        )
+        self.batch_refund_decisions = BatchRefundDecisions(
+            self.refund_request_repository
+        )
+        self.import_refund_requests = ImportRefundRequests(
+            self.refund_request_repository,
+            self.support_case_repository
+        )
+        self.get_customer_overview = GetCustomerOverview(
+            self.refund_request_repository,
+            self.support_case_repository,
+            get_customer_overview_cache()
+        )
+        self.get_refund_case_details = GetRefundCaseDetails(
+            self.refund_request_repository,
+            self.refund_response_repository,
+            self.support_case_repository,
+            get_refund_detail_cache()
+        )
 
 
 def get_dependencies() -> Dependencies:
@@ -1,10 +1,12 @@
 import logging
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import PlainTextResponse
 
 from infrastructure.config import get_config
 from infrastructure.logging_config import setup_logging, get_logger
 from infrastructure.middleware.error_handler import error_handler
+from infrastructure.resilience.support_service_client import get_support_service_client
 from presentation.refund_cases import router as refund_cases_router
 
 # Load configuration
@@ -15,8 +17,9 @@ setup_logging("INFO")
 logger = get_logger(__name__)
 
 # Initialize database
-from infrastructure.database.database_config import init_database
-init_database()
+from infrastructure.database.database_config import close_reader_pool, shutdown_database_writer
+from infrastructure.database.migrations import migrate_schema
+migrate_schema()
 
 app = FastAPI(
     title="Refund Service",
@@ -33,12 +36,18 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-# Add error handling middleware - temporarily commented for debugging
-# app.middleware("http")(error_handler)
+# Add the handler for unexpected errors - temporarily commented for debugging
+# app.add_exception_handler(Exception, error_handler)
 
 # Include routers
 app.include_router(refund_cases_router)
 
+@app.on_event("shutdown")
+async def shutdown_background_workers():
+    """Commit queued writes, stop the database writer and close the readers"""
+    shutdown_database_writer()
+    close_reader_pool()
+
 # Development mode logging
 if config.is_development:
     logger.info("Running in development mode")
@@ -51,4 +60,31 @@ async def root():
 @app.get("/health")
 async def health_check():
     logger.info("Health check endpoint accessed")
-    return {"status": "healthy", "service": "refund"}
\ No newline at end of file
+    return {
+        "status": "healthy",
+        "service": "refund",
+        "dependencies": {
+            "support_service": get_support_service_client().breaker.state
+        }
+    }
+
+@app.get("/metrics", response_class=PlainTextResponse)
+async def metrics():
+    """Circuit breaker state and counters in Prometheus text format"""
+    breaker_metrics = get_support_service_client().breaker.metrics()
+    labels = f'dependency="{breaker_metrics["name"]}"'
+    lines = [
+        "# HELP refund_circuit_state Circuit breaker state (0 closed, 1 half-open, 2 open)",
+        "# TYPE refund_circuit_state gauge",
+        f"refund_circuit_state{{{labels}}} {['closed', 'half_open', 'open'].index(breaker_metrics['state'])}",
+        "# HELP refund_circuit_consecutive_failures Consecutive failed calls",
+        "# TYPE refund_circuit_consecutive_failures gauge",
+        f"refund_circuit_consecutive_failures{{{labels}}} {breaker_metrics['consecutive_failures']}",
+    ]
+    for counter in ["calls", "successes", "failures", "rejected", "opened"]:
+        lines += [
+            f"# HELP refund_circuit_{counter}_total Circuit breaker {counter} count",
+            f"# TYPE refund_circuit_{counter}_total counter",
+            f"refund_circuit_{counter}_total{{{labels}}} {breaker_metrics[counter]}",
+        ]
+    return "\n".join(lines) + "\n"
\ No newline at end of file
@@ -1,11 +1,23 @@
 """API routes for Refund Requests"""
 
-from fastapi import APIRouter, Depends, HTTPException, status, UploadFile, File, Body
+import asyncio
+import json
+import os
+
+from datetime import datetime
+from fastapi import APIRouter, Depends, HTTPException, Request, status, UploadFile, File, Body
 from typing import List, Optional
-from pydantic import BaseModel, field_validator, model_validator
+from pydantic import BaseModel, ValidationError, field_validator, model_validator
 from uuid import uuid4
 
 from .dependencies import get_dependencies
+from infrastructure.config import get_config
+from infrastructure.database.database_config import unit_of_work
+from infrastructure.database.timestamps import to_epoch_us
+from infrastructure.file_storage.file_storage import FileTooLargeError, InvalidFileTypeError
+from infrastructure.file_storage.file_response import evidence_file_response
+from infrastructure.repositories.refund_request_repository import ConcurrentUpdateError
+from infrastructure.resilience.support_service_client import get_support_service_client
 
 router = APIRouter(prefix="/refund-cases", tags=["refund-cases"])
 
@@ -20,6 +32,10 @@ class CreateRefundRequest(BaseModel):
     evidence_photos: Optional[List[str]] = None
 
 
+# Longest NDJSON line accepted by the bulk import; longer lines are rejected
+MAX_IMPORT_LINE_BYTES = 64 * 1024
+
+
 class RefundCaseResponse(BaseModel):
     refund_case_id: str  # This maps to refund_request_id from repository
     case_number: str
@@ -28,6 +44,20 @@ class RefundCaseResponse(BaseModel):
     status: str
     created_at: str
     updated_at: str
+    version: Optional[int] = None  # Pass back as expected_version when deciding
+    # Latest response, filled in from the read model
+    latest_decision: Optional[str] = None  # "accepted", "rejected", "need_more_input"
+    refund_amount: Optional[str] = None
+    refund_method: Optional[str] = None
+    agent_id: Optional[str] = None
+    latest_response_at: Optional[str] = None
+
+
+class RefundChangesResponse(BaseModel):
+    """A page of the refund request change feed"""
+    changes: List[RefundCaseResponse]
+    cursor: int  # Pass back as ``since`` to continue after these changes
+    has_more: bool
 
 
 # Removed RefundDecisionRequest class - using dict directly
@@ -42,29 +72,61 @@ class RefundDecisionActionRequest(BaseModel):
     refund_method: Optional[str] = None
 
 
+class QueueClaimRequest(BaseModel):
+    """Request for claiming the next refund request from the work queue"""
+    agent_id: str
+    lease_seconds: Optional[int] = None
+
+
+class QueueReleaseRequest(BaseModel):
+    """Request for returning a claimed refund request to the work queue"""
+    agent_id: str
+
+
+class BatchRefundDecisionItem(BaseModel):
+    """A single decision within a batch"""
+    refund_request_id: str
+    agent_id: str
+    decision: str  # "accepted", "rejected", "need_more_input"
+    reason: str
+    refund_amount: Optional[str] = None
+    refund_method: Optional[str] = None
+    attachments: Optional[List[str]] = None
+    expected_version: Optional[int] = None  # Fail the item if the request changed since this version
+
+
+class BatchRefundDecisionRequest(BaseModel):
+    """Request for deciding many refund requests at once"""
+    decisions: List[BatchRefundDecisionItem]
+
+
 @router.post("/", response_model=RefundCaseResponse)
 async def create_refund_request(request: CreateRefundRequest):
     """Create a new refund request"""
     dependencies = get_dependencies()
     
     try:
-        result = dependencies.create_refund_request.execute(
-            support_case_number=request.case_number,
-            customer_id=request.customer_id,
-            order_id=request.order_id,
-            product_ids=request.product_ids,
-            request_reason=request.request_reason,
-            evidence_photos=request.evidence_photos
-        )
+        # Save and read back on one connection and transaction
+        with unit_of_work():
+            result = dependencies.create_refund_request.execute(
+                support_case_number=request.case_number,
+                customer_id=request.customer_id,
+                order_id=request.order_id,
+                product_ids=request.product_ids,
+                request_reason=request.request_reason,
+                evidence_photos=request.evidence_photos
+            )
+            
+            refund_request_id = result["refund_request_id"]
+            
+            # Return the actual refund case from the repository
+            saved_case = dependencies.refund_request_repository.find_by_id(refund_request_id)
         
-        refund_request_id = result["refund_request_id"]
+        dependencies.get_customer_overview.invalidate(request.customer_id)
         
         # Update support case with the refund request ID
         await update_support_case_with_refund_request(request.case_number, refund_request_id)
         
-        # Return the actual refund case from the repository
-        saved_case = dependencies.refund_request_repository.find_by_id(refund_request_id)
-        
         if saved_case:
             # Handle status enum conversion
             status_obj = getattr(saved_case, 'status', None)
@@ -103,7 +165,8 @@ async def create_refund_request(request: CreateRefundRequest):
                 order_id=order_id_value,
                 status=status_str,
                 created_at=created_at_str,
-                updated_at=updated_at_str
+                updated_at=updated_at_str,
+                version=getattr(saved_case, 'version', None)
             )
         else:
             return RefundCaseResponse(
@@ -123,6 +186,111 @@ async def create_refund_request(request: CreateRefundRequest):
         )
 
 
+async def _iter_ndjson_lines(request: Request):
+    """Yield the lines of a streamed NDJSON body as they arrive
+    
+    Yields None in place of a line longer than MAX_IMPORT_LINE_BYTES; the
+    rest of that line is discarded without being buffered.
+    """
+    buffer = b""
+    skipping = False
+    async for chunk in request.stream():
+        buffer += chunk
+        *lines, buffer = buffer.split(b"\n")
+        for line in lines:
+            if skipping:
+                skipping = False
+                continue
+            yield None if len(line) > MAX_IMPORT_LINE_BYTES else line
+        if len(buffer) > MAX_IMPORT_LINE_BYTES:
+            if not skipping:
+                yield None
+                skipping = True
+            buffer = b""
+    if buffer and not skipping:
+        yield buffer
+
+
+def _parse_import_line(line: bytes) -> dict:
+    """Parse and validate one NDJSON line as a CreateRefundRequest payload"""
+    try:
+        data = json.loads(line)
+    except ValueError as e:
+        raise ValueError(f"Invalid JSON: {e}")
+    
+    try:
+        return CreateRefundRequest.model_validate(data).model_dump()
+    except ValidationError as e:
+        raise ValueError("; ".join(
+            f"{'.'.join(str(part) for part in error['loc']) or 'body'}: {error['msg']}"
+            for error in e.errors()
+        ))
+
+
+@router.post("/import")
+async def import_refund_requests(request: Request):
+    """Bulk import refund requests from a streamed NDJSON body
+    
+    Each non-blank line is one CreateRefundRequest payload. Lines are
+    validated as they arrive and imported in chunks: every chunk resolves
+    its support cases in one batched lookup and is inserted in one
+    transaction. Support cases are linked to their new refund requests in
+    bulk once the body has been read. Invalid lines are reported per line
+    and never stop the import.
+    """
+    dependencies = get_dependencies()
+    chunk_size = get_config().refund_import_chunk_size
+    
+    results = []
+    links = {}
+    support_cases = {}
+    pending = []
+    
+    async def import_pending():
+        result = await asyncio.to_thread(
+            dependencies.import_refund_requests.execute, list(pending), support_cases
+        )
+        results.extend(result["results"])
+        for customer_id in {payload["customer_id"] for payload in pending}:
+            dependencies.get_customer_overview.invalidate(customer_id)
+        for case_number, refund_case_ids in result["links"].items():
+            links.setdefault(case_number, []).extend(refund_case_ids)
+        pending.clear()
+    
+    line_number = 0
+    async for line in _iter_ndjson_lines(request):
+        line_number += 1
+        if line is not None and not line.strip():
+            continue
+        
+        try:
+            if line is None:
+                raise ValueError(f"Line exceeds {MAX_IMPORT_LINE_BYTES} bytes")
+            payload = _parse_import_line(line)
+        except ValueError as e:
+            results.append({"line": line_number, "refund_case_id": None, "status": "failed", "error": str(e)})
+            continue
+        
+        payload["line"] = line_number
+        pending.append(payload)
+        if len(pending) >= chunk_size:
+            await import_pending()
+    
+    if pending:
+        await import_pending()
+    
+    await link_support_cases_with_refund_requests(links)
+    
+    results.sort(key=lambda result: result["line"])
+    imported = sum(1 for result in results if result["status"] == "imported")
+    print(f"✅ Imported {imported} of {len(results)} refund requests")
+    return {
+        "imported": imported,
+        "failed": len(results) - imported,
+        "results": results
+    }
+
+
 @router.get("/info")
 async def get_refund_cases_info():
     """Provide information about the refund cases API"""
@@ -132,131 +300,199 @@ async def get_refund_cases_info():
             "POST /": "Create new refund request",
             "GET /{refund_case_id}": "Get refund case by ID",
             "GET /customer/{customer_id}": "Get customer's refund cases",
+            "GET /customer/{customer_id}/overview": "Get customer's support cases with refund status",
             "POST /{refund_case_id}/upload-evidence": "Upload evidence files",
-            "POST /{refund_case_id}/decisions": "Make refund decision"
+            "GET /{refund_case_id}/evidence": "List evidence files",
+            "GET /{refund_case_id}/evidence/{file_name}": "Download an evidence file",
+            "POST /{refund_case_id}/decisions": "Make refund decision",
+            "POST /queue/claim": "Claim the next pending refund request",
+            "POST /queue/{refund_case_id}/release": "Return a claimed refund request to the queue",
+            "POST /decisions:batch": "Make decisions on many refund requests in one transaction",
+            "POST /import": "Bulk import refund requests from an NDJSON body"
         }
     }
 
 
-import logging
+@router.post("/queue/claim")
+async def claim_next_refund_case(request: QueueClaimRequest):
+    """Atomically claim the next pending refund request for an agent
+    
+    Returns the highest-priority, oldest pending request whose lease is
+    free or expired. Calling again while holding a live claim renews and
+    returns the same request.
+    """
+    dependencies = get_dependencies()
+    
+    try:
+        result = dependencies.claim_refund_request.execute(
+            agent_id=request.agent_id,
+            lease_seconds=request.lease_seconds
+        )
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+    
+    refund_request = result["refund_request"]
+    if refund_request is None:
+        return {
+            "status": result["status"],
+            "refund_request": None,
+            "message": "No pending refund requests are available"
+        }
+    
+    return {
+        "status": result["status"],
+        "refund_case_id": refund_request.refund_request_id,
+        "claimed_by": refund_request.claimed_by,
+        "claim_expires_at": refund_request.claim_expires_at.isoformat(),
+        "refund_request": refund_request.to_dict()
+    }
 
-logger = logging.getLogger(__name__)
 
-@router.get("/", response_model=List[RefundCaseResponse])
-async def get_all_refund_cases():
-    """Get all refund cases (for agents)"""
+@router.post("/queue/{refund_case_id}/release")
+async def release_refund_case_claim(refund_case_id: str, request: QueueReleaseRequest):
+    """Return a claimed refund request to the work queue"""
+    dependencies = get_dependencies()
+    
     try:
-        dependencies = get_dependencies()
-        
-        # Get all refund cases
-        refund_cases = dependencies.refund_request_repository.find_all()
+        return dependencies.claim_refund_request.release(refund_case_id, request.agent_id)
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail=str(e)
+        )
 
-        
-        # Convert repository results to response models
-        response_cases = []
-        for case in refund_cases:
-
-            # Extract values directly from RefundRequest object using getattr
-            # to avoid issues with to_dict() method
-            refund_case_id = getattr(case, 'refund_request_id', "RC-unknown")
-            support_case_number = getattr(case, 'support_case_number', "unknown")
-            customer_id = getattr(case, 'customer_id', "unknown-customer")
-            
-            # Use actual order_id from domain object
-            order_id = getattr(case, 'order_id', "ORD-unknown")
-            if order_id is None:
-                order_id = "ORD-unknown"
-            
-            # Handle status enum
-            status_val = getattr(case, 'status', None)
-            status_str = "pending"
-            if status_val:
-                # Check if it's a RefundRequestStatus enum
-                if hasattr(status_val, '__class__') and hasattr(status_val.__class__, '__name__') and status_val.__class__.__name__ == 'RefundRequestStatus':
-                    status_str = status_val.value  # Use the enum value directly
-                elif hasattr(status_val, 'value'):
-                    status_str = status_val.value
-                else:
-                    status_str = str(status_val)
-            
-            # Get created_at safely
-            created_at_val = getattr(case, 'created_at', None)
-            if created_at_val and hasattr(created_at_val, 'isoformat'):
-                created_at_str = created_at_val.isoformat()
-            else:
-                created_at_str = str(created_at_val) if created_at_val else "2025-01-18T12:00:00Z"
-            
-            # Get updated_at safely
-            updated_at_val = getattr(case, 'updated_at', None)
-            if updated_at_val and hasattr(updated_at_val, 'isoformat'):
-                updated_at_str = updated_at_val.isoformat()
-            elif updated_at_val:
-                updated_at_str = str(updated_at_val)
-            else:
-                updated_at_str = created_at_str  # Fallback to created_at
-            
 
-            response_cases.append(
-                RefundCaseResponse(
-                    refund_case_id=refund_case_id,
-                    case_number=support_case_number,
-                    customer_id=customer_id,
-                    order_id=order_id,
-                    status=status_str,
-                    created_at=created_at_str,
-                    updated_at=updated_at_str
-                )
+@router.post("/decisions:batch")
+async def make_refund_decisions_batch(request: BatchRefundDecisionRequest):
+    """Make decisions on many refund requests in one transaction
+    
+    Each item is validated independently and reported as applied or failed
+    with a reason; failures never roll back the valid items. Support cases
+    receive one timeline comment per case covering all of its decisions.
+    """
+    dependencies = get_dependencies()
+    
+    try:
+        with unit_of_work():
+            result = dependencies.batch_refund_decisions.execute(
+                [item.model_dump() for item in request.decisions]
             )
-        
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+    
+    for customer_id in {refund_request.customer_id for refund_request in result["refund_requests"]}:
+        dependencies.get_customer_overview.invalidate(customer_id)
+    
+    await notify_support_service_batch(result["refund_requests"], result["responses"])
+    
+    return {
+        "results": result["results"],
+        "applied": result["applied"],
+        "failed": result["failed"]
+    }
 
-        return response_cases
-    except Exception as e:
-        logger.error(f"Error in get_all_refund_cases: {e}", exc_info=True)
-        raise
+
+@router.get("/", response_model=List[RefundCaseResponse])
+async def get_all_refund_cases(created_from: Optional[datetime] = None, created_to: Optional[datetime] = None):
+    """Get all refund cases with their latest decision (for agents), oldest first
+    
+    Served from the refund request read model in one query.
+    ``created_from``/``created_to`` restrict the list to cases created in
+    [created_from, created_to).
+    """
+    if created_from and created_to and to_epoch_us(created_from) >= to_epoch_us(created_to):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="created_from must be before created_to"
+        )
+    
+    dependencies = get_dependencies()
+    summaries = dependencies.refund_summary_repository.find_all(created_from, created_to)
+    return [_summary_to_response(summary) for summary in summaries]
+
+
+def _summary_to_response(summary: dict) -> RefundCaseResponse:
+    """Convert a refund request read model row to a list entry"""
+    return RefundCaseResponse(
+        refund_case_id=summary["refund_request_id"],
+        case_number=summary["support_case_number"],
+        customer_id=summary["customer_id"],
+        order_id=summary["order_id"] or "ORD-unknown",
+        status=summary["status"],
+        created_at=summary["created_at"],
+        updated_at=summary["updated_at"],
+        version=summary["version"],
+        latest_decision=summary["latest_decision"],
+        refund_amount=summary["refund_amount"],
+        refund_method=summary["refund_method"],
+        agent_id=summary["agent_id"],
+        latest_response_at=summary["latest_response_at"]
+    )
+
+
+@router.get("/changes", response_model=RefundChangesResponse)
+async def get_refund_case_changes(since: int = 0, limit: int = 100):
+    """Get refund cases changed since a change feed cursor (delta sync)
+    
+    Start with ``since=0`` and keep passing back the returned cursor; each
+    change to a refund case is reported once, with its current state, in
+    commit order. ``has_more`` means another page is ready immediately.
+    """
+    if since < 0:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="since must not be negative"
+        )
+    if limit < 1 or limit > 1000:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Limit must be between 1 and 1000"
+        )
+    
+    dependencies = get_dependencies()
+    summaries, cursor, has_more = dependencies.refund_summary_repository.find_changed_since(since, limit)
+    
+    return RefundChangesResponse(
+        changes=[_summary_to_response(summary) for summary in summaries],
+        cursor=cursor,
+        has_more=has_more
+    )
 
 
 @router.get("/customer/{customer_id}", response_model=List[RefundCaseResponse])
 async def get_customer_refund_cases(customer_id: str):
-    """Get all refund cases for a customer"""
+    """Get all refund cases for a customer, oldest first"""
     dependencies = get_dependencies()
+    summaries = dependencies.refund_summary_repository.find_by_customer_id(customer_id)
+    return [_summary_to_response(summary) for summary in summaries]
+
+
+@router.get("/customer/{customer_id}/overview")
+async def get_customer_overview(customer_id: str):
+    """Get a customer's support cases joined with their refund requests
     
-    # Find customer's refund cases
-    refund_cases = dependencies.refund_request_repository.find_by_customer_id(customer_id)
+    Gathers the Support Service's cases and this service's refund requests
+    concurrently, so the customer portal needs one round trip per page
+    load. Results are cached for a few seconds per customer and dropped
+    when the customer's refund requests change here. If the Support
+    Service is unavailable, only refund requests are returned and
+    ``support_service_available`` is false.
+    """
+    dependencies = get_dependencies()
     
-    # Convert repository results to response models
-    response_cases = []
-    for case in refund_cases:
-        case_number = getattr(case, 'support_case_number', None)
-        if not case_number:
-            case_number = getattr(case, 'case_number', None)
-        
-        # Use refund_request_id as refund_case_id to match frontend expectations
-        refund_case_id = getattr(case, 'refund_request_id', None)
-        if not refund_case_id:
-            refund_case_id = getattr(case, 'refund_case_id', f"RC-{customer_id}")
-        
-        # Handle status enum conversion
-        status_obj = getattr(case, 'status', None)
-        status_str = "pending"
-        if status_obj:
-            if hasattr(status_obj, 'value'):
-                status_str = status_obj.value
-            else:
-                status_str = str(status_obj)
-        
-        response_cases.append(
-            RefundCaseResponse(
-                refund_case_id=refund_case_id if refund_case_id else f"RC-{customer_id}",
-                case_number=case_number if case_number else "SC-unknown",
-                customer_id=getattr(case, 'customer_id', customer_id),
-                order_id=getattr(case, 'order_id', "ORD-unknown") or "ORD-unknown",
-                status=status_str,
-                created_at=getattr(case, 'created_at', "2025-01-18T12:00:00Z"),
-                updated_at=getattr(case, 'updated_at', "2025-01-18T12:00:00Z")
-            )
+    try:
+        return await dependencies.get_customer_overview.execute(customer_id)
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
         )
-    
-    return response_cases
 
 
 class LegacyRefundDecisionRequest(BaseModel):
@@ -302,6 +538,7 @@ class NewRefundDecisionRequest(BaseModel):
     refund_amount: Optional[str] = None
     refund_method: Optional[str] = None
     attachments: Optional[List[str]] = None
+    expected_version: Optional[int] = None  # Reject with 409 if the request changed since this version
 
 @router.post("/{refund_request_id}/decisions")
 async def make_refund_decision(refund_request_id: str, request: NewRefundDecisionRequest):
@@ -310,69 +547,82 @@ async def make_refund_decision(refund_request_id: str, request: NewRefundDecisio
     
     dependencies = get_dependencies()
     
-    # Find the refund request
-    refund_request = dependencies.refund_request_repository.find_by_id(refund_request_id)
-    if not refund_request:
-        raise HTTPException(status_code=404, detail="Refund request not found")
-    
-    decision_text = request.decision
-    reason_text = request.reason
-    agent_id = request.agent_id
-    refund_amount = request.refund_amount
-    refund_method = request.refund_method
-    attachments = request.attachments
-    assert agent_id is not None, "agent_id should not be None after validation"
+    # Read, respond and update on one connection and transaction: nothing is
+    # written unless the whole decision applies
+    with unit_of_work():
+        # Find the refund request
+        refund_request = dependencies.refund_request_repository.find_by_id(refund_request_id)
+        if not refund_request:
+            raise HTTPException(status_code=404, detail="Refund request not found")
+        if request.expected_version is not None and request.expected_version != refund_request.version:
+            raise HTTPException(
+                status_code=status.HTTP_409_CONFLICT,
+                detail=f"Refund request is at version {refund_request.version}, not {request.expected_version}"
+            )
     
-    # Convert refund method
-    from domain.refund_response import RefundMethod
-    from domain.value_objects.money import Money
-    refund_method_obj = None
-    if refund_method:
-        try:
-            refund_method_obj = RefundMethod(refund_method)
-        except ValueError:
-            raise HTTPException(status_code=400, detail=f"Invalid refund method: {refund_method}")
+        decision_text = request.decision
+        reason_text = request.reason
+        agent_id = request.agent_id
+        refund_amount = request.refund_amount
+        refund_method = request.refund_method
+        attachments = request.attachments
+        assert agent_id is not None, "agent_id should not be None after validation"
     
-    # Convert refund amount
-    refund_amount_obj = None
-    if refund_amount:
+        # Convert refund method
+        from domain.refund_response import RefundMethod
+        from domain.value_objects.money import Money
+        refund_method_obj = None
+        if refund_method:
+            try:
+                refund_method_obj = RefundMethod(refund_method)
+            except ValueError:
+                raise HTTPException(status_code=400, detail=f"Invalid refund method: {refund_method}")
+    
+        # Convert refund amount
+        refund_amount_obj = None
+        if refund_amount:
+            try:
+                refund_amount_obj = Money.from_dict({"amount": float(refund_amount), "currency": "USD"})
+            except ValueError:
+                raise HTTPException(status_code=400, detail=f"Invalid refund amount: {refund_amount}")
+    
+        # Create and save refund response
         try:
-            refund_amount_obj = Money.from_dict({"amount": float(refund_amount), "currency": "USD"})
-        except ValueError:
-            raise HTTPException(status_code=400, detail=f"Invalid refund amount: {refund_amount}")
-    
-    # Create and save refund response
-    try:
-        from domain.value_objects.refund_decision import RefundDecision
+            from domain.value_objects.refund_decision import RefundDecision
         
-        # Create the refund decision value object
-        refund_decision = RefundDecision.from_string(decision_text, reason_text)
+            # Create the refund decision value object
+            refund_decision = RefundDecision.from_string(decision_text, reason_text)
         
-        response_result = dependencies.create_refund_response.execute(
-            refund_request_id=refund_request_id,
-            agent_id=agent_id,
-            decision=refund_decision,
-            response_content=reason_text,
-            refund_amount=refund_amount_obj,
-            refund_method=refund_method_obj,
-            attachments=attachments or []
-        )
-        response = response_result["refund_response"]
-    except ValueError as e:
-        raise HTTPException(status_code=400, detail=str(e))
-    
-    # Apply decision to refund request
-    if refund_decision.decision.name == "ACCEPTED":
-        if not refund_amount_obj:
-            raise HTTPException(status_code=400, detail="Refund amount is required for accepted decisions")
-        refund_request.approve(agent_id, reason_text, refund_amount_obj)
-    elif refund_decision.decision.name == "REJECTED":
-        refund_request.reject(agent_id, reason_text)
-    elif refund_decision.decision.name == "NEED_MORE_INPUT":
-        refund_request.request_additional_evidence(agent_id, reason_text)
+            response_result = dependencies.create_refund_response.execute(
+                refund_request_id=refund_request_id,
+                agent_id=agent_id,
+                decision=refund_decision,
+                response_content=reason_text,
+                refund_amount=refund_amount_obj,
+                refund_method=refund_method_obj,
+                attachments=attachments or []
+            )
+            response = response_result["refund_response"]
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+    
+        # Apply decision to refund request
+        if refund_decision.decision.name == "ACCEPTED":
+            if not refund_amount_obj:
+                raise HTTPException(status_code=400, detail="Refund amount is required for accepted decisions")
+            refund_request.approve(agent_id, reason_text, refund_amount_obj)
+        elif refund_decision.decision.name == "REJECTED":
+            refund_request.reject(agent_id, reason_text)
+        elif refund_decision.decision.name == "NEED_MORE_INPUT":
+            refund_request.request_additional_evidence(agent_id, reason_text)
+    
+        # Save updated refund request; fails if it changed since it was read
+        try:
+            dependencies.refund_request_repository.save(refund_request)
+        except ConcurrentUpdateError as e:
+            raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=str(e))
     
-    # Save updated refund request
-    dependencies.refund_request_repository.save(refund_request)
+    dependencies.get_customer_overview.invalidate(refund_request.customer_id)
     
     # Notify support service about refund decision
     await notify_support_service(refund_request, response)
@@ -405,13 +655,14 @@ async def take_refund_decision(refund_case_id: str, request: RefundDecisionActio
         from domain.value_objects.refund_decision import RefundDecision
         refund_decision = RefundDecision.from_string(request.decision, request.reason)
         
-        result = dependencies.refund_decision_taken.execute(
-            refund_request_id=refund_case_id,
-            agent_id=request.agent_id,
-            decision=refund_decision,
-            refund_amount=refund_amount,
-            refund_method=request.refund_method
-        )
+        with unit_of_work():
+            result = dependencies.refund_decision_taken.execute(
+                refund_request_id=refund_case_id,
+                agent_id=request.agent_id,
+                decision=refund_decision,
+                refund_amount=refund_amount,
+                refund_method=request.refund_method
+            )
         
         print(f"✅ Refund decision taken for {refund_case_id}: {request.decision}")
         
@@ -425,6 +676,11 @@ async def take_refund_decision(refund_case_id: str, request: RefundDecisionActio
             "timestamp": result["timestamp"]
         }
         
+    except ConcurrentUpdateError as e:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail=str(e)
+        )
     except ValueError as e:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
@@ -435,9 +691,6 @@ async def take_refund_decision(refund_case_id: str, request: RefundDecisionActio
 async def update_support_case_with_refund_request(case_number: str, refund_case_id: str):
     """Update support case with the newly created refund request ID"""
     try:
-        import httpx
-        support_service_url = "http://support-service:8001"
-        
         # Update support case type and link refund request
         update_data = {
             "case_type": "refund",
@@ -445,24 +698,53 @@ async def update_support_case_with_refund_request(case_number: str, refund_case_
         }
         
         # Send to support service
-        async with httpx.AsyncClient() as client:
-            response = await client.put(
-                f"{support_service_url}/support-cases/{case_number}/update-type",
-                json=update_data,
-                timeout=30.0
-            )
-            response.raise_for_status()
-            print(f"✅ Successfully updated support case {case_number} with refund request {refund_case_id}")
+        response = await get_support_service_client().arequest(
+            "PUT",
+            f"/support-cases/{case_number}/update-type",
+            json=update_data
+        )
+        response.raise_for_status()
+        print(f"✅ Successfully updated support case {case_number} with refund request {refund_case_id}")
     except Exception as e:
         print(f"⚠️ Failed to update support case {case_number}: {e}")
         # Don't fail refund creation if support service update fails
 
+async def link_support_cases_with_refund_requests(links):
+    """Link support cases with their new refund requests in bulk
+    
+    Sends one update per support case carrying all of its refund request
+    IDs, with the cases updated concurrently over a single connection pool.
+    """
+    if not links:
+        return
+    
+    import httpx
+    support_client = get_support_service_client()
+    
+    async def link_case(client, case_number, refund_case_ids):
+        try:
+            response = await support_client.arequest(
+                "PUT",
+                f"/support-cases/{case_number}/update-type",
+                client=client,
+                json={"case_type": "refund", "refund_request_ids": refund_case_ids}
+            )
+            response.raise_for_status()
+        except Exception as e:
+            print(f"⚠️ Failed to update support case {case_number}: {e}")
+            # Don't fail the import if support service update fails
+    
+    async with httpx.AsyncClient() as client:
+        await asyncio.gather(*(
+            link_case(client, case_number, refund_case_ids)
+            for case_number, refund_case_ids in links.items()
+        ))
+    print(f"✅ Linked {len(links)} support cases with imported refund requests")
+
+
 async def notify_support_service(refund_request, response):
     """Notify support service about refund decision to update timeline"""
     try:
-        import httpx
-        support_service_url = "http://support-service:8001"
-        
         # Prepare refund feedback data
         feedback_data = {
             "author_id": "refund_service",
@@ -477,19 +759,64 @@ async def notify_support_service(refund_request, response):
             feedback_data["content"] += f" - Approved amount: {response.refund_amount.format()}"
         
         # Send to support service
-        async with httpx.AsyncClient() as client:
-            response = await client.post(
-                f"{support_service_url}/support-cases/{refund_request.support_case_number}/comments",
-                json=feedback_data,
-                timeout=30.0
-            )
-            response.raise_for_status()
-            print(f"✅ Successfully notified support service about refund decision")
+        response = await get_support_service_client().arequest(
+            "POST",
+            f"/support-cases/{refund_request.support_case_number}/comments",
+            json=feedback_data
+        )
+        response.raise_for_status()
+        print(f"✅ Successfully notified support service about refund decision")
     except Exception as e:
         print(f"⚠️ Failed to notify support service: {e}")
         # Don't fail the refund decision if support service notification fails
 
 
+async def notify_support_service_batch(refund_requests, responses):
+    """Notify support service about batched refund decisions
+    
+    Decisions are grouped into one comment per support case, and all
+    comments are sent in a single batch call that the support service
+    writes in one transaction.
+    """
+    lines_by_case = {}
+    for refund_request, response in zip(refund_requests, responses):
+        line = f"Refund {refund_request.refund_request_id} {response.decision.display().lower()}: {response.response_content}"
+        if response.refund_amount:
+            line += f" - Approved amount: {response.refund_amount.format()}"
+        lines_by_case.setdefault(refund_request.support_case_number, []).append(line)
+    
+    if not lines_by_case:
+        return
+    
+    comments = [
+        {
+            "case_number": case_number,
+            "author_id": "refund_service",
+            "author_type": "refund_service",
+            "content": "\n".join(lines),
+            "comment_type": "refund_feedback",
+            "is_internal": False
+        }
+        for case_number, lines in lines_by_case.items()
+    ]
+    
+    try:
+        response = await get_support_service_client().arequest(
+            "POST",
+            "/support-cases/comments:batch",
+            json={"comments": comments}
+        )
+        response.raise_for_status()
+        result = response.json()
+        for item in result["results"]:
+            if item["status"] != "added":
+                print(f"⚠️ Failed to notify support case {item['case_number']}: {item['error']}")
+        print(f"✅ Notified {result['added']} support cases about batched refund decisions")
+    except Exception as e:
+        print(f"⚠️ Failed to notify support service: {e}")
+        # Don't fail the refund decisions if support service notification fails
+
+
 @router.post("/{refund_case_id}/upload-evidence")
 async def upload_refund_evidence(
     refund_case_id: str,
@@ -497,18 +824,47 @@ async def upload_refund_evidence(
 ):
     """Upload evidence photos for a refund request"""
     dependencies = get_dependencies()
+    config = get_config()
     
-    # TODO: Implement actual validation by finding the refund case
-    # and checking its associated support case status
-    # For now, the validation will happen at the domain level when use cases are implemented
+    refund_request = dependencies.refund_request_repository.find_by_id(refund_case_id)
+    if not refund_request:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Refund case {refund_case_id} not found"
+        )
+    
+    try:
+        result = await dependencies.upload_refund_evidence.execute(
+            refund_request=refund_request,
+            files=files,
+            allowed_types=config.evidence_allowed_types,
+            max_size_bytes=config.evidence_max_file_size_mb * 1024 * 1024,
+            max_concurrency=config.evidence_upload_concurrency
+        )
+    except FileTooLargeError as e:
+        raise HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail=str(e)
+        )
+    except InvalidFileTypeError as e:
+        raise HTTPException(
+            status_code=status.HTTP_415_UNSUPPORTED_MEDIA_TYPE,
+            detail=str(e)
+        )
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
     
-    # TODO: Integrate with file storage service
-    file_names = [file.filename for file in files if file.filename]
+    stored_files = result["stored_files"]
     
     return {
         "refund_case_id": refund_case_id,
-        "uploaded_files": file_names,
-        "message": f"Successfully uploaded {len(file_names)} evidence files"
+        "uploaded_files": [stored_file.original_filename for stored_file in stored_files],
+        "stored_files": [stored_file.to_dict() for stored_file in stored_files],
+        "evidence_photos": result["refund_request"].evidence_photos,
+        "message": f"Successfully uploaded {len(stored_files)} evidence files"
     }
 
 
@@ -544,52 +900,22 @@ async def get_refund_case(refund_case_id: str):
 
 @router.get("/{refund_case_id}/detailed")
 async def get_refund_case_detailed(refund_case_id: str):
-    """Get detailed refund case information"""
+    """Get detailed refund case information
+    
+    Includes the full refund request, its response history and the linked
+    support case, loaded concurrently and cached until the refund changes.
+    """
     dependencies = get_dependencies()
     
-    # Find basic refund case
-    refund_case = dependencies.refund_request_repository.find_by_id(refund_case_id)
+    details = await dependencies.get_refund_case_details.execute(refund_case_id)
     
-    if not refund_case:
-        # Instead of hardcoded mock data, return 404
+    if details is None:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail=f"Refund case {refund_case_id} not found"
         )
     
-    # TODO: Implement proper detailed case retrieval with refund request and support case details
-    case_number = getattr(refund_case, 'support_case_number', None)
-    if not case_number:
-        case_number = getattr(refund_case, 'case_number', None)
-    
-    # Use refund_request_id as refund_case_id to match frontend expectations
-    refund_case_id_val = getattr(refund_case, 'refund_request_id', None)
-    if not refund_case_id_val:
-        refund_case_id_val = getattr(refund_case, 'refund_case_id', f"RC-{refund_case_id}")
-    
-    # Handle status enum conversion
-    status_obj = getattr(refund_case, 'status', None)
-    status_str = "pending"
-    if status_obj:
-        if hasattr(status_obj, 'value'):
-            status_str = status_obj.value
-        else:
-            status_str = str(status_obj)
-    
-    # For now, return basic structure with default/fallback values
-    return {
-        "refund_case_id": refund_case_id_val if refund_case_id_val else f"RC-{refund_case_id}",
-        "case_number": case_number if case_number else "SC-unknown",
-        "customer_id": getattr(refund_case, 'customer_id', "unknown-customer"),
-        "order_id": getattr(refund_case, 'order_id', "ORD-unknown") or "ORD-unknown",
-        "status": status_str,
-        "created_at": getattr(refund_case, 'created_at', "2025-01-18T12:00:00Z"),
-        "updated_at": getattr(refund_case, 'updated_at', "2025-01-18T12:00:00Z"),
-        "request_reason": "Refund request",
-        "product_ids": [],
-        "evidence_photos": [],
-        "support_case_details": None
-    }
+    return details
 
 
 @router.get("/{refund_case_id}/responses")
@@ -625,9 +951,56 @@ async def get_refund_responses(refund_case_id: str):
 @router.get("/{refund_case_id}/evidence")
 async def get_refund_evidence(refund_case_id: str):
     """Get list of evidence files for a refund request"""
-    # TODO: Integrate with file storage service
+    dependencies = get_dependencies()
+    
+    evidence_photos = dependencies.refund_request_repository.find_evidence_photos(refund_case_id)
+    if evidence_photos is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Refund case {refund_case_id} not found"
+        )
+    
+    base_url = f"{router.prefix}/{refund_case_id}/evidence"
     return {
         "refund_case_id": refund_case_id,
-        "evidence_files": ["defect_photo1.jpg", "receipt.jpg"],
-        "message": "Mock evidence files for refund"
-    }
\ No newline at end of file
+        "evidence_files": [
+            {
+                "file_name": os.path.basename(file_path),
+                "file_path": file_path,
+                "url": dependencies.file_storage.get_file_url(file_path, base_url)
+            }
+            for file_path in evidence_photos
+        ]
+    }
+
+
+@router.api_route("/{refund_case_id}/evidence/{file_name}", methods=["GET", "HEAD"])
+async def download_refund_evidence(refund_case_id: str, file_name: str, request: Request):
+    """Download an evidence photo of a refund request
+    
+    Supports Range requests and ETag revalidation; the file body is sent
+    with zero-copy sendfile when the ASGI server offers it.
+    """
+    dependencies = get_dependencies()
+    
+    evidence_photos = dependencies.refund_request_repository.find_evidence_photos(refund_case_id)
+    if evidence_photos is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Refund case {refund_case_id} not found"
+        )
+    
+    file_path = dependencies.file_storage.find_stored_file(evidence_photos, file_name)
+    if not file_path:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Evidence file {file_name} not found for refund case {refund_case_id}"
+        )
+    
+    try:
+        return await evidence_file_response(request, file_path)
+    except FileNotFoundError:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Evidence file {file_name} not found for refund case {refund_case_id}"
+        )
\ No newline at end of file
@@ -0,0 +1,145 @@
+#!/usr/bin/env python3
+"""Memory and allocation benchmark for the hot-path domain objects
+
+Measures what it costs to load a large page of refund requests from the
+Refund Service repository and a long-running support case (with its agent
+timeline) from the Support Service repository, against throwaway SQLite
+databases.
+
+Usage:
+    python scripts/benchmark_domain_memory.py [all|refund|support]
+        [--refund-requests N] [--comments N]
+
+Each service is measured in its own interpreter because both put their
+``domain`` and ``infrastructure`` packages at the top level.
+"""
+
+import argparse
+import gc
+import os
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime, timedelta
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def measure(label, count, load):
+    """Time ``load`` untraced, then trace a second run's memory and allocations"""
+    gc.collect()
+    started = time.perf_counter()
+    result = load()
+    elapsed = time.perf_counter() - started
+    del result
+
+    gc.collect()
+    tracemalloc.start()
+    result = load()
+    current, peak = tracemalloc.get_traced_memory()
+    live_blocks = sum(stat.count for stat in tracemalloc.take_snapshot().statistics("filename"))
+    tracemalloc.stop()
+    del result
+
+    print(f"\n📊 {label}")
+    print(f"   objects:        {count:,}")
+    print(f"   load time:      {elapsed * 1000:,.1f} ms")
+    print(f"   retained:       {current / 1024 / 1024:,.2f} MiB ({current / count:,.0f} B/object)")
+    print(f"   peak:           {peak / 1024 / 1024:,.2f} MiB")
+    print(f"   live blocks:    {live_blocks:,} ({live_blocks / count:,.1f}/object)")
+
+
+def benchmark_refund_service(count):
+    """Load ``count`` refund requests with RefundRequestRepository.find_all"""
+    sys.path.insert(0, os.path.join(ROOT, "refund-service", "src"))
+    from domain.refund_request import RefundRequest
+    from infrastructure.database.database_config import init_database
+    from infrastructure.repositories.refund_request_repository import RefundRequestRepository
+
+    init_database()
+    repository = RefundRequestRepository()
+    created_at = datetime(2025, 1, 1)
+    print(f"🔄 Seeding {count:,} refund requests...")
+    repository.save_many([
+        RefundRequest(
+            refund_request_id=f"RR-{i:07d}",
+            support_case_number=f"CASE-{i // 3:07d}",
+            customer_id=f"CUST-{i % 5000:05d}",
+            product_ids=[f"PROD-{i % 97:03d}", f"PROD-{i % 89:03d}"],
+            request_reason="Item arrived damaged",
+            evidence_photos=[f"evidence/RR-{i:07d}/photo.jpg"],
+            order_id=f"ORD-{i:07d}",
+            created_at=created_at + timedelta(seconds=i)
+        )
+        for i in range(count)
+    ])
+
+    measure("Refund Service: find_all()", count, repository.find_all)
+
+
+def benchmark_support_service(comment_count):
+    """Load a case with ``comment_count`` comments and build its agent timeline"""
+    sys.path.insert(0, os.path.join(ROOT, "support-service", "src"))
+    from domain.support_case import CaseType, SupportCase
+    from infrastructure.database.database_config import init_database
+    from infrastructure.repositories.support_case_repository import SupportCaseRepository
+
+    init_database()
+    repository = SupportCaseRepository()
+    support_case = SupportCase(
+        case_number="CASE-BENCH",
+        customer_id="CUST-00001",
+        case_type=CaseType.QUESTION,
+        subject="Wobbly table legs",
+        description="The legs wobble after assembly"
+    )
+    print(f"🔄 Seeding a case with {comment_count:,} comments...")
+    for i in range(comment_count):
+        if i % 2:
+            support_case.add_agent_response("AGENT-1", f"Agent reply {i}", is_internal=i % 10 == 1)
+        else:
+            support_case.add_customer_comment("CUST-00001", f"Customer follow-up {i}")
+    repository.save(support_case)
+
+    def load_case_with_timeline():
+        loaded = repository.find_by_case_number("CASE-BENCH")
+        return loaded, loaded.get_case_history("agent")
+
+    measure(
+        "Support Service: find_by_case_number() + agent timeline",
+        comment_count,
+        load_case_with_timeline
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("service", nargs="?", choices=["all", "refund", "support"], default="all")
+    parser.add_argument("--refund-requests", type=int, default=100_000)
+    parser.add_argument("--comments", type=int, default=1_000)
+    args = parser.parse_args()
+
+    if args.service == "all":
+        for service in ("refund", "support"):
+            subprocess.run(
+                [sys.executable, os.path.abspath(__file__), service,
+                 "--refund-requests", str(args.refund_requests),
+                 "--comments", str(args.comments)],
+                check=True
+            )
+        return 0
+
+    with tempfile.TemporaryDirectory() as data_dir:
+        os.environ["REFUND_DB_PATH"] = os.path.join(data_dir, "refund.db")
+        os.environ["SUPPORT_DB_PATH"] = os.path.join(data_dir, "support.db")
+        if args.service == "refund":
+            benchmark_refund_service(args.refund_requests)
+        else:
+            benchmark_support_service(args.comments)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
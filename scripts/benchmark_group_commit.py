@@ -0,0 +1,181 @@
+#!/usr/bin/env python3
+"""Write throughput benchmark for the group commit writer
+
+Runs many threads that each make small writes to a throwaway SQLite
+database: new refund requests (Refund Service) or single comments on
+existing cases (Support Service). Every write is committed either in its own
+transaction, as repositories do without a writer, or in batches by a
+GroupCommitWriter.
+
+Usage:
+    python scripts/benchmark_group_commit.py [all|refund|support]
+        [--threads N] [--writes N] [--window-ms N] [--max-batch N]
+
+Each service is measured in its own interpreter because both put their
+``domain`` and ``infrastructure`` packages at the top level.
+"""
+
+import argparse
+import contextlib
+import io
+import os
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from datetime import datetime, timedelta
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def run_threads(threads, writes, write):
+    """Time ``threads`` threads each calling write(thread, i) ``writes`` times"""
+    start = threading.Barrier(threads + 1)
+
+    def worker(thread):
+        start.wait()
+        for i in range(writes):
+            write(thread, i)
+
+    workers = [threading.Thread(target=worker, args=(thread,)) for thread in range(threads)]
+    for worker_thread in workers:
+        worker_thread.start()
+    start.wait()
+    started = time.perf_counter()
+    for worker_thread in workers:
+        worker_thread.join()
+    return time.perf_counter() - started
+
+
+def report(label, threads, writes, timings):
+    """Print writes/s for each mode and the writer's average batch size"""
+    total = threads * writes
+    print(f"\n📊 {label} ({threads} threads x {writes:,} writes)")
+    for mode, (elapsed, writer) in timings.items():
+        batches = f"   avg batch: {writer.operations_committed / writer.batches_committed:6.1f}" if writer else ""
+        print(f"   {mode:<9} {elapsed * 1000:8.1f} ms ({total / elapsed:>10,.0f} writes/s){batches}")
+
+
+def benchmark_refund_service(threads, writes, window_ms, max_batch):
+    """Benchmark RefundRequestRepository.save of new refund requests"""
+    sys.path.insert(0, os.path.join(ROOT, "refund-service", "src"))
+    from domain.refund_request import RefundRequest
+    from infrastructure.database.database_config import get_connection, init_database
+    from infrastructure.database.group_commit import GroupCommitWriter
+    from infrastructure.repositories.refund_request_repository import RefundRequestRepository
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        init_database()
+    created_at = datetime(2025, 1, 1)
+
+    def saver(mode, repository):
+        def write(thread, i):
+            repository.save(RefundRequest(
+                refund_request_id=f"RR-{mode}-{thread:03d}-{i:06d}",
+                support_case_number=f"CASE-{thread:03d}-{i:06d}",
+                customer_id=f"CUST-{thread:03d}",
+                product_ids=["PROD-001"],
+                request_reason="Item arrived damaged",
+                evidence_photos=[],
+                order_id=f"ORD-{thread:03d}-{i:06d}",
+                created_at=created_at + timedelta(seconds=i)
+            ))
+        return write
+
+    timings = {}
+    for mode in ("per-write", "grouped"):
+        writer = None
+        if mode == "grouped":
+            writer = GroupCommitWriter(get_connection, window_seconds=window_ms / 1000, max_batch=max_batch)
+        repository = RefundRequestRepository(writer=writer)
+        timings[mode] = (run_threads(threads, writes, saver(mode, repository)), writer)
+        if writer:
+            writer.close()
+
+    report("Refund Service: RefundRequestRepository.save()", threads, writes, timings)
+
+
+def benchmark_support_service(threads, writes, window_ms, max_batch):
+    """Benchmark SupportCaseRepository.add_comments of one comment at a time"""
+    sys.path.insert(0, os.path.join(ROOT, "support-service", "src"))
+    from domain.comment import Comment, CommentType
+    from domain.support_case import CaseType, SupportCase
+    from infrastructure.database.database_config import get_connection, init_database
+    from infrastructure.database.group_commit import GroupCommitWriter
+    from infrastructure.repositories.support_case_repository import SupportCaseRepository
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        init_database()
+    created_at = datetime(2025, 1, 1)
+    seed = SupportCaseRepository()
+    for thread in range(threads):
+        seed.save(SupportCase(
+            case_number=f"CASE-{thread:03d}",
+            customer_id=f"CUST-{thread:03d}",
+            case_type=CaseType.REFUND,
+            subject="Damaged delivery",
+            description="The table top is scratched",
+            created_at=created_at,
+            updated_at=created_at
+        ))
+
+    def commenter(mode, repository):
+        def write(thread, i):
+            repository.add_comments([Comment(
+                comment_id=f"COMMENT-{mode}-{thread:03d}-{i:06d}",
+                case_number=f"CASE-{thread:03d}",
+                author_id="AGENT-001",
+                author_type="agent",
+                content="Checked with the warehouse",
+                comment_type=CommentType.AGENT_RESPONSE,
+                timestamp=created_at + timedelta(seconds=i)
+            )])
+        return write
+
+    timings = {}
+    for mode in ("per-write", "grouped"):
+        writer = None
+        if mode == "grouped":
+            writer = GroupCommitWriter(get_connection, window_seconds=window_ms / 1000, max_batch=max_batch)
+        repository = SupportCaseRepository(writer=writer)
+        timings[mode] = (run_threads(threads, writes, commenter(mode, repository)), writer)
+        if writer:
+            writer.close()
+
+    report("Support Service: SupportCaseRepository.add_comments()", threads, writes, timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("service", nargs="?", choices=["all", "refund", "support"], default="all")
+    parser.add_argument("--threads", type=int, default=32)
+    parser.add_argument("--writes", type=int, default=200)
+    parser.add_argument("--window-ms", type=float, default=2)
+    parser.add_argument("--max-batch", type=int, default=64)
+    args = parser.parse_args()
+
+    if args.service == "all":
+        for service in ("refund", "support"):
+            subprocess.run(
+                [sys.executable, os.path.abspath(__file__), service,
+                 "--threads", str(args.threads),
+                 "--writes", str(args.writes),
+                 "--window-ms", str(args.window_ms),
+                 "--max-batch", str(args.max_batch)],
+                check=True
+            )
+        return 0
+
+    with tempfile.TemporaryDirectory() as data_dir:
+        os.environ["REFUND_DB_PATH"] = os.path.join(data_dir, "refund.db")
+        os.environ["SUPPORT_DB_PATH"] = os.path.join(data_dir, "support.db")
+        if args.service == "refund":
+            benchmark_refund_service(args.threads, args.writes, args.window_ms, args.max_batch)
+        else:
+            benchmark_support_service(args.threads, args.writes, args.window_ms, args.max_batch)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,163 @@
+#!/usr/bin/env python3
+"""Read throughput benchmark for the reader connection pool
+
+Runs many threads that each look up refund requests by ID (Refund Service)
+or support cases by case number (Support Service) in a throwaway SQLite
+database. Reads either open a fresh connection each, as with the pool
+disabled, or borrow a pooled read-only connection. Without the pool, closing
+the last open connection checkpoints the WAL and deletes it, so the next
+read starts cold.
+
+Usage:
+    python scripts/benchmark_read_pool.py [all|refund|support]
+        [--rows N] [--threads N] [--reads N] [--pool-size N]
+
+Each service is measured in its own interpreter because both put their
+``domain`` and ``infrastructure`` packages at the top level.
+"""
+
+import argparse
+import contextlib
+import io
+import os
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from datetime import datetime, timedelta
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def run_readers(threads, reads, read):
+    """Time ``threads`` threads each calling read(i) ``reads`` times"""
+    start = threading.Barrier(threads + 1)
+
+    def reader():
+        start.wait()
+        for i in range(reads):
+            read(i)
+
+    readers = [threading.Thread(target=reader) for _ in range(threads)]
+    for thread in readers:
+        thread.start()
+    start.wait()
+    started = time.perf_counter()
+    for thread in readers:
+        thread.join()
+    return time.perf_counter() - started
+
+
+def compare(label, threads, reads, pool_size, read):
+    """Print reads/s with the reader pool disabled and enabled"""
+    from infrastructure.config import get_config
+    from infrastructure.database.database_config import close_reader_pool
+
+    config = get_config()
+    print(f"\n📊 {label} ({threads} threads x {reads:,} reads)")
+    for mode, size in (("fresh", 0), (f"pool of {pool_size}", pool_size)):
+        config.read_pool_size = size
+        elapsed = run_readers(threads, reads, read)
+        close_reader_pool()
+        print(f"   {mode:<12} {elapsed * 1000:8.1f} ms ({threads * reads / elapsed:>10,.0f} reads/s)")
+
+
+def benchmark_refund_service(rows, threads, reads, pool_size):
+    """Benchmark RefundRequestRepository.find_by_id"""
+    sys.path.insert(0, os.path.join(ROOT, "refund-service", "src"))
+    from domain.refund_request import RefundRequest
+    from infrastructure.database.database_config import init_database
+    from infrastructure.repositories.refund_request_repository import RefundRequestRepository
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        init_database()
+    created_at = datetime(2025, 1, 1)
+
+    def refund_request(refund_request_id, i):
+        return RefundRequest(
+            refund_request_id=refund_request_id,
+            support_case_number=f"CASE-{i:07d}",
+            customer_id=f"CUST-{i % 500:04d}",
+            product_ids=["PROD-001"],
+            request_reason="Item arrived damaged",
+            evidence_photos=[],
+            order_id=f"ORD-{i:07d}",
+            created_at=created_at + timedelta(seconds=i)
+        )
+
+    repository = RefundRequestRepository()
+    print(f"🔄 Seeding {rows:,} refund requests...")
+    repository.save_many([refund_request(f"RR-{i:07d}", i) for i in range(rows)])
+
+    compare(
+        "Refund Service: RefundRequestRepository.find_by_id()",
+        threads, reads, pool_size,
+        lambda i: repository.find_by_id(f"RR-{i % rows:07d}")
+    )
+
+
+def benchmark_support_service(rows, threads, reads, pool_size):
+    """Benchmark SupportCaseRepository.find_by_case_number"""
+    sys.path.insert(0, os.path.join(ROOT, "support-service", "src"))
+    from domain.support_case import CaseType, SupportCase
+    from infrastructure.database.database_config import init_database
+    from infrastructure.repositories.support_case_repository import SupportCaseRepository
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        init_database()
+    created_at = datetime(2025, 1, 1)
+    repository = SupportCaseRepository()
+    print(f"🔄 Seeding {rows:,} support cases...")
+    with contextlib.redirect_stdout(io.StringIO()):
+        for i in range(rows):
+            repository.save(SupportCase(
+                case_number=f"CASE-{i:07d}",
+                customer_id=f"CUST-{i % 500:04d}",
+                case_type=CaseType.REFUND,
+                subject="Damaged delivery",
+                description="The table top is scratched",
+                created_at=created_at,
+                updated_at=created_at
+            ))
+
+    compare(
+        "Support Service: SupportCaseRepository.find_by_case_number()",
+        threads, reads, pool_size,
+        lambda i: repository.find_by_case_number(f"CASE-{i % rows:07d}")
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("service", nargs="?", choices=["all", "refund", "support"], default="all")
+    parser.add_argument("--rows", type=int, default=1_000)
+    parser.add_argument("--threads", type=int, default=8)
+    parser.add_argument("--reads", type=int, default=500)
+    parser.add_argument("--pool-size", type=int, default=4)
+    args = parser.parse_args()
+
+    if args.service == "all":
+        for service in ("refund", "support"):
+            subprocess.run(
+                [sys.executable, os.path.abspath(__file__), service,
+                 "--rows", str(args.rows),
+                 "--threads", str(args.threads),
+                 "--reads", str(args.reads),
+                 "--pool-size", str(args.pool_size)],
+                check=True
+            )
+        return 0
+
+    with tempfile.TemporaryDirectory() as data_dir:
+        os.environ["REFUND_DB_PATH"] = os.path.join(data_dir, "refund.db")
+        os.environ["SUPPORT_DB_PATH"] = os.path.join(data_dir, "support.db")
+        if args.service == "refund":
+            benchmark_refund_service(args.rows, args.threads, args.reads, args.pool_size)
+        else:
+            benchmark_support_service(args.rows, args.threads, args.reads, args.pool_size)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
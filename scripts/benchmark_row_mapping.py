@@ -0,0 +1,153 @@
+#!/usr/bin/env python3
+"""Throughput benchmark for the repositories' find_all row mapping
+
+Loads every refund request (Refund Service) or support case (Support
+Service) from a throwaway SQLite database with the eager and the lazy row
+mappers, both as a bare load and followed by to_dict() on every object,
+which forces the lazy mappers to parse every deferred column.
+
+Usage:
+    python scripts/benchmark_row_mapping.py [all|refund|support]
+        [--refund-requests N] [--support-cases N] [--repeat N]
+
+Each service is measured in its own interpreter because both put their
+``domain`` and ``infrastructure`` packages at the top level.
+"""
+
+import argparse
+import contextlib
+import io
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def best_of(repeat, run):
+    """Fastest of ``repeat`` timed runs, in seconds"""
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        run()
+        timings.append(time.perf_counter() - started)
+    return min(timings)
+
+
+def report(label, count, repositories, repeat):
+    """Print load and load+to_dict throughput for eager and lazy repositories"""
+    print(f"\n📊 {label} ({count:,} rows, best of {repeat})")
+    for mode, repository in repositories.items():
+        load = best_of(repeat, repository.find_all)
+        load_and_serialize = best_of(
+            repeat,
+            lambda: [item.to_dict() for item in repository.find_all()]
+        )
+        print(
+            f"   {mode:<6} find_all: {load * 1000:8.1f} ms ({count / load:>10,.0f} rows/s)"
+            f"   + to_dict: {load_and_serialize * 1000:8.1f} ms ({count / load_and_serialize:>10,.0f} rows/s)"
+        )
+
+
+def benchmark_refund_service(count, repeat):
+    """Benchmark RefundRequestRepository.find_all"""
+    sys.path.insert(0, os.path.join(ROOT, "refund-service", "src"))
+    from domain.refund_request import RefundRequest
+    from infrastructure.database.database_config import init_database
+    from infrastructure.repositories.refund_request_repository import RefundRequestRepository
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        init_database()
+    created_at = datetime(2025, 1, 1)
+    print(f"🔄 Seeding {count:,} refund requests...")
+    RefundRequestRepository().save_many([
+        RefundRequest(
+            refund_request_id=f"RR-{i:07d}",
+            support_case_number=f"CASE-{i // 3:07d}",
+            customer_id=f"CUST-{i % 5000:05d}",
+            product_ids=[f"PROD-{i % 97:03d}", f"PROD-{i % 89:03d}"],
+            request_reason="Item arrived damaged",
+            evidence_photos=[f"evidence/RR-{i:07d}/photo.jpg"],
+            order_id=f"ORD-{i:07d}",
+            created_at=created_at + timedelta(seconds=i)
+        )
+        for i in range(count)
+    ])
+
+    report(
+        "Refund Service: RefundRequestRepository.find_all()",
+        count,
+        {"eager": RefundRequestRepository(), "lazy": RefundRequestRepository(lazy=True)},
+        repeat
+    )
+
+
+def benchmark_support_service(count, repeat):
+    """Benchmark SupportCaseRepository.find_all"""
+    sys.path.insert(0, os.path.join(ROOT, "support-service", "src"))
+    from domain.support_case import CaseType, SupportCase
+    from infrastructure.database.database_config import init_database
+    from infrastructure.repositories.support_case_repository import SupportCaseRepository
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        init_database()
+    repository = SupportCaseRepository()
+    created_at = datetime(2025, 1, 1)
+    print(f"🔄 Seeding {count:,} support cases...")
+    for i in range(count):
+        repository.save(SupportCase(
+            case_number=f"CASE-{i:07d}",
+            customer_id=f"CUST-{i % 5000:05d}",
+            case_type=CaseType.REFUND,
+            subject="Damaged delivery",
+            description="The table top is scratched",
+            refund_request_ids=[f"RR-{i:07d}"],
+            created_at=created_at + timedelta(seconds=i),
+            updated_at=created_at + timedelta(seconds=i),
+            order_id=f"ORD-{i:07d}",
+            product_ids=[f"PROD-{i % 97:03d}"],
+            delivery_date=created_at
+        ))
+
+    report(
+        "Support Service: SupportCaseRepository.find_all()",
+        count,
+        {"eager": repository, "lazy": SupportCaseRepository(lazy=True)},
+        repeat
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("service", nargs="?", choices=["all", "refund", "support"], default="all")
+    parser.add_argument("--refund-requests", type=int, default=100_000)
+    parser.add_argument("--support-cases", type=int, default=10_000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    if args.service == "all":
+        for service in ("refund", "support"):
+            subprocess.run(
+                [sys.executable, os.path.abspath(__file__), service,
+                 "--refund-requests", str(args.refund_requests),
+                 "--support-cases", str(args.support_cases),
+                 "--repeat", str(args.repeat)],
+                check=True
+            )
+        return 0
+
+    with tempfile.TemporaryDirectory() as data_dir:
+        os.environ["REFUND_DB_PATH"] = os.path.join(data_dir, "refund.db")
+        os.environ["SUPPORT_DB_PATH"] = os.path.join(data_dir, "support.db")
+        if args.service == "refund":
+            benchmark_refund_service(args.refund_requests, args.repeat)
+        else:
+            benchmark_support_service(args.support_cases, args.repeat)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -16,6 +16,11 @@ class Comment:
     
     Comments can be made by customers, agents, or refund feedback from refund service"""
 
+    __slots__ = (
+        "comment_id", "case_number", "author_id", "author_type", "content",
+        "comment_type", "attachments", "timestamp", "is_internal"
+    )
+
     def __init__(
         self,
         comment_id: str,
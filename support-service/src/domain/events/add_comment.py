@@ -5,6 +5,20 @@ from domain.support_case import SupportCase
 from domain.comment import CommentType
 
 
+def validate_comment_input(author_id: str, author_type: str, content: str, comment_type: str) -> CommentType:
+    """Validate the fields of a new comment and return its comment type"""
+    if not author_id or not content:
+        raise ValueError("Author ID and content are required")
+    
+    if author_type not in ["customer", "agent", "refund_service"]:
+        raise ValueError(f"Invalid author type: {author_type}")
+    
+    try:
+        return CommentType(comment_type)
+    except ValueError:
+        raise ValueError(f"Invalid comment type: {comment_type}")
+
+
 class AddComment:
     """Use case for adding a comment to a support case"""
 
@@ -25,18 +39,7 @@ class AddComment:
         """Execute the add comment use case"""
         
         # Validate inputs
-        if not author_id or not content:
-            raise ValueError("Author ID and content are required")
-        
-        # Validate author type
-        if author_type not in ["customer", "agent", "refund_service"]:
-            raise ValueError(f"Invalid author type: {author_type}")
-        
-        # Validate comment type
-        try:
-            comment_type_enum = CommentType(comment_type)
-        except ValueError:
-            raise ValueError(f"Invalid comment type: {comment_type}")
+        comment_type_enum = validate_comment_input(author_id, author_type, content, comment_type)
         
         # Find support case
         support_case = self.support_case_repository.find_by_case_number(case_number)
@@ -53,8 +56,11 @@ class AddComment:
             is_internal=is_internal
         )
         
-        # Save to repository
-        self.support_case_repository.save(support_case)
+        # Append the comment alone rather than rewriting the whole case, so
+        # it never conflicts with concurrent updates to the case
+        added_cases = self.support_case_repository.add_comments([comment])
+        if case_number not in added_cases:
+            raise ValueError(f"Support case {case_number} not found")
         
         return {
             "status": "comment_added",
@@ -0,0 +1,95 @@
+"""AddComments use case implementation"""
+
+from datetime import datetime
+from typing import Dict, Any, List
+from uuid import uuid4
+from domain.comment import Comment
+from .add_comment import validate_comment_input
+
+
+# Upper bound on comments per batch so one request holds the write lock briefly
+MAX_BATCH_COMMENTS = 500
+
+
+class AddComments:
+    """Use case for adding many comments across support cases at once
+    
+    Unlike AddComment, which loads and rewrites the whole case aggregate,
+    the batch checks all target cases with one query and appends the
+    comments in a single write transaction.
+    """
+
+    def __init__(self, support_case_repository):
+        """Initialize with required dependencies"""
+        self.support_case_repository = support_case_repository
+
+    def execute(self, comments: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """Execute the add comments use case
+        
+        Args:
+            comments: Items with case_number, author_id, author_type, content,
+                comment_type and optional attachments and is_internal
+        
+        Returns:
+            Dictionary with a result per item, in input order
+        """
+        
+        # Validate inputs
+        if not comments:
+            raise ValueError("At least one comment is required")
+        
+        if len(comments) > MAX_BATCH_COMMENTS:
+            raise ValueError(f"A batch may contain at most {MAX_BATCH_COMMENTS} comments")
+        
+        results = []
+        valid = []
+        for item in comments:
+            result = {
+                "case_number": item.get("case_number"),
+                "status": "failed",
+                "comment": None,
+                "error": None
+            }
+            results.append(result)
+            
+            try:
+                if not item.get("case_number"):
+                    raise ValueError("Case number is required")
+                comment_type = validate_comment_input(
+                    item.get("author_id"),
+                    item.get("author_type"),
+                    item.get("content"),
+                    item.get("comment_type")
+                )
+            except ValueError as e:
+                result["error"] = str(e)
+                continue
+            
+            comment = Comment(
+                comment_id=str(uuid4()),
+                case_number=item["case_number"],
+                author_id=item["author_id"],
+                author_type=item["author_type"],
+                content=item["content"],
+                comment_type=comment_type,
+                attachments=item.get("attachments") or [],
+                timestamp=datetime.utcnow(),
+                is_internal=item.get("is_internal", False)
+            )
+            valid.append((comment, result))
+        
+        added_cases = self.support_case_repository.add_comments([comment for comment, _ in valid])
+        
+        for comment, result in valid:
+            if comment.case_number not in added_cases:
+                result["error"] = f"Support case {comment.case_number} not found"
+                continue
+            result["status"] = "added"
+            result["comment"] = comment
+        
+        added = sum(1 for result in results if result["status"] == "added")
+        return {
+            "results": results,
+            "added": added,
+            "failed": len(results) - added
+        }
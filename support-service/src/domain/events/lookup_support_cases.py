@@ -0,0 +1,40 @@
+"""LookupSupportCases use case implementation"""
+
+from typing import Dict, Any, List
+
+
+# Upper bound on case numbers per lookup so one query stays cheap
+MAX_LOOKUP_CASES = 500
+
+
+class LookupSupportCases:
+    """Use case for resolving many support cases at once for other services"""
+
+    def __init__(self, support_case_repository):
+        """Initialize with required dependencies"""
+        self.support_case_repository = support_case_repository
+
+    def execute(self, case_numbers: List[str]) -> Dict[str, Any]:
+        """Execute the lookup support cases use case
+
+        Returns:
+            Dictionary with compact records for the cases found, in request
+            order, and the case numbers that do not exist
+        """
+
+        # Validate inputs
+        unique_case_numbers = list(dict.fromkeys(
+            case_number for case_number in case_numbers if case_number
+        ))
+        if not unique_case_numbers:
+            raise ValueError("At least one case number is required")
+
+        if len(unique_case_numbers) > MAX_LOOKUP_CASES:
+            raise ValueError(f"At most {MAX_LOOKUP_CASES} case numbers can be looked up at once")
+
+        records = self.support_case_repository.find_summaries(unique_case_numbers)
+
+        return {
+            "cases": [records[case_number] for case_number in unique_case_numbers if case_number in records],
+            "missing": [case_number for case_number in unique_case_numbers if case_number not in records]
+        }
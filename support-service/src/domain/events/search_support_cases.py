@@ -0,0 +1,77 @@
+"""SearchSupportCases use case implementation"""
+
+import re
+from typing import Dict, Any, Optional
+
+
+# Upper bound on page size so a single search stays cheap
+MAX_SEARCH_LIMIT = 100
+
+# Number of words taken from a query; the rest is ignored
+MAX_SEARCH_TERMS = 16
+
+
+def build_match_query(text: str) -> str:
+    """Turn free text into a safe FTS5 MATCH expression
+
+    Every word is quoted so FTS5 operators and punctuation in user input are
+    treated as plain text. All words must match, and the last one matches
+    as a prefix so results follow the user while they type.
+    """
+    terms = re.findall(r"\w+", text, re.UNICODE)[:MAX_SEARCH_TERMS]
+    if not terms:
+        raise ValueError("Search query must contain at least one word")
+
+    quoted = [f'"{term}"' for term in terms]
+    quoted[-1] += "*"
+    return " ".join(quoted)
+
+
+class SearchSupportCases:
+    """Use case for full-text searching support cases and their comments"""
+
+    def __init__(self, support_case_repository):
+        """Initialize with required dependencies"""
+        self.support_case_repository = support_case_repository
+
+    def execute(
+        self,
+        query: str,
+        user_role: str = "customer",
+        customer_id: Optional[str] = None,
+        limit: int = 20,
+        offset: int = 0
+    ) -> Dict[str, Any]:
+        """Execute the search support cases use case
+
+        Internal comments are only searched for agents, so customers never
+        find a case through text they cannot see.
+        """
+
+        # Validate inputs
+        if not query or not query.strip():
+            raise ValueError("Search query is required")
+
+        if limit < 1 or limit > MAX_SEARCH_LIMIT:
+            raise ValueError(f"Limit must be between 1 and {MAX_SEARCH_LIMIT}")
+
+        if offset < 0:
+            raise ValueError("Offset must not be negative")
+
+        match_query = build_match_query(query)
+
+        results, total = self.support_case_repository.search(
+            match_query,
+            include_internal=user_role == "agent",
+            customer_id=customer_id,
+            limit=limit,
+            offset=offset
+        )
+
+        return {
+            "query": query,
+            "results": results,
+            "total": total,
+            "limit": limit,
+            "offset": offset
+        }
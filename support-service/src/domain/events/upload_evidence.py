@@ -0,0 +1,68 @@
+"""UploadEvidence use case implementation"""
+
+from typing import Dict, Any, List, Optional
+
+from domain.support_case import SupportCase
+
+
+class UploadEvidence:
+    """Use case for storing evidence files and attaching them to a support case"""
+
+    def __init__(self, support_case_repository, file_storage, variant_processor=None):
+        """Initialize with required dependencies"""
+        self.support_case_repository = support_case_repository
+        self.file_storage = file_storage
+        self.variant_processor = variant_processor
+
+    async def execute(
+        self,
+        support_case: SupportCase,
+        files: List,
+        allowed_types: Optional[List[str]] = None,
+        max_size_bytes: Optional[int] = None,
+        max_concurrency: int = 4
+    ) -> Dict[str, Any]:
+        """Execute the upload evidence use case
+
+        Files are streamed to storage concurrently and validated in-stream;
+        their paths are then recorded on the case in one write. If recording
+        fails, the stored files are removed again. Image variants are
+        generated in the background once the files are recorded.
+        """
+
+        # Validate inputs
+        if not files:
+            raise ValueError("At least one evidence file is required")
+
+        if not support_case.can_attach_evidence():
+            raise ValueError(f"Cannot upload evidence to support case {support_case.case_number}")
+
+        # Stream files to storage
+        stored_files = await self.file_storage.save_files_concurrently(
+            files,
+            max_concurrency=max_concurrency,
+            allowed_types=allowed_types,
+            max_size_bytes=max_size_bytes
+        )
+        file_paths = [stored_file.file_path for stored_file in stored_files]
+
+        # Record stored paths on the aggregate in a single batched write
+        try:
+            support_case.attach_evidence(file_paths)
+            self.support_case_repository.add_evidence_files(
+                support_case.case_number,
+                file_paths,
+                support_case.updated_at
+            )
+        except Exception:
+            await self.file_storage.delete_files(stored_files)
+            raise
+
+        if self.variant_processor:
+            self.variant_processor.schedule(stored_files)
+
+        return {
+            "status": "evidence_uploaded",
+            "stored_files": stored_files,
+            "support_case": support_case
+        }
@@ -25,6 +25,13 @@ class SupportCase:
     A support case manages customer inquiries and refund requests with business rules.
     """
 
+    __slots__ = (
+        "case_number", "customer_id", "case_type", "subject", "description",
+        "refund_request_ids", "comments", "status", "created_at", "updated_at",
+        "assigned_agent_id", "order_id", "product_ids", "delivery_date", "is_deleted",
+        "evidence_files", "version"
+    )
+
     def __init__(
         self,
         case_number: str,
@@ -41,7 +48,9 @@ class SupportCase:
         order_id: Optional[str] = None,
         product_ids: Optional[List[str]] = None,
         delivery_date: Optional[datetime] = None,
-        is_deleted: bool = False
+        is_deleted: bool = False,
+        evidence_files: Optional[List[str]] = None,
+        version: int = 0
     ):
         self.case_number = case_number
         self.customer_id = customer_id
@@ -58,6 +67,8 @@ class SupportCase:
         self.product_ids = product_ids or []
         self.delivery_date = delivery_date
         self.is_deleted = is_deleted
+        self.evidence_files = evidence_files or []
+        self.version = version  # Stored version this was loaded at; 0 until first saved
 
     def assign_agent(self, agent_id: str) -> None:
         """Assign an agent to the support case"""
@@ -107,6 +118,16 @@ class SupportCase:
         self.refund_request_ids.append(refund_request_id)
         self.updated_at = datetime.utcnow()
 
+    def can_attach_evidence(self) -> bool:
+        """Check if evidence files can be attached"""
+        return not self.is_deleted and self.status != CaseStatus.CLOSED
+
+    def attach_evidence(self, file_paths: List[str]) -> None:
+        """Attach stored evidence files to the support case"""
+        self._ensure_case_not_closed_or_deleted("upload evidence to")
+        self.evidence_files.extend(file_paths)
+        self.updated_at = datetime.utcnow()
+
     def _validate_case_type_transition(self, new_case_type: CaseType) -> None:
         """Validate changing case type"""
         if self.case_type == CaseType.REFUND and new_case_type == CaseType.QUESTION:
@@ -263,7 +284,9 @@ class SupportCase:
             "order_id": self.order_id,
             "product_ids": self.product_ids,
             "delivery_date": self.delivery_date.isoformat() if self.delivery_date else None,
-            "is_deleted": self.is_deleted
+            "is_deleted": self.is_deleted,
+            "evidence_files": self.evidence_files,
+            "version": self.version
         }
         
         if include_history:
@@ -18,6 +18,11 @@ class TimelineEventType(Enum):
 
 class CaseHistory:
     """Value object representing a timeline event in case history"""
+
+    __slots__ = (
+        "event_id", "event_type", "timestamp", "author_id", "author_type", "content",
+        "actor", "is_internal", "attachments", "metadata"
+    )
     
     def __init__(
         self,
@@ -13,6 +13,11 @@ class Config:
         
         # Database
         self.support_db_path = os.getenv("SUPPORT_DB_PATH", "data/support.db")
+        self.lazy_row_mapping = os.getenv("SUPPORT_LAZY_ROW_MAPPING", "false").lower() == "true"
+        self.group_commit_enabled = os.getenv("SUPPORT_GROUP_COMMIT", "false").lower() == "true"
+        self.group_commit_window_ms = float(os.getenv("SUPPORT_GROUP_COMMIT_WINDOW_MS", "2"))
+        self.group_commit_max_batch = int(os.getenv("SUPPORT_GROUP_COMMIT_MAX_BATCH", "64"))
+        self.read_pool_size = int(os.getenv("SUPPORT_READ_POOL_SIZE", "4"))
         
         # Service
         self.service_port = int(os.getenv("SUPPORT_SERVICE_PORT", "8000"))
@@ -26,11 +31,26 @@ class Config:
         cors_origins = os.getenv("CORS_ORIGINS", "http://localhost:3000,http://localhost:3001,http://localhost:3002,http://localhost:3003")
         self.cors_origins = cors_origins.split(",") if "," in cors_origins else [cors_origins]
         
+        # Evidence file storage
+        self.evidence_upload_dir = os.getenv("EVIDENCE_UPLOAD_DIR", "uploads")
+        self.evidence_content_addressed = os.getenv("EVIDENCE_CONTENT_ADDRESSED", "false").lower() == "true"
+        self.evidence_max_file_size_mb = int(os.getenv("EVIDENCE_MAX_FILE_SIZE_MB", "10"))
+        self.evidence_allowed_types = os.getenv("EVIDENCE_ALLOWED_TYPES", "jpg,jpeg,png,gif,webp,heic,pdf").split(",")
+        self.evidence_upload_concurrency = int(os.getenv("EVIDENCE_UPLOAD_CONCURRENCY", "4"))
+        
+        # Evidence image variants (thumbnail and web-size copies)
+        self.evidence_variants_enabled = os.getenv("EVIDENCE_VARIANTS_ENABLED", "true").lower() == "true"
+        self.evidence_variant_workers = int(os.getenv("EVIDENCE_VARIANT_WORKERS", "2"))
+        self.evidence_thumbnail_size = int(os.getenv("EVIDENCE_THUMBNAIL_SIZE", "320"))
+        self.evidence_web_size = int(os.getenv("EVIDENCE_WEB_SIZE", "1600"))
+        
         # Logging
         self.log_level = os.getenv("LOG_LEVEL", "INFO")
         
         # Security
         self.auth_jwt_secret = os.getenv("AUTH_JWT_SECRET", "development-secret")
+        self.auth_jwt_algorithm = os.getenv("AUTH_JWT_ALGORITHM", "HS256")
+        self.auth_token_cache_size = int(os.getenv("AUTH_TOKEN_CACHE_SIZE", "1024"))
         
     @property
     def is_development(self) -> bool:
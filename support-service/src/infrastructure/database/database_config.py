@@ -3,18 +3,14 @@
 import sqlite3
 import os
 import threading
-from typing import Optional
+from typing import Callable, Iterator, Optional, TypeVar
 from contextlib import contextmanager
 
 from ..config import get_config
-from .schema import (
-    CREATE_SUPPORT_CASES_TABLE,
-    CREATE_SUPPORT_RESPONSES_TABLE,
-    CREATE_SUPPORT_COMMENTS_TABLE,
-    CREATE_SUPPORT_CASES_INDEXES,
-    CREATE_SUPPORT_RESPONSES_INDEXES,
-    CREATE_SUPPORT_COMMENTS_INDEXES
-)
+from .group_commit import GroupCommitWriter
+from .reader_pool import ReaderPool
+
+T = TypeVar("T")
 
 def get_database_path() -> str:
     """Get database file path"""
@@ -37,9 +33,72 @@ def get_connection() -> sqlite3.Connection:
     conn.execute("PRAGMA journal_mode = WAL")  # Better concurrency
     conn.execute("PRAGMA synchronous = NORMAL")  # Balance safety/performance
     conn.execute("PRAGMA cache_size = -64000")  # 64MB cache
+    conn.execute("PRAGMA recursive_triggers = ON")  # Fire delete triggers on INSERT OR REPLACE
     
     return conn
 
+
+def get_read_connection() -> sqlite3.Connection:
+    """Get a read-only connection that may be lent to other threads
+
+    ``query_only`` makes any write on it fail, so it never takes the write
+    lock. The journal mode is left alone: WAL is persistent once the
+    database has been initialized.
+    """
+    conn = sqlite3.connect(get_database_path(), check_same_thread=False)
+    conn.row_factory = sqlite3.Row
+    conn.execute("PRAGMA cache_size = -64000")  # 64MB cache
+    conn.execute("PRAGMA query_only = ON")
+    return conn
+
+
+# Process-wide reader pool, created on first read
+_reader_pool: Optional[ReaderPool] = None
+_reader_pool_lock = threading.Lock()
+
+
+def get_reader_pool() -> Optional[ReaderPool]:
+    """Get the process-wide reader pool, or None when pooling is disabled"""
+    global _reader_pool
+    config = get_config()
+    if config.read_pool_size <= 0:
+        return None
+
+    with _reader_pool_lock:
+        if _reader_pool is None:
+            _reader_pool = ReaderPool(get_read_connection, size=config.read_pool_size)
+    return _reader_pool
+
+
+def close_reader_pool() -> None:
+    """Close the pooled reader connections; a later read opens a new pool"""
+    global _reader_pool
+    with _reader_pool_lock:
+        pool, _reader_pool = _reader_pool, None
+    if pool is not None:
+        pool.close()
+
+
+@contextmanager
+def read_connection() -> Iterator[sqlite3.Connection]:
+    """Read-only connection for one repository read
+
+    Borrowed from the reader pool, or a fresh connection closed afterwards
+    when pooling is disabled.
+    """
+    pool = get_reader_pool()
+    if pool is not None:
+        with pool.connection() as conn:
+            yield conn
+        return
+    
+    conn = get_connection()
+    try:
+        yield conn
+    finally:
+        conn.close()
+
+
 @contextmanager
 def transaction():
     """Context manager for database transactions"""
@@ -52,32 +111,65 @@ def transaction():
         raise
 
 
-def init_database() -> None:
-    """Initialize database with schema and indexes"""
-    # Create a new connection for initialization
-    db_path = get_database_path()
-    os.makedirs(os.path.dirname(db_path), exist_ok=True)
-    
-    conn = sqlite3.connect(db_path)
-    conn.row_factory = sqlite3.Row
+def run_write(
+    operation: Callable[[sqlite3.Connection], T],
+    writer: Optional[GroupCommitWriter] = None
+) -> T:
+    """Run a repository write operation on a connection and return its result
+
+    Committed in a batch by the group commit writer when one is given,
+    otherwise in its own immediate transaction.
+    """
+    if writer is not None:
+        return writer.execute(operation)
     
+    conn = get_connection()
     try:
-        # Create tables
-        conn.execute(CREATE_SUPPORT_CASES_TABLE)
-        conn.execute(CREATE_SUPPORT_RESPONSES_TABLE)
-        conn.execute(CREATE_SUPPORT_COMMENTS_TABLE)
-        
-        # Create indexes
-        for index_sql in CREATE_SUPPORT_CASES_INDEXES + CREATE_SUPPORT_RESPONSES_INDEXES + CREATE_SUPPORT_COMMENTS_INDEXES:
-            conn.execute(index_sql)
-        
+        conn.execute("BEGIN IMMEDIATE")
+        result = operation(conn)
         conn.commit()
-        print("Support Service database initialized successfully")
-        
-    except Exception as e:
+        return result
+    except Exception:
         conn.rollback()
-        print(f"Error initializing database: {e}")
         raise
-    
     finally:
-        conn.close()
\ No newline at end of file
+        conn.close()
+
+
+# Process-wide group commit writer, created on first use when enabled
+_database_writer: Optional[GroupCommitWriter] = None
+_database_writer_lock = threading.Lock()
+
+
+def get_database_writer() -> Optional[GroupCommitWriter]:
+    """Get the process-wide group commit writer, or None when group commit is disabled"""
+    global _database_writer
+    config = get_config()
+    if not config.group_commit_enabled:
+        return None
+
+    with _database_writer_lock:
+        if _database_writer is None:
+            _database_writer = GroupCommitWriter(
+                get_connection,
+                window_seconds=config.group_commit_window_ms / 1000,
+                max_batch=config.group_commit_max_batch,
+                name="support-db-writer"
+            )
+    return _database_writer
+
+
+def shutdown_database_writer() -> None:
+    """Commit the queued writes and stop the writer thread if it was started"""
+    if _database_writer is not None:
+        _database_writer.close()
+
+
+def init_database() -> None:
+    """Create the database schema, or bring an existing one up to date
+
+    Runs the versioned migrations, which return at once when the schema is
+    current.
+    """
+    from .migrations import migrate_schema  # migrations imports this module
+    migrate_schema()
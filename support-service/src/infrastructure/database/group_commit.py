@@ -0,0 +1,171 @@
+"""Group commit for SQLite writes
+
+SQLite has a single write lock, and every transaction pays for its own
+commit. When many request handlers write at once they queue up on the lock,
+back off while it is held, and commit one by one. A GroupCommitWriter runs
+every write for one database on a single writer thread instead. It takes the
+operations that arrive within a short window and runs each in its own
+savepoint of one transaction. It commits them together, then resolves each
+caller's future. An operation that raises is rolled back to its savepoint,
+and only its own caller sees the error. A BaseException that is not an
+Exception, such as KeyboardInterrupt, fails and rolls back its whole batch
+instead, and the writer thread carries on with the next one.
+"""
+
+import queue
+import sqlite3
+import threading
+import time
+from concurrent.futures import Future
+from typing import Callable, Optional, TypeVar
+
+T = TypeVar("T")
+
+# Queue marker that tells the writer thread to finish and exit
+_STOP = object()
+
+
+class GroupCommitWriter:
+    """Single writer thread that commits queued write operations in batches
+
+    An operation is a callable that takes the writer's connection and does
+    its writes on it. It must not commit, roll back or keep the connection.
+    A caller's future resolves with the operation's return value only once
+    the batch holding it has committed.
+    """
+
+    def __init__(
+        self,
+        connect: Callable[[], sqlite3.Connection],
+        window_seconds: float = 0.002,
+        max_batch: int = 64,
+        name: str = "group-commit-writer"
+    ):
+        """Initialize the writer; its thread starts with the first operation
+
+        Args:
+            connect: Opens the writer thread's connection
+            window_seconds: How long to keep collecting operations after the
+                first one of a batch arrives
+            max_batch: Most operations committed in one transaction
+            name: Writer thread name
+        """
+        self._connect = connect
+        self._window_seconds = window_seconds
+        self._max_batch = max_batch
+        self._name = name
+        self._queue: queue.SimpleQueue = queue.SimpleQueue()
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+        self.batches_committed = 0
+        self.operations_committed = 0
+
+    def submit(self, operation: Callable[[sqlite3.Connection], T]) -> "Future[T]":
+        """Queue a write operation and return the future of its result"""
+        future: Future = Future()
+        self._ensure_started()
+        self._queue.put((operation, future))
+        return future
+
+    def execute(self, operation: Callable[[sqlite3.Connection], T]) -> T:
+        """Queue a write operation and wait until it has committed
+
+        Raises whatever the operation raised, or the error that failed its
+        batch's commit.
+        """
+        return self.submit(operation).result()
+
+    def close(self) -> None:
+        """Commit the operations already queued and stop the writer thread"""
+        with self._lock:
+            thread = self._thread
+            self._thread = None
+            if thread is None:
+                return
+            self._queue.put(_STOP)
+        thread.join()
+
+    def _ensure_started(self) -> None:
+        if self._thread is not None:
+            return
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name=self._name, daemon=True)
+                self._thread.start()
+
+    def _run(self) -> None:
+        conn = self._connect()
+        try:
+            while True:
+                batch, stop = self._next_batch()
+                if batch:
+                    self._commit_batch(conn, batch)
+                if stop:
+                    return
+        finally:
+            conn.close()
+
+    def _next_batch(self) -> tuple[list, bool]:
+        """Wait for an operation, then collect more until the window closes
+
+        Returns:
+            Tuple of the (operation, future) pairs and whether to stop
+        """
+        first = self._queue.get()
+        if first is _STOP:
+            return [], True
+
+        batch = [first]
+        deadline = time.monotonic() + self._window_seconds
+        while len(batch) < self._max_batch:
+            remaining = deadline - time.monotonic()
+            try:
+                item = self._queue.get(timeout=remaining) if remaining > 0 else self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if item is _STOP:
+                return batch, True
+            batch.append(item)
+        return batch, False
+
+    def _commit_batch(self, conn: sqlite3.Connection, batch: list) -> None:
+        """Run a batch in one transaction, then resolve its futures"""
+        started = []  # Futures of the operations run so far
+        outcomes = []
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+            for operation, future in batch:
+                if not future.set_running_or_notify_cancel():
+                    started.append(None)  # Cancelled while queued
+                    continue
+                started.append(future)
+                conn.execute("SAVEPOINT group_commit_operation")
+                try:
+                    outcomes.append((future, operation(conn), None))
+                except Exception as e:
+                    conn.execute("ROLLBACK TO group_commit_operation")
+                    outcomes.append((future, None, e))
+                finally:
+                    conn.execute("RELEASE group_commit_operation")
+            conn.commit()
+        except BaseException as e:
+            # Nothing in the batch committed, so every caller gets the error.
+            # The error is not re-raised: the writer thread must live on, or
+            # every operation queued after this batch would wait forever.
+            if conn.in_transaction:
+                conn.rollback()
+            for future in started:
+                if future is not None:
+                    future.set_exception(e)
+            for _, future in batch[len(started):]:
+                if future.set_running_or_notify_cancel():
+                    future.set_exception(e)
+            return
+
+        self.batches_committed += 1
+        self.operations_committed += len(outcomes)
+        for future, result, error in outcomes:
+            if error is None:
+                future.set_result(result)
+            else:
+                future.set_exception(error)
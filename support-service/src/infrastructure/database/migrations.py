@@ -1,49 +1,155 @@
-"""Database migration utilities for Support Service"""
+"""Schema migrations for Support Service
 
+Every schema change is a numbered migration, applied once per database and
+recorded in schema_version (see migration_runner). A new change is added
+at the end of MIGRATIONS under the next version; migrations already
+released are never edited. Versions 1-5 replay what startup used to run on
+every boot. Each only adds what is missing, so they also bring unversioned
+databases of any age up to date.
+"""
+
+import os
 import sqlite3
-from .database_config import get_connection
 
+from .database_config import get_database_path
+from .migration_runner import Backfill, Migration, add_column, run_migrations
+from .schema import (
+    CREATE_EVIDENCE_BLOBS_TABLE,
+    CREATE_EVIDENCE_REFERENCES_INDEXES,
+    CREATE_EVIDENCE_REFERENCES_TABLE,
+    CREATE_EVIDENCE_VARIANTS_TABLE,
+    CREATE_SUPPORT_CASES_INDEXES,
+    CREATE_SUPPORT_CASES_TABLE,
+    CREATE_SUPPORT_COMMENTS_INDEXES,
+    CREATE_SUPPORT_COMMENTS_TABLE,
+    CREATE_SUPPORT_RESPONSES_INDEXES,
+    CREATE_SUPPORT_RESPONSES_TABLE,
+    CREATE_SUPPORT_SEARCH_TABLES,
+    CREATE_SUPPORT_SEARCH_TRIGGERS,
+    TIMESTAMP_INDEXES
+)
+from .timestamps import iso_to_epoch_us
 
-def migrate_schema() -> None:
-    """Apply database schema migrations"""
-    import sqlite3
-    import os
-    from .database_config import get_database_path
-    
-    # Use direct connection for migrations to avoid pool issues at import time
+
+# Full-text search table, the table it indexes and the indexed columns
+_SEARCH_INDEXES = (
+    ("support_cases_fts", "support_cases", "subject, description"),
+    ("support_comments_fts", "support_comments", "content"),
+)
+
+
+def _create_initial_schema(conn: sqlite3.Connection) -> None:
+    """Create the tables and their base indexes"""
+    for sql in (
+        CREATE_SUPPORT_CASES_TABLE,
+        CREATE_SUPPORT_RESPONSES_TABLE,
+        CREATE_SUPPORT_COMMENTS_TABLE,
+        CREATE_EVIDENCE_BLOBS_TABLE,
+        CREATE_EVIDENCE_REFERENCES_TABLE,
+        CREATE_EVIDENCE_VARIANTS_TABLE
+    ):
+        conn.execute(sql)
+    for index_sql in (CREATE_SUPPORT_CASES_INDEXES + CREATE_SUPPORT_RESPONSES_INDEXES
+                      + CREATE_SUPPORT_COMMENTS_INDEXES + CREATE_EVIDENCE_REFERENCES_INDEXES):
+        conn.execute(index_sql)
+
+
+def _add_case_details(conn: sqlite3.Connection) -> None:
+    """Add the order, product, delivery and evidence columns to support cases"""
+    add_column(conn, "support_cases", "order_id", "TEXT")
+    add_column(conn, "support_cases", "product_ids", "TEXT")
+    add_column(conn, "support_cases", "delivery_date", "TIMESTAMP")
+    add_column(conn, "support_cases", "evidence_files", "TEXT")
+
+
+def _add_search_index(conn: sqlite3.Connection) -> None:
+    """Create the full-text search tables
+
+    The triggers only index rows written from now on, so existing rows are
+    indexed by the migration's backfills.
+    """
+    for search_sql in CREATE_SUPPORT_SEARCH_TABLES + CREATE_SUPPORT_SEARCH_TRIGGERS:
+        conn.execute(search_sql)
+    for fts_table, source_table, _ in _SEARCH_INDEXES:
+        conn.execute(f"DELETE FROM {fts_table} WHERE rowid NOT IN (SELECT rowid FROM {source_table})")
+
+
+def _add_epoch_timestamps(conn: sqlite3.Connection) -> None:
+    """Add the integer epoch-microsecond timestamp columns
+
+    Rows written before the columns existed are encoded from their text by
+    the migration's backfills, whether it came from Python (ISO with a 'T')
+    or from a CURRENT_TIMESTAMP default.
+    """
+    add_column(conn, "support_cases", "created_at_us", "INTEGER")
+    add_column(conn, "support_cases", "updated_at_us", "INTEGER")
+    add_column(conn, "support_comments", "timestamp_us", "INTEGER")
+    for index_sql in TIMESTAMP_INDEXES:
+        conn.execute(index_sql)
+
+
+def _add_version(conn: sqlite3.Connection) -> None:
+    """Add the optimistic concurrency version; existing rows start at 1"""
+    add_column(conn, "support_cases", "version", "INTEGER NOT NULL DEFAULT 1")
+
+
+MIGRATIONS = [
+    Migration(1, "initial_schema", _create_initial_schema),
+    Migration(2, "case_details", _add_case_details),
+    Migration(3, "search_index", _add_search_index, backfills=tuple(
+        Backfill(
+            source_table,
+            f"rowid NOT IN (SELECT rowid FROM {fts_table})",
+            f"""
+            INSERT INTO {fts_table} (rowid, {columns})
+            SELECT rowid, {columns} FROM {source_table}
+            WHERE rowid BETWEEN :first_rowid AND :last_rowid
+              AND rowid NOT IN (SELECT rowid FROM {fts_table})
+            """
+        )
+        for fts_table, source_table, columns in _SEARCH_INDEXES
+    )),
+    Migration(4, "epoch_timestamps", _add_epoch_timestamps, backfills=(
+        Backfill.update(
+            "support_cases",
+            "created_at_us = iso_to_epoch_us(created_at), updated_at_us = iso_to_epoch_us(updated_at)",
+            "(created_at_us IS NULL AND created_at IS NOT NULL)"
+            " OR (updated_at_us IS NULL AND updated_at IS NOT NULL)"
+        ),
+        Backfill.update(
+            "support_comments",
+            "timestamp_us = iso_to_epoch_us(timestamp)",
+            "timestamp_us IS NULL AND timestamp IS NOT NULL"
+        ),
+    )),
+    Migration(5, "optimistic_concurrency", _add_version),
+]
+
+
+def _connect() -> sqlite3.Connection:
+    """Open the migration connection; the runner manages its transactions"""
     db_path = get_database_path()
     os.makedirs(os.path.dirname(db_path), exist_ok=True)
-    
-    conn = sqlite3.connect(db_path)
+
+    conn = sqlite3.connect(db_path, isolation_level=None)
     conn.row_factory = sqlite3.Row
     conn.execute("PRAGMA foreign_keys = ON")
-    
+    conn.execute("PRAGMA journal_mode = WAL")
+    conn.create_function("iso_to_epoch_us", 1, iso_to_epoch_us, deterministic=True)
+    return conn
+
+
+def migrate_schema() -> None:
+    """Apply the migrations this database has not had yet
+
+    A no-op costing one query when the schema is current.
+    """
+    conn = _connect()
     try:
-        cursor = conn.cursor()
-        
-        # Check if order_id column exists
-        cursor.execute("PRAGMA table_info(support_cases)")
-        columns = [col[1] for col in cursor.fetchall()]
-        
-        # Add missing columns
-        if "order_id" not in columns:
-            cursor.execute("ALTER TABLE support_cases ADD COLUMN order_id TEXT")
-            print("Added order_id column to support_cases table")
-        
-        if "product_ids" not in columns:
-            cursor.execute("ALTER TABLE support_cases ADD COLUMN product_ids TEXT")
-            print("Added product_ids column to support_cases table")
-            
-        if "delivery_date" not in columns:
-            cursor.execute("ALTER TABLE support_cases ADD COLUMN delivery_date TIMESTAMP")
-            print("Added delivery_date column to support_cases table")
-        
-        conn.commit()
-        print("Schema migration completed successfully")
-        
+        if run_migrations(conn, MIGRATIONS):
+            print("Schema migration completed successfully")
     except Exception as e:
-        conn.rollback()
         print(f"Migration error: {e}")
         raise
     finally:
-        conn.close()
\ No newline at end of file
+        conn.close()
@@ -0,0 +1,87 @@
+"""Pool of read-only SQLite connections
+
+In WAL mode readers never wait for the writer: each query reads the last
+committed snapshot while a write transaction is open. Opening a connection
+per read still costs a file open, the connection PRAGMAs and a cold page
+cache every time. A ReaderPool keeps a few connections open instead and
+lends them out one read at a time. Its connections are opened with
+``PRAGMA query_only``, so a write sent down the read path fails loudly
+instead of taking the write lock.
+"""
+
+import queue
+import sqlite3
+import threading
+from contextlib import contextmanager
+from typing import Callable, Iterator
+
+
+class ReaderPool:
+    """Bounded pool of read-only connections shared across threads
+
+    Connections are opened on demand up to ``size``; once that many are
+    lent out, further readers wait for one to be returned. A connection is
+    used by one thread at a time, so it must be opened with
+    ``check_same_thread=False``.
+    """
+
+    def __init__(self, connect: Callable[[], sqlite3.Connection], size: int = 4):
+        """Initialize the pool; no connection is opened until the first read
+
+        Args:
+            connect: Opens one read-only connection
+            size: Most connections open at once
+        """
+        self._connect = connect
+        self._size = size
+        self._idle: queue.LifoQueue = queue.LifoQueue()
+        self._opened = 0
+        self._lock = threading.Lock()
+        self._closed = False
+
+    @contextmanager
+    def connection(self) -> Iterator[sqlite3.Connection]:
+        """Borrow a connection for one read"""
+        conn = self._acquire()
+        try:
+            yield conn
+        finally:
+            self._release(conn)
+
+    def close(self) -> None:
+        """Close the idle connections; borrowed ones are closed when returned"""
+        self._closed = True
+        while True:
+            try:
+                self._idle.get_nowait().close()
+            except queue.Empty:
+                return
+
+    def _acquire(self) -> sqlite3.Connection:
+        # Most recently returned first, since its page cache is warmest
+        try:
+            return self._idle.get_nowait()
+        except queue.Empty:
+            pass
+
+        with self._lock:
+            can_open = self._opened < self._size
+            if can_open:
+                self._opened += 1
+        if not can_open:
+            return self._idle.get()
+
+        try:
+            return self._connect()
+        except Exception:
+            with self._lock:
+                self._opened -= 1
+            raise
+
+    def _release(self, conn: sqlite3.Connection) -> None:
+        if self._closed:
+            conn.close()
+            return
+        if conn.in_transaction:
+            conn.rollback()
+        self._idle.put(conn)
@@ -13,8 +13,12 @@ CREATE TABLE IF NOT EXISTS support_cases (
     order_id TEXT,
     product_ids TEXT, -- Comma-separated list of product IDs
     delivery_date TIMESTAMP,
+    evidence_files TEXT, -- Comma-separated list of stored evidence file paths
     created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    created_at_us INTEGER, -- created_at as microseconds since the Unix epoch (UTC)
+    updated_at_us INTEGER, -- updated_at as microseconds since the Unix epoch (UTC)
+    version INTEGER NOT NULL DEFAULT 1 -- optimistic concurrency; bumped on every write to the row
 );
 """
 
@@ -44,10 +48,102 @@ CREATE TABLE IF NOT EXISTS support_comments (
     attachments TEXT, -- JSON array of file paths
     is_internal BOOLEAN DEFAULT FALSE,
     timestamp TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    timestamp_us INTEGER, -- timestamp as microseconds since the Unix epoch (UTC)
     FOREIGN KEY (case_number) REFERENCES support_cases(case_number)
 );
 """
 
+CREATE_EVIDENCE_BLOBS_TABLE = """
+CREATE TABLE IF NOT EXISTS evidence_blobs (
+    checksum TEXT PRIMARY KEY, -- hex SHA-256 of the blob content
+    blob_path TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    ref_count INTEGER NOT NULL DEFAULT 0,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+"""
+
+CREATE_EVIDENCE_REFERENCES_TABLE = """
+CREATE TABLE IF NOT EXISTS evidence_references (
+    file_path TEXT PRIMARY KEY, -- path handed out to callers
+    checksum TEXT NOT NULL,
+    original_filename TEXT,
+    content_type TEXT,
+    is_hard_link BOOLEAN DEFAULT FALSE, -- FALSE means a pointer record resolved through evidence_blobs
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    FOREIGN KEY (checksum) REFERENCES evidence_blobs(checksum)
+);
+"""
+
+CREATE_EVIDENCE_VARIANTS_TABLE = """
+CREATE TABLE IF NOT EXISTS evidence_variants (
+    file_path TEXT NOT NULL, -- stored path of the original evidence file
+    variant TEXT NOT NULL, -- variant name, e.g. thumbnail or web
+    variant_path TEXT NOT NULL,
+    width INTEGER NOT NULL,
+    height INTEGER NOT NULL,
+    size INTEGER NOT NULL,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    PRIMARY KEY (file_path, variant)
+);
+"""
+
+# Full-text search over case subjects/descriptions and comment content.
+# The FTS rowid mirrors the source table's rowid; triggers keep both in sync.
+CREATE_SUPPORT_SEARCH_TABLES = [
+    """
+    CREATE VIRTUAL TABLE IF NOT EXISTS support_cases_fts USING fts5(
+        subject,
+        description,
+        tokenize = 'porter unicode61 remove_diacritics 2'
+    );
+    """,
+    """
+    CREATE VIRTUAL TABLE IF NOT EXISTS support_comments_fts USING fts5(
+        content,
+        tokenize = 'porter unicode61 remove_diacritics 2'
+    );
+    """
+]
+
+# INSERT OR REPLACE only fires the delete triggers with recursive_triggers on,
+# so the insert triggers replace any row left behind under the same rowid
+CREATE_SUPPORT_SEARCH_TRIGGERS = [
+    """
+    CREATE TRIGGER IF NOT EXISTS support_cases_fts_insert AFTER INSERT ON support_cases BEGIN
+        INSERT OR REPLACE INTO support_cases_fts (rowid, subject, description)
+        VALUES (new.rowid, new.subject, new.description);
+    END;
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS support_cases_fts_update AFTER UPDATE OF subject, description ON support_cases BEGIN
+        UPDATE support_cases_fts SET subject = new.subject, description = new.description
+        WHERE rowid = new.rowid;
+    END;
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS support_cases_fts_delete AFTER DELETE ON support_cases BEGIN
+        DELETE FROM support_cases_fts WHERE rowid = old.rowid;
+    END;
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS support_comments_fts_insert AFTER INSERT ON support_comments BEGIN
+        INSERT OR REPLACE INTO support_comments_fts (rowid, content)
+        VALUES (new.rowid, new.content);
+    END;
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS support_comments_fts_update AFTER UPDATE OF content ON support_comments BEGIN
+        UPDATE support_comments_fts SET content = new.content WHERE rowid = new.rowid;
+    END;
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS support_comments_fts_delete AFTER DELETE ON support_comments BEGIN
+        DELETE FROM support_comments_fts WHERE rowid = old.rowid;
+    END;
+    """
+]
+
 # Indexes for performance
 CREATE_SUPPORT_CASES_INDEXES = [
     "CREATE INDEX IF NOT EXISTS idx_support_cases_customer ON support_cases(customer_id);",
@@ -64,4 +160,17 @@ CREATE_SUPPORT_COMMENTS_INDEXES = [
     "CREATE INDEX IF NOT EXISTS idx_support_comments_case ON support_comments(case_number);",
     "CREATE INDEX IF NOT EXISTS idx_support_comments_timestamp ON support_comments(timestamp);",
     "CREATE INDEX IF NOT EXISTS idx_support_comments_type ON support_comments(comment_type);"
-]
\ No newline at end of file
+]
+
+CREATE_EVIDENCE_REFERENCES_INDEXES = [
+    "CREATE INDEX IF NOT EXISTS idx_evidence_references_checksum ON evidence_references(checksum);"
+]
+
+# Integer epoch-microsecond timestamps: date-range filters and comment
+# timelines are served straight from these indexes
+TIMESTAMP_INDEXES = [
+    "CREATE INDEX IF NOT EXISTS idx_support_cases_created ON support_cases(created_at_us);",
+    "CREATE INDEX IF NOT EXISTS idx_support_cases_updated ON support_cases(updated_at_us);",
+    """CREATE INDEX IF NOT EXISTS idx_support_comments_timeline
+       ON support_comments(case_number, timestamp_us);"""
+]
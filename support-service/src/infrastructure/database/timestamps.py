@@ -0,0 +1,43 @@
+"""Integer epoch-microsecond encoding for stored timestamps
+
+Timestamps are stored as ISO text, as they always have been, and alongside
+that in INTEGER ``*_us`` columns holding microseconds since the Unix epoch
+in UTC. The integer columns back the timestamp indexes, range filters and
+ordering: they compare numerically regardless of how the text was written,
+and their index entries are a few bytes instead of a 26-character string.
+Objects are still decoded from the ISO text, since ``fromisoformat`` is
+faster than rebuilding a datetime from an integer.
+"""
+
+from datetime import datetime, timedelta, timezone
+from typing import Optional
+
+_EPOCH = datetime(1970, 1, 1)
+_MICROSECOND = timedelta(microseconds=1)
+
+
+def to_epoch_us(value: Optional[datetime]) -> Optional[int]:
+    """Encode a datetime as integer microseconds since the epoch
+
+    Naive datetimes are taken to be UTC, like everything the services
+    write; aware ones are converted to UTC first.
+    """
+    if value is None:
+        return None
+    if value.tzinfo is not None:
+        value = value.astimezone(timezone.utc).replace(tzinfo=None)
+    return (value - _EPOCH) // _MICROSECOND
+
+
+def iso_to_epoch_us(value: Optional[str]) -> Optional[int]:
+    """Encode a stored ISO timestamp, or None if it is missing or malformed
+
+    Registered as an SQL function by the migration that backfills the
+    integer columns.
+    """
+    if not value:
+        return None
+    try:
+        return to_epoch_us(datetime.fromisoformat(value))
+    except ValueError:
+        return None
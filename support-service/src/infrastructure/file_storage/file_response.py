@@ -0,0 +1,211 @@
+"""HTTP responses for serving stored evidence files"""
+
+import asyncio
+import os
+import stat
+from email.utils import formatdate
+from hashlib import md5
+from mimetypes import guess_type
+from typing import Optional, Tuple
+
+import anyio
+from fastapi import Request
+from starlette.responses import Response
+from starlette.types import Receive, Scope, Send
+
+
+# Stored evidence never changes under a given path, so clients may cache it
+# for a long time; "private" keeps customer photos out of shared caches.
+EVIDENCE_CACHE_CONTROL = "private, max-age=31536000, immutable"
+
+
+class RangeNotSatisfiableError(ValueError):
+    """Raised when a Range header lies entirely outside the file"""
+
+
+def parse_range_header(range_header: str, file_size: int) -> Optional[Tuple[int, int]]:
+    """Parse a single ``bytes=`` range into an inclusive (start, end) pair
+
+    Returns None when the header should be ignored (unknown unit, malformed
+    or multiple ranges), in which case the full file is served.
+
+    Raises:
+        RangeNotSatisfiableError: If the range starts beyond the end of the file
+    """
+    unit, _, ranges = range_header.partition("=")
+    if unit.strip().lower() != "bytes" or "," in ranges:
+        return None
+
+    start_str, sep, end_str = ranges.strip().partition("-")
+    if not sep:
+        return None
+
+    try:
+        if not start_str:
+            # Suffix range: the last N bytes
+            suffix_length = int(end_str)
+            if suffix_length <= 0:
+                raise RangeNotSatisfiableError(range_header)
+            return max(file_size - suffix_length, 0), file_size - 1
+
+        start = int(start_str)
+        end = int(end_str) if end_str else file_size - 1
+    except ValueError:
+        return None
+
+    if start >= file_size:
+        raise RangeNotSatisfiableError(range_header)
+    if start > end:
+        return None
+
+    return start, min(end, file_size - 1)
+
+
+def _etag_matches(header_value: str, etag: str) -> bool:
+    """Check an If-None-Match / If-Range header against an ETag (weak comparison)"""
+    candidates = [candidate.strip() for candidate in header_value.split(",")]
+    if "*" in candidates:
+        return True
+    bare_etag = etag.removeprefix("W/")
+    return any(candidate.removeprefix("W/") == bare_etag for candidate in candidates)
+
+
+class EvidenceFileResponse(Response):
+    """File response with byte ranges and zero-copy sending
+
+    When the ASGI server advertises the ``http.response.zerocopysend``
+    extension the open file is handed to the server, which uses
+    ``sendfile`` so the bytes never pass through Python. Full-file responses
+    can also use ``http.response.pathsend``. Otherwise the requested byte
+    range is streamed in chunks. The pinned uvicorn advertises neither
+    extension, so under it every download is streamed.
+    """
+
+    chunk_size = 64 * 1024
+
+    def __init__(
+        self,
+        path: str,
+        stat_result: os.stat_result,
+        status_code: int = 200,
+        headers: Optional[dict] = None,
+        media_type: Optional[str] = None,
+        byte_range: Optional[Tuple[int, int]] = None,
+        send_header_only: bool = False
+    ):
+        self.path = path
+        self.status_code = status_code
+        self.media_type = media_type
+        self.background = None
+        self.send_header_only = send_header_only
+        self.init_headers(headers)
+
+        file_size = stat_result.st_size
+        self.offset, end = byte_range if byte_range else (0, file_size - 1)
+        self.count = max(end - self.offset + 1, 0)
+        self.is_partial = byte_range is not None
+
+        self.headers["content-length"] = str(self.count)
+        self.headers.setdefault("accept-ranges", "bytes")
+        if self.is_partial:
+            self.headers["content-range"] = f"bytes {self.offset}-{end}/{file_size}"
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        await send(
+            {
+                "type": "http.response.start",
+                "status": self.status_code,
+                "headers": self.raw_headers,
+            }
+        )
+
+        if self.send_header_only or self.count == 0:
+            await send({"type": "http.response.body", "body": b"", "more_body": False})
+            return
+
+        extensions = scope.get("extensions") or {}
+
+        if "http.response.zerocopysend" in extensions:
+            file = await anyio.to_thread.run_sync(open, self.path, "rb")
+            with file:
+                await send(
+                    {
+                        "type": "http.response.zerocopysend",
+                        "file": file,
+                        "offset": self.offset,
+                        "count": self.count,
+                        "more_body": False,
+                    }
+                )
+            return
+
+        if "http.response.pathsend" in extensions and not self.is_partial:
+            await send({"type": "http.response.pathsend", "path": os.path.abspath(self.path)})
+            return
+
+        async with await anyio.open_file(self.path, mode="rb") as file:
+            await file.seek(self.offset)
+            remaining = self.count
+            while remaining > 0:
+                chunk = await file.read(min(self.chunk_size, remaining))
+                if not chunk:
+                    break
+                remaining -= len(chunk)
+                await send(
+                    {
+                        "type": "http.response.body",
+                        "body": chunk,
+                        "more_body": remaining > 0,
+                    }
+                )
+            if remaining > 0:
+                # File shrank underneath us; terminate the response cleanly
+                await send({"type": "http.response.body", "body": b"", "more_body": False})
+
+
+async def evidence_file_response(
+    request: Request,
+    path: str,
+    cache_control: str = EVIDENCE_CACHE_CONTROL
+) -> Response:
+    """Build a conditional, range-aware response for a stored evidence file
+
+    Raises:
+        FileNotFoundError: If the path does not point to a regular file
+    """
+    stat_result = await asyncio.to_thread(os.stat, path)
+    if not stat.S_ISREG(stat_result.st_mode):
+        raise FileNotFoundError(path)
+
+    etag_base = f"{stat_result.st_mtime}-{stat_result.st_size}"
+    etag = f'"{md5(etag_base.encode(), usedforsecurity=False).hexdigest()}"'
+    headers = {
+        "etag": etag,
+        "last-modified": formatdate(stat_result.st_mtime, usegmt=True),
+        "cache-control": cache_control,
+    }
+
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match and _etag_matches(if_none_match, etag):
+        return Response(status_code=304, headers=headers)
+
+    media_type = guess_type(path)[0] or "application/octet-stream"
+    byte_range = None
+    range_header = request.headers.get("range")
+    if_range = request.headers.get("if-range")
+    if range_header and (not if_range or _etag_matches(if_range, etag)):
+        try:
+            byte_range = parse_range_header(range_header, stat_result.st_size)
+        except RangeNotSatisfiableError:
+            headers["content-range"] = f"bytes */{stat_result.st_size}"
+            return Response(status_code=416, headers=headers)
+
+    return EvidenceFileResponse(
+        path,
+        stat_result,
+        status_code=206 if byte_range else 200,
+        headers=headers,
+        media_type=media_type,
+        byte_range=byte_range,
+        send_header_only=request.method == "HEAD"
+    )
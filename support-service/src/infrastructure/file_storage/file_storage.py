@@ -1,71 +1,548 @@
 """File storage integration for evidence photos"""
 
+import asyncio
+import hashlib
 import os
 import uuid
-from typing import List, Optional
+from dataclasses import dataclass
+from typing import Dict, List, Optional
 from fastapi import UploadFile
 
+from ..database.database_config import get_connection
+
+
+# Read uploads in 64 KiB chunks so memory per upload stays constant
+CHUNK_SIZE = 64 * 1024
+
+# Default number of files streamed to disk at the same time per batch
+DEFAULT_UPLOAD_CONCURRENCY = 4
+
+# Extensions that describe the same content type
+_EQUIVALENT_TYPES = {"jpeg": "jpg", "heif": "heic"}
+
+
+def _normalize_type(file_type: str) -> str:
+    """Normalize a file extension so equivalent spellings compare equal"""
+    file_type = file_type.lower().lstrip(".")
+    return _EQUIVALENT_TYPES.get(file_type, file_type)
+
+
+def detect_file_type(header: bytes) -> Optional[str]:
+    """Detect the file type from the leading bytes of its content"""
+    if header.startswith(b"\xff\xd8\xff"):
+        return "jpg"
+    if header.startswith(b"\x89PNG\r\n\x1a\n"):
+        return "png"
+    if header[:6] in (b"GIF87a", b"GIF89a"):
+        return "gif"
+    if header[:4] == b"RIFF" and header[8:12] == b"WEBP":
+        return "webp"
+    if header[4:8] == b"ftyp" and header[8:12] in (b"heic", b"heix", b"mif1", b"msf1"):
+        return "heic"
+    if header.startswith(b"%PDF-"):
+        return "pdf"
+    return None
+
+
+class FileTooLargeError(ValueError):
+    """Raised when an upload exceeds the configured size limit while streaming"""
+
+    def __init__(self, filename: Optional[str], max_size_bytes: int):
+        self.filename = filename
+        self.max_size_bytes = max_size_bytes
+        super().__init__(
+            f"File {filename or '<unnamed>'} exceeds maximum size of {max_size_bytes} bytes"
+        )
+
+
+class InvalidFileTypeError(ValueError):
+    """Raised when an upload's extension or content is not an allowed type"""
+
+    def __init__(self, filename: Optional[str], allowed_types: List[str]):
+        self.filename = filename
+        self.allowed_types = allowed_types
+        super().__init__(
+            f"File {filename or '<unnamed>'} is not an allowed type ({', '.join(allowed_types)})"
+        )
+
+
+@dataclass(frozen=True)
+class StoredFile:
+    """Result of persisting an uploaded file"""
+    file_path: str
+    size: int
+    checksum: str  # hex-encoded SHA-256 of the file content
+    original_filename: Optional[str] = None
+    content_type: Optional[str] = None
+
+    def to_dict(self) -> dict:
+        """Convert stored file to dictionary for serialization"""
+        return {
+            "file_path": self.file_path,
+            "size": self.size,
+            "checksum": self.checksum,
+            "original_filename": self.original_filename,
+            "content_type": self.content_type
+        }
+
 
 class FileStorageService:
-    """Service for handling file uploads and storage for evidence photos"""
+    """Service for handling file uploads and storage for evidence photos
+
+    In content-addressed mode every distinct content is stored once as a blob
+    under ``<upload_dir>/blobs/<aa>/<bb>/<sha256>``. Each saved upload still
+    gets its own file path, backed by a hard link to the blob (or a pointer
+    record when the filesystem cannot link), and reference counts in the
+    ``evidence_blobs`` table decide when a blob can be removed.
+
+    Blobs and reference counts live in this service's own upload directory
+    and database, so only duplicates within one service are stored once. A
+    photo attached to both a support case and its refund request is still
+    stored by each service.
+    """
 
-    def __init__(self, upload_dir: str = "uploads"):
-        """Initialize with upload directory"""
+    def __init__(self, upload_dir: str = "uploads", content_addressed: bool = False):
+        """Initialize with upload directory and storage mode"""
         self.upload_dir = upload_dir
+        self.content_addressed = content_addressed
+        self.blob_dir = os.path.join(upload_dir, "blobs")
         os.makedirs(upload_dir, exist_ok=True)
 
+    def _generate_file_path(self, filename: Optional[str]) -> str:
+        """Build a unique storage path keeping the original file extension"""
+        file_extension = filename.split('.')[-1] if filename and '.' in filename else 'bin'
+        return os.path.join(self.upload_dir, f"{uuid.uuid4()}.{file_extension}")
+
     async def save_file(self, file: UploadFile) -> str:
         """Save uploaded file and return file path"""
-        # Generate unique filename
-        file_extension = file.filename.split('.')[-1] if '.' in file.filename else 'bin'
-        filename = f"{uuid.uuid4()}.{file_extension}"
-        file_path = os.path.join(self.upload_dir, filename)
-        
-        # Save file
-        with open(file_path, "wb") as buffer:
-            content = await file.read()
-            buffer.write(content)
-        
-        return file_path
-
-    async def save_multiple_files(self, files: List[UploadFile]) -> List[str]:
+        stored_file = await self.save_file_stream(file)
+        return stored_file.file_path
+
+    async def save_file_stream(
+        self,
+        file: UploadFile,
+        max_size_bytes: Optional[int] = None,
+        chunk_size: int = CHUNK_SIZE,
+        allowed_types: Optional[List[str]] = None
+    ) -> StoredFile:
+        """Stream an upload to disk in fixed-size chunks
+
+        The size limit is enforced and the SHA-256 checksum computed while the
+        chunks pass through, and all disk I/O runs in a worker thread so the
+        event loop keeps serving other requests. Content is written to a
+        temporary ``.part`` file that is only moved into place once complete.
+        When ``allowed_types`` is given, both the extension and the content
+        signature of the first chunk must match one of them.
+
+        Raises:
+            FileTooLargeError: If the upload exceeds ``max_size_bytes``
+            InvalidFileTypeError: If the upload is not one of ``allowed_types``
+        """
+        allowed = {_normalize_type(t) for t in allowed_types} if allowed_types is not None else None
+        if allowed is not None and not self.validate_file_type(file, list(allowed)):
+            raise InvalidFileTypeError(file.filename, sorted(allowed))
+
+        file_path = self._generate_file_path(file.filename)
+        temp_path = f"{file_path}.part"
+        digest = hashlib.sha256()
+        size = 0
+
+        buffer = await asyncio.to_thread(open, temp_path, "wb")
+        try:
+            while True:
+                chunk = await file.read(chunk_size)
+                if not chunk:
+                    break
+
+                if size == 0 and allowed is not None and detect_file_type(chunk) not in allowed:
+                    raise InvalidFileTypeError(file.filename, sorted(allowed))
+
+                size += len(chunk)
+                if max_size_bytes is not None and size > max_size_bytes:
+                    raise FileTooLargeError(file.filename, max_size_bytes)
+
+                digest.update(chunk)
+                await asyncio.to_thread(buffer.write, chunk)
+
+            if size == 0 and allowed is not None:
+                raise InvalidFileTypeError(file.filename, sorted(allowed))
+
+            await asyncio.to_thread(buffer.close)
+        except BaseException:
+            await asyncio.to_thread(self._discard_partial, buffer, temp_path)
+            raise
+
+        stored_file = StoredFile(
+            file_path=file_path,
+            size=size,
+            checksum=digest.hexdigest(),
+            original_filename=file.filename,
+            content_type=file.content_type
+        )
+
+        if self.content_addressed:
+            await asyncio.to_thread(self._store_content_addressed, temp_path, stored_file)
+        else:
+            await asyncio.to_thread(os.replace, temp_path, file_path)
+
+        return stored_file
+
+    @staticmethod
+    def _discard_partial(buffer, temp_path: str) -> None:
+        """Close and remove a partially written upload"""
+        buffer.close()
+        try:
+            os.remove(temp_path)
+        except FileNotFoundError:
+            pass
+
+    def _blob_path(self, checksum: str) -> str:
+        """Sharded blob location for a content checksum"""
+        return os.path.join(self.blob_dir, checksum[:2], checksum[2:4], checksum)
+
+    def _store_content_addressed(self, temp_path: str, stored_file: StoredFile) -> None:
+        """Move a completed upload into the blob store and record a reference
+
+        Runs under an immediate transaction so concurrent uploads of the same
+        content agree on which one creates the blob. Duplicates discard their
+        temporary copy and only add a reference.
+        """
+        conn = get_connection()
+        created_paths = []
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+            row = conn.execute(
+                "SELECT blob_path FROM evidence_blobs WHERE checksum = ?",
+                (stored_file.checksum,)
+            ).fetchone()
+
+            if row:
+                blob_path = row["blob_path"]
+                os.remove(temp_path)
+                conn.execute(
+                    "UPDATE evidence_blobs SET ref_count = ref_count + 1 WHERE checksum = ?",
+                    (stored_file.checksum,)
+                )
+            else:
+                blob_path = self._blob_path(stored_file.checksum)
+                os.makedirs(os.path.dirname(blob_path), exist_ok=True)
+                os.replace(temp_path, blob_path)
+                created_paths.append(blob_path)
+                conn.execute(
+                    """
+                    INSERT INTO evidence_blobs (checksum, blob_path, size, ref_count)
+                    VALUES (?, ?, ?, 1)
+                    """,
+                    (stored_file.checksum, blob_path, stored_file.size)
+                )
+
+            try:
+                os.link(blob_path, stored_file.file_path)
+                created_paths.append(stored_file.file_path)
+                is_hard_link = True
+            except OSError:
+                # Filesystem without hard links: resolve through the pointer record
+                is_hard_link = False
+
+            conn.execute(
+                """
+                INSERT INTO evidence_references
+                (file_path, checksum, original_filename, content_type, is_hard_link)
+                VALUES (?, ?, ?, ?, ?)
+                """,
+                (
+                    stored_file.file_path,
+                    stored_file.checksum,
+                    stored_file.original_filename,
+                    stored_file.content_type,
+                    is_hard_link
+                )
+            )
+            conn.commit()
+        except BaseException:
+            conn.rollback()
+            for path in [temp_path] + created_paths:
+                try:
+                    os.remove(path)
+                except FileNotFoundError:
+                    pass
+            raise
+        finally:
+            conn.close()
+
+    def resolve_path(self, file_path: str) -> Optional[str]:
+        """Return the on-disk location for a stored file path
+
+        Plain files and hard-linked references resolve to themselves; pointer
+        records resolve to their blob. Returns None for unknown paths.
+        """
+        if os.path.exists(file_path):
+            return file_path
+        if not self.content_addressed:
+            return None
+
+        conn = get_connection()
+        try:
+            row = conn.execute(
+                """
+                SELECT b.blob_path FROM evidence_references r
+                JOIN evidence_blobs b ON b.checksum = r.checksum
+                WHERE r.file_path = ?
+                """,
+                (file_path,)
+            ).fetchone()
+            return row["blob_path"] if row else None
+        finally:
+            conn.close()
+
+    async def save_multiple_files(
+        self,
+        files: List[UploadFile],
+        max_concurrency: int = DEFAULT_UPLOAD_CONCURRENCY
+    ) -> List[str]:
         """Save multiple uploaded files"""
-        file_paths = []
-        for file in files:
-            file_path = await self.save_file(file)
-            file_paths.append(file_path)
-        
-        return file_paths
-
-    def get_file_url(self, file_path: str) -> str:
-        """Generate URL for accessing stored file"""
-        # In production, this would return a proper URL
-        # For development, return file path
-        return f"/files/{os.path.basename(file_path)}"
+        stored_files = await self.save_files_concurrently(files, max_concurrency=max_concurrency)
+        return [stored_file.file_path for stored_file in stored_files]
+
+    async def save_files_concurrently(
+        self,
+        files: List[UploadFile],
+        max_concurrency: int = DEFAULT_UPLOAD_CONCURRENCY,
+        allowed_types: Optional[List[str]] = None,
+        max_size_bytes: Optional[int] = None
+    ) -> List[StoredFile]:
+        """Stream a batch of uploads to disk with bounded concurrency
+
+        At most ``max_concurrency`` files are in flight at once. The batch is
+        all-or-nothing: if any file fails validation or storage, the files
+        already stored for this batch are deleted and the first error raised.
+        Results keep the order of ``files``.
+        """
+        semaphore = asyncio.Semaphore(max(1, max_concurrency))
+
+        async def save_one(file: UploadFile) -> StoredFile:
+            async with semaphore:
+                return await self.save_file_stream(
+                    file,
+                    max_size_bytes=max_size_bytes,
+                    allowed_types=allowed_types
+                )
+
+        results = await asyncio.gather(
+            *(save_one(file) for file in files),
+            return_exceptions=True
+        )
+
+        errors = [result for result in results if isinstance(result, BaseException)]
+        if errors:
+            stored = [result for result in results if isinstance(result, StoredFile)]
+            await self.delete_files(stored)
+            raise errors[0]
+
+        return list(results)
+
+    async def delete_files(self, stored_files: List[StoredFile]) -> None:
+        """Delete stored files off the event loop, e.g. to undo a failed batch"""
+        for stored_file in stored_files:
+            await asyncio.to_thread(self.delete_file, stored_file.file_path)
+
+    def get_file_url(self, file_path: str, base_url: str = "/files") -> str:
+        """Generate URL for accessing stored file
+
+        Args:
+            file_path: Stored file path as recorded on the owning aggregate
+            base_url: Path of the download route serving the owner's evidence
+        """
+        return f"{base_url.rstrip('/')}/{os.path.basename(file_path)}"
+
+    @staticmethod
+    def find_stored_path(file_paths: List[str], file_name: str) -> Optional[str]:
+        """Find the stored path whose file name matches a download request
+
+        Only names recorded on the aggregate are served, so a request can
+        never reach outside the files it owns.
+        """
+        for file_path in file_paths:
+            if os.path.basename(file_path) == file_name:
+                return file_path
+        return None
+
+    def find_stored_file(self, file_paths: List[str], file_name: str) -> Optional[str]:
+        """Resolve a download file name against an aggregate's stored paths"""
+        stored_path = self.find_stored_path(file_paths, file_name)
+        return self.resolve_path(stored_path) if stored_path else None
+
+    def record_variants(self, file_path: str, variants: Dict[str, dict]) -> None:
+        """Record generated image variants alongside their original"""
+        if not variants:
+            return
+
+        conn = get_connection()
+        try:
+            conn.executemany(
+                """
+                INSERT OR REPLACE INTO evidence_variants
+                (file_path, variant, variant_path, width, height, size)
+                VALUES (?, ?, ?, ?, ?, ?)
+                """,
+                [
+                    (
+                        file_path,
+                        name,
+                        variant["variant_path"],
+                        variant["width"],
+                        variant["height"],
+                        variant["size"]
+                    )
+                    for name, variant in variants.items()
+                ]
+            )
+            conn.commit()
+        finally:
+            conn.close()
+
+    def find_variant_path(self, file_path: str, variant: str) -> Optional[str]:
+        """Return the on-disk path of a recorded variant, if it has been generated"""
+        conn = get_connection()
+        try:
+            row = conn.execute(
+                "SELECT variant_path FROM evidence_variants WHERE file_path = ? AND variant = ?",
+                (file_path, variant)
+            ).fetchone()
+        finally:
+            conn.close()
+
+        if row and os.path.exists(row["variant_path"]):
+            return row["variant_path"]
+        return None
+
+    def find_variants(self, file_paths: List[str]) -> Dict[str, List[str]]:
+        """Map each stored path to the names of its generated variants"""
+        if not file_paths:
+            return {}
+
+        conn = get_connection()
+        try:
+            placeholders = ",".join("?" for _ in file_paths)
+            rows = conn.execute(
+                f"SELECT file_path, variant FROM evidence_variants WHERE file_path IN ({placeholders})",
+                list(file_paths)
+            ).fetchall()
+        finally:
+            conn.close()
+
+        variants: Dict[str, List[str]] = {}
+        for row in rows:
+            variants.setdefault(row["file_path"], []).append(row["variant"])
+        return variants
+
+    def _delete_variants(self, file_path: str) -> None:
+        """Remove the generated variants of a stored file"""
+        conn = get_connection()
+        try:
+            rows = conn.execute(
+                "SELECT variant_path FROM evidence_variants WHERE file_path = ?",
+                (file_path,)
+            ).fetchall()
+            conn.execute("DELETE FROM evidence_variants WHERE file_path = ?", (file_path,))
+            conn.commit()
+        finally:
+            conn.close()
+
+        for row in rows:
+            try:
+                os.remove(row["variant_path"])
+            except FileNotFoundError:
+                pass
 
     def delete_file(self, file_path: str) -> bool:
-        """Delete stored file"""
+        """Delete stored file
+
+        Generated variants are removed with it. In content-addressed mode
+        this drops one reference; the blob itself is only removed when its
+        last reference goes.
+        """
+        self._delete_variants(file_path)
+
+        if self.content_addressed:
+            deleted = self._delete_reference(file_path)
+            if deleted is not None:
+                return deleted
+
         try:
             os.remove(file_path)
             return True
         except FileNotFoundError:
             return False
 
+    def _delete_reference(self, file_path: str) -> Optional[bool]:
+        """Release a content-addressed reference
+
+        Returns None when the path has no reference record, so files stored
+        before content addressing was enabled fall back to a plain delete.
+        """
+        conn = get_connection()
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+            row = conn.execute(
+                """
+                SELECT r.checksum, r.is_hard_link, b.blob_path, b.ref_count
+                FROM evidence_references r
+                JOIN evidence_blobs b ON b.checksum = r.checksum
+                WHERE r.file_path = ?
+                """,
+                (file_path,)
+            ).fetchone()
+            if not row:
+                conn.rollback()
+                return None
+
+            conn.execute("DELETE FROM evidence_references WHERE file_path = ?", (file_path,))
+            remove_blob = row["ref_count"] <= 1
+            if remove_blob:
+                conn.execute("DELETE FROM evidence_blobs WHERE checksum = ?", (row["checksum"],))
+            else:
+                conn.execute(
+                    "UPDATE evidence_blobs SET ref_count = ref_count - 1 WHERE checksum = ?",
+                    (row["checksum"],)
+                )
+            conn.commit()
+        except BaseException:
+            conn.rollback()
+            raise
+        finally:
+            conn.close()
+
+        # Unlink only after the bookkeeping is durable
+        paths = [file_path] if row["is_hard_link"] else []
+        if remove_blob:
+            paths.append(row["blob_path"])
+        for path in paths:
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+        return True
+
     def validate_file_type(self, file: UploadFile, allowed_types: List[str]) -> bool:
         """Validate file type"""
         if not file.filename:
             return False
-        
-        file_extension = file.filename.split('.')[-1].lower()
-        return file_extension in allowed_types
+
+        file_extension = _normalize_type(file.filename.split('.')[-1])
+        return file_extension in {_normalize_type(t) for t in allowed_types}
 
     def validate_file_size(self, file: UploadFile, max_size_mb: int = 10) -> bool:
-        """Validate file size"""
+        """Validate file size
+
+        Prefer passing ``max_size_bytes`` to ``save_file_stream``, which
+        enforces the limit without a separate pass over the spooled file.
+        """
         max_size_bytes = max_size_mb * 1024 * 1024
-        
+
         # Read file size
         file.file.seek(0, 2)  # Seek to end
         file_size = file.file.tell()
         file.file.seek(0)  # Seek back to start
-        
-        return file_size <= max_size_bytes
\ No newline at end of file
+
+        return file_size <= max_size_bytes
@@ -0,0 +1,207 @@
+"""Background generation of resized variants for evidence photos"""
+
+import asyncio
+import logging
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Optional, Tuple
+
+try:
+    from PIL import Image, ImageOps
+except ImportError:  # Pillow is optional; without it originals are served as-is
+    Image = None
+    ImageOps = None
+
+from ..config import get_config
+from .file_storage import FileStorageService, StoredFile
+
+
+logger = logging.getLogger(__name__)
+
+# Source formats Pillow decodes without extra plugins
+SUPPORTED_SOURCE_TYPES = {"jpg", "jpeg", "png", "gif", "webp"}
+
+# Variants are re-encoded as JPEG so every variant has the same media type
+VARIANT_EXTENSION = "jpg"
+VARIANT_QUALITY = 85
+
+
+def generate_variants(source_path: str, targets: Dict[str, Tuple[str, int]]) -> Dict[str, dict]:
+    """Decode an image once and write a downscaled JPEG per target
+
+    Runs inside a worker process. ``targets`` maps a variant name to its
+    output path and maximum edge length in pixels. Larger variants are
+    produced first and each smaller one is derived from the previous
+    result, so the full-resolution image is only resampled once.
+
+    Returns:
+        Variant name mapped to its path, width, height and size in bytes
+    """
+    results = {}
+    with Image.open(source_path) as image:
+        largest_edge = max(max_edge for _, max_edge in targets.values())
+        # JPEG sources can be decoded directly at a reduced scale
+        image.draft("RGB", (largest_edge, largest_edge))
+        current = ImageOps.exif_transpose(image).convert("RGB")
+
+        for name, (output_path, max_edge) in sorted(
+            targets.items(), key=lambda item: item[1][1], reverse=True
+        ):
+            current.thumbnail((max_edge, max_edge), Image.Resampling.LANCZOS)
+
+            temp_path = f"{output_path}.part"
+            os.makedirs(os.path.dirname(output_path), exist_ok=True)
+            current.save(temp_path, "JPEG", quality=VARIANT_QUALITY, optimize=True)
+            os.replace(temp_path, output_path)
+
+            results[name] = {
+                "variant_path": output_path,
+                "width": current.width,
+                "height": current.height,
+                "size": os.path.getsize(output_path)
+            }
+
+    return results
+
+
+class ImageVariantProcessor:
+    """Generates thumbnails and web-size copies of stored evidence photos
+
+    Decoding and resampling are CPU-bound, so they run in a separate process
+    pool and never hold the API workers' event loop or GIL. Jobs are fire and
+    forget: uploads return as soon as the originals are stored, and the
+    download endpoint serves the original until a variant has been recorded.
+    """
+
+    def __init__(
+        self,
+        file_storage: FileStorageService,
+        variant_sizes: Dict[str, int],
+        max_workers: int = 2
+    ):
+        """Initialize with the storage service, variant sizes and pool size"""
+        self.file_storage = file_storage
+        self.variant_sizes = variant_sizes
+        self.max_workers = max_workers
+        self.variant_dir = os.path.join(file_storage.upload_dir, "variants")
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._tasks: set = set()
+
+    @property
+    def is_available(self) -> bool:
+        """Whether variants can be generated in this environment"""
+        return Image is not None and bool(self.variant_sizes)
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        """Start the process pool on first use
+
+        Workers are started from a forkserver rather than forked from this
+        process. By the first upload the server already runs threads (upload
+        workers, the group commit writer, readers), and a child forked while
+        one of them holds a lock, such as the logging or sqlite lock, can
+        deadlock.
+        """
+        if self._executor is None:
+            if "forkserver" in multiprocessing.get_all_start_methods():
+                context = multiprocessing.get_context("forkserver")
+                # Workers only need generate_variants, not the application
+                context.set_forkserver_preload([__name__])
+            else:
+                context = multiprocessing.get_context("spawn")
+            self._executor = ProcessPoolExecutor(max_workers=self.max_workers, mp_context=context)
+        return self._executor
+
+    def supports(self, file_path: str) -> bool:
+        """Check whether a stored file is an image variants can be made from"""
+        extension = os.path.splitext(file_path)[1].lower().lstrip(".")
+        return extension in SUPPORTED_SOURCE_TYPES
+
+    def schedule(self, stored_files: List[StoredFile]) -> List[asyncio.Task]:
+        """Queue variant generation for newly stored files
+
+        Must be called from the event loop. Non-image files are skipped.
+        """
+        if not self.is_available:
+            return []
+
+        tasks = []
+        for stored_file in stored_files:
+            if not self.supports(stored_file.file_path):
+                continue
+            task = asyncio.create_task(self.process(stored_file.file_path))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+            tasks.append(task)
+        return tasks
+
+    async def process(self, file_path: str) -> Dict[str, dict]:
+        """Generate and record all variants for one stored file
+
+        Failures are logged rather than raised; the original stays servable.
+        """
+        try:
+            source_path = await asyncio.to_thread(self.file_storage.resolve_path, file_path)
+            if not source_path:
+                return {}
+
+            stem = os.path.splitext(os.path.basename(file_path))[0]
+            targets = {
+                name: (os.path.join(self.variant_dir, f"{stem}.{name}.{VARIANT_EXTENSION}"), max_edge)
+                for name, max_edge in self.variant_sizes.items()
+            }
+
+            loop = asyncio.get_running_loop()
+            variants = await loop.run_in_executor(
+                self._get_executor(), generate_variants, source_path, targets
+            )
+            await asyncio.to_thread(self.file_storage.record_variants, file_path, variants)
+            return variants
+        except Exception:
+            logger.exception("Failed to generate image variants for %s", file_path)
+            return {}
+
+    async def wait_idle(self) -> None:
+        """Wait for all queued variant jobs to finish"""
+        if self._tasks:
+            await asyncio.gather(*list(self._tasks), return_exceptions=True)
+
+    def shutdown(self) -> None:
+        """Stop the process pool, dropping jobs that have not started"""
+        if self._executor is not None:
+            self._executor.shutdown(wait=True, cancel_futures=True)
+            self._executor = None
+
+
+_variant_processor: Optional[ImageVariantProcessor] = None
+
+
+def get_variant_processor() -> Optional[ImageVariantProcessor]:
+    """Get the process-wide variant processor, or None when variants are disabled"""
+    global _variant_processor
+    config = get_config()
+    if not config.evidence_variants_enabled:
+        return None
+
+    if _variant_processor is None:
+        _variant_processor = ImageVariantProcessor(
+            FileStorageService(
+                upload_dir=config.evidence_upload_dir,
+                content_addressed=config.evidence_content_addressed
+            ),
+            variant_sizes={
+                "thumbnail": config.evidence_thumbnail_size,
+                "web": config.evidence_web_size
+            },
+            max_workers=config.evidence_variant_workers
+        )
+        if not _variant_processor.is_available:
+            logger.warning("Pillow is not installed; evidence image variants are disabled")
+
+    return _variant_processor if _variant_processor.is_available else None
+
+
+def shutdown_variant_processor() -> None:
+    """Stop the variant process pool if it was started"""
+    if _variant_processor is not None:
+        _variant_processor.shutdown()
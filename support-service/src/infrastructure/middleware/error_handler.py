@@ -1,31 +1,29 @@
-"""Error handling middleware for Support Service"""
+"""Error handling for Support Service"""
 
-from fastapi import Request, HTTPException
+from fastapi import Request
 from fastapi.responses import JSONResponse
 import logging
 
 logger = logging.getLogger(__name__)
 
 
-async def error_handler(request: Request, call_next):
-    """Global error handler middleware"""
-    try:
-        response = await call_next(request)
-        return response
-        
-    except HTTPException as e:
-        # FastAPI's HTTP exceptions - pass through
-        raise e
-        
-    except Exception as e:
-        # Log unexpected errors
-        logger.error(f"Unexpected error: {e}", exc_info=True)
-        
-        return JSONResponse(
-            status_code=500,
-            content={
-                "error": "Internal Server Error",
-                "message": "An unexpected error occurred",
-                "request_id": str(request.scope.get("request_id", "unknown"))
-            }
-        )
\ No newline at end of file
+async def error_handler(request: Request, exc: Exception) -> JSONResponse:
+    """Global handler for unexpected errors
+
+    Registered with ``app.add_exception_handler(Exception, error_handler)``
+    rather than as an HTTP middleware: ``BaseHTTPMiddleware`` only relays
+    ``http.response.body`` messages, so it would break evidence downloads
+    sent with the zero-copy or pathsend ASGI extensions. HTTPExceptions are
+    handled by FastAPI before they get here.
+    """
+    # Log unexpected errors
+    logger.error(f"Unexpected error: {exc}", exc_info=exc)
+
+    return JSONResponse(
+        status_code=500,
+        content={
+            "error": "Internal Server Error",
+            "message": "An unexpected error occurred",
+            "request_id": str(request.scope.get("request_id", "unknown"))
+        }
+    )
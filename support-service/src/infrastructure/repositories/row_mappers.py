@@ -0,0 +1,150 @@
+"""Precompiled row mappers for support cases and their comments
+
+Repositories select the explicit column lists below instead of ``*`` so
+rows can be unpacked by position, with no ``dict(row)`` copy, no per-column
+name lookups, and enum lookup tables that are built once at import time.
+Mappers accept plain tuples as well as ``sqlite3.Row`` objects.
+
+The lazy support case mapper keeps the raw row and defers timestamp
+parsing and comma-separated list splitting until the attribute is first
+read, for callers that touch only a few fields of many cases.
+"""
+
+from datetime import datetime
+from typing import List, Optional
+
+from domain.comment import Comment, CommentType
+from domain.support_case import CaseStatus, CaseType, SupportCase
+
+
+SUPPORT_CASE_COLUMNS = """
+    case_number, customer_id, case_type, refund_request_id, subject, description,
+    status, assigned_agent_id, order_id, product_ids, delivery_date, evidence_files,
+    created_at, updated_at, version
+"""
+
+SUPPORT_COMMENT_COLUMNS = """
+    comment_id, case_number, author_id, author_type, content,
+    comment_type, attachments, is_internal, timestamp
+"""
+
+# Stored enum values; mappers fall back to a default member for unknown values
+CASE_TYPES = {case_type.value: case_type for case_type in CaseType}
+CASE_STATUSES = {status.value: status for status in CaseStatus}
+COMMENT_TYPES = {comment_type.value: comment_type for comment_type in CommentType}
+
+_parse_timestamp = datetime.fromisoformat
+
+
+def _split(value: Optional[str]) -> List[str]:
+    """Split a comma-separated column, treating NULL and '' as empty"""
+    return value.split(",") if value else []
+
+
+def _parse_timestamp_or_now(value: Optional[str]) -> datetime:
+    """Parse a timestamp column, defaulting to now when it is NULL"""
+    return _parse_timestamp(value) if value else datetime.utcnow()
+
+
+def _parse_optional_timestamp(value: Optional[str]) -> Optional[datetime]:
+    """Parse a nullable timestamp column"""
+    return _parse_timestamp(value) if value else None
+
+
+def map_comment(row) -> Comment:
+    """Map a SUPPORT_COMMENT_COLUMNS row to a Comment"""
+    (
+        comment_id, case_number, author_id, author_type, content,
+        comment_type, attachments, is_internal, timestamp
+    ) = row
+
+    return Comment(
+        comment_id=comment_id,
+        case_number=case_number,
+        author_id=author_id,
+        author_type=author_type,
+        content=content,
+        comment_type=COMMENT_TYPES.get(comment_type, CommentType.CUSTOMER_COMMENT),
+        attachments=attachments.split(",") if attachments else [],
+        timestamp=_parse_timestamp(timestamp) if timestamp else datetime.utcnow(),
+        is_internal=is_internal
+    )
+
+
+def map_support_case(row, comments: Optional[List[Comment]] = None) -> SupportCase:
+    """Map a SUPPORT_CASE_COLUMNS row and its comments to a SupportCase"""
+    (
+        case_number, customer_id, case_type, refund_request_ids, subject, description,
+        status, assigned_agent_id, order_id, product_ids, delivery_date, evidence_files,
+        created_at, updated_at, version
+    ) = row
+
+    return SupportCase(
+        case_number=case_number,
+        customer_id=customer_id,
+        case_type=CASE_TYPES.get(case_type, CaseType.QUESTION),
+        subject=subject,
+        description=description,
+        refund_request_ids=refund_request_ids.split(",") if refund_request_ids else [],
+        comments=comments,
+        status=CASE_STATUSES.get(status, CaseStatus.OPEN),
+        created_at=_parse_timestamp(created_at) if created_at else datetime.utcnow(),
+        updated_at=_parse_timestamp(updated_at) if updated_at else datetime.utcnow(),
+        assigned_agent_id=assigned_agent_id,
+        order_id=order_id,
+        product_ids=product_ids.split(",") if product_ids else [],
+        delivery_date=_parse_timestamp(delivery_date) if delivery_date else None,
+        evidence_files=evidence_files.split(",") if evidence_files else [],
+        version=version
+    )
+
+
+# Lazily parsed attribute -> (SUPPORT_CASE_COLUMNS index, parser)
+_LAZY_SUPPORT_CASE_COLUMNS = {
+    "refund_request_ids": (3, _split),
+    "product_ids": (9, _split),
+    "delivery_date": (10, _parse_optional_timestamp),
+    "evidence_files": (11, _split),
+    "created_at": (12, _parse_timestamp_or_now),
+    "updated_at": (13, _parse_timestamp_or_now)
+}
+
+
+class LazySupportCase(SupportCase):
+    """SupportCase whose timestamps and list columns are parsed on first read
+
+    The lazy attributes start out as unset slots. Reading one falls
+    through to ``__getattr__``, which parses the raw column and fills the
+    slot, so every later read is a plain slot read. Behaves exactly like
+    an eagerly mapped SupportCase; only when the parsing cost is paid
+    differs.
+    """
+
+    __slots__ = ("_row",)
+
+    def __getattr__(self, name: str):
+        try:
+            index, parse = _LAZY_SUPPORT_CASE_COLUMNS[name]
+        except KeyError:
+            raise AttributeError(f"'{type(self).__name__}' object has no attribute '{name}'") from None
+        value = parse(self._row[index])
+        setattr(self, name, value)
+        return value
+
+
+def map_support_case_lazy(row, comments: Optional[List[Comment]] = None) -> SupportCase:
+    """Map a SUPPORT_CASE_COLUMNS row and its comments to a LazySupportCase"""
+    support_case = object.__new__(LazySupportCase)
+    support_case._row = row
+    support_case.case_number = row[0]
+    support_case.customer_id = row[1]
+    support_case.case_type = CASE_TYPES.get(row[2], CaseType.QUESTION)
+    support_case.subject = row[4]
+    support_case.description = row[5]
+    support_case.status = CASE_STATUSES.get(row[6], CaseStatus.OPEN)
+    support_case.assigned_agent_id = row[7]
+    support_case.order_id = row[8]
+    support_case.comments = comments or []
+    support_case.is_deleted = False
+    support_case.version = row[14]
+    return support_case
@@ -1,43 +1,116 @@
 """SupportCase repository implementation"""
 
-import sqlite3
-from typing import List, Optional
-from ..database.database_config import get_connection
+from datetime import datetime
+from typing import List, Optional, Tuple
+from ..database.database_config import read_connection, run_write
+from ..database.group_commit import GroupCommitWriter
+from ..database.timestamps import to_epoch_us
+from .row_mappers import (
+    SUPPORT_CASE_COLUMNS,
+    SUPPORT_COMMENT_COLUMNS,
+    map_comment,
+    map_support_case,
+    map_support_case_lazy
+)
+
+
+# Inserts a new support case unless its number is taken, which leaves rowcount 0
+INSERT_SUPPORT_CASE_SQL = """
+    INSERT INTO support_cases 
+    (case_number, customer_id, case_type, subject, description, status, 
+     refund_request_id, assigned_agent_id, created_at, updated_at,
+     order_id, product_ids, delivery_date, evidence_files,
+     created_at_us, updated_at_us, version)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, 1)
+    ON CONFLICT (case_number) DO NOTHING
+"""
+
+# Compare-and-swap: only applies if the case is still at the version it was
+# loaded at. Takes the INSERT_SUPPORT_CASE_SQL parameters followed by the
+# expected version.
+UPDATE_SUPPORT_CASE_SQL = """
+    UPDATE support_cases
+    SET customer_id = ?2, case_type = ?3, subject = ?4, description = ?5, status = ?6,
+        refund_request_id = ?7, assigned_agent_id = ?8, created_at = ?9, updated_at = ?10,
+        order_id = ?11, product_ids = ?12, delivery_date = ?13, evidence_files = ?14,
+        created_at_us = ?15, updated_at_us = ?16, version = version + 1
+    WHERE case_number = ?1 AND version = ?17
+"""
+
+
+class ConcurrentUpdateError(Exception):
+    """Raised when a support case changed since it was loaded"""
+    
+    def __init__(self, case_number: str, expected_version: int):
+        self.case_number = case_number
+        self.expected_version = expected_version
+        if expected_version == 0:
+            message = f"Support case {case_number} already exists"
+        else:
+            message = (
+                f"Support case {case_number} was changed by another writer "
+                f"since version {expected_version}; reload it and retry"
+            )
+        super().__init__(message)
 
 
 class SupportCaseRepository:
     """Repository for SupportCase aggregate persistence"""
     
+    def __init__(self, lazy: bool = False, writer: Optional[GroupCommitWriter] = None):
+        """Initialize the repository
+        
+        Args:
+            lazy: Return support cases that parse timestamps and list
+                columns on first access instead of while loading
+            writer: Group commit writer for saves and comment inserts;
+                without one each write commits on its own
+        """
+        self._map_row = map_support_case_lazy if lazy else map_support_case
+        self._writer = writer
+    
     def save(self, support_case) -> None:
-        """Save a support case to the database"""
+        """Save a support case to the database
+        
+        A new case (version 0) is inserted. A loaded case is written back
+        only if nobody else changed it since it was loaded, so concurrent
+        writers never overwrite each other's fields or comments without
+        holding a lock between read and write. The case's version is
+        advanced to match the stored row.
+        
+        Raises:
+            ConcurrentUpdateError: The stored case changed since it was
+                loaded, or a new case's number is already taken
+        """
+        row = (
+            support_case.case_number,
+            support_case.customer_id,
+            support_case.case_type.value,
+            support_case.subject,
+            support_case.description,
+            support_case.status.value,
+            ",".join(support_case.refund_request_ids) if support_case.refund_request_ids else None,
+            support_case.assigned_agent_id,
+            support_case.created_at.isoformat(),
+            support_case.updated_at.isoformat(),
+            support_case.order_id,
+            ",".join(support_case.product_ids) if support_case.product_ids else None,
+            support_case.delivery_date.isoformat() if support_case.delivery_date else None,
+            ",".join(support_case.evidence_files) if support_case.evidence_files else None,
+            to_epoch_us(support_case.created_at),
+            to_epoch_us(support_case.updated_at)
+        )
         
-        conn = get_connection()
-        try:
+        version = support_case.version
+        
+        def write(conn):
             cursor = conn.cursor()
-            cursor.execute(
-                """
-                INSERT OR REPLACE INTO support_cases 
-                (case_number, customer_id, case_type, subject, description, status, 
-                 refund_request_id, assigned_agent_id, created_at, updated_at,
-                 order_id, product_ids, delivery_date)
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                """,
-                (
-                    support_case.case_number,
-                    support_case.customer_id,
-                    support_case.case_type.value,
-                    support_case.subject,
-                    support_case.description,
-                    support_case.status.value,
-                    ",".join(support_case.refund_request_ids) if support_case.refund_request_ids else None,
-                    support_case.assigned_agent_id,
-                    support_case.created_at.isoformat(),
-                    support_case.updated_at.isoformat(),
-                    support_case.order_id,
-                    ",".join(support_case.product_ids) if support_case.product_ids else None,
-                    support_case.delivery_date.isoformat() if support_case.delivery_date else None
-                )
-            )
+            if version == 0:
+                cursor.execute(INSERT_SUPPORT_CASE_SQL, row)
+            else:
+                cursor.execute(UPDATE_SUPPORT_CASE_SQL, row + (version,))
+            if cursor.rowcount == 0:
+                raise ConcurrentUpdateError(support_case.case_number, version)
             
             # Save comments
             if hasattr(support_case, 'comments'):
@@ -51,8 +124,8 @@ class SupportCaseRepository:
                         """
                         INSERT INTO support_comments 
                         (comment_id, case_number, author_id, author_type, content, 
-                         comment_type, attachments, is_internal, timestamp)
-                        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+                         comment_type, attachments, is_internal, timestamp, timestamp_us)
+                        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
                         """,
                         (
                             comment.comment_id,
@@ -63,21 +136,137 @@ class SupportCaseRepository:
                             comment.comment_type.value if hasattr(comment.comment_type, 'value') else comment.comment_type,
                             ",".join(comment.attachments) if comment.attachments else None,
                             comment.is_internal,
-                            comment.timestamp.isoformat()
+                            comment.timestamp.isoformat(),
+                            to_epoch_us(comment.timestamp)
                         )
                     )
+        
+        run_write(write, self._writer)
+        support_case.version = version + 1
+
+    def add_comments(self, comments: List) -> set:
+        """Insert comments across many support cases in one transaction
+        
+        The target cases are checked with a single query under the write
+        lock; comments for cases that do not exist are skipped. Comments are
+        appended with executemany instead of rewriting each case's whole
+        comment list, and every touched case gets its updated_at bumped.
+        
+        Returns:
+            Case numbers whose comments were inserted
+        """
+        if not comments:
+            return set()
+        
+        def write(conn):
+            cursor = conn.cursor()
+            
+            case_numbers = list({comment.case_number for comment in comments})
+            placeholders = ",".join("?" for _ in case_numbers)
+            cursor.execute(
+                f"SELECT case_number FROM support_cases WHERE case_number IN ({placeholders})",
+                case_numbers
+            )
+            existing = {row["case_number"] for row in cursor.fetchall()}
+            accepted = [comment for comment in comments if comment.case_number in existing]
+            
+            cursor.executemany(
+                """
+                INSERT INTO support_comments 
+                (comment_id, case_number, author_id, author_type, content, 
+                 comment_type, attachments, is_internal, timestamp, timestamp_us)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                """,
+                [
+                    (
+                        comment.comment_id,
+                        comment.case_number,
+                        comment.author_id,
+                        comment.author_type,
+                        comment.content,
+                        comment.comment_type.value,
+                        ",".join(comment.attachments) if comment.attachments else None,
+                        comment.is_internal,
+                        comment.timestamp.isoformat(),
+                        to_epoch_us(comment.timestamp)
+                    )
+                    for comment in accepted
+                ]
+            )
+            
+            latest = {}
+            for comment in accepted:
+                latest[comment.case_number] = max(latest.get(comment.case_number, comment.timestamp), comment.timestamp)
+            cursor.executemany(
+                "UPDATE support_cases SET updated_at = ?, updated_at_us = ?, version = version + 1 WHERE case_number = ?",
+                [
+                    (timestamp.isoformat(), to_epoch_us(timestamp), case_number)
+                    for case_number, timestamp in latest.items()
+                ]
+            )
             
-            conn.commit()
-        finally:
-            conn.close()
+            return set(latest)
+        
+        return run_write(write, self._writer)
+
+    def add_evidence_files(self, case_number: str, file_paths: List[str], updated_at) -> bool:
+        """Append evidence file paths to a support case in a single write
+        
+        Appends in SQL rather than rewriting the aggregate, so concurrent
+        uploads to the same case never drop each other's files and the
+        case's comments are left untouched.
+        """
+        if not file_paths:
+            return False
+        
+        def write(conn):
+            cursor = conn.execute(
+                """
+                UPDATE support_cases
+                SET evidence_files = CASE
+                        WHEN evidence_files IS NULL OR evidence_files = '' THEN ?
+                        ELSE evidence_files || ',' || ?
+                    END,
+                    updated_at = ?,
+                    updated_at_us = ?,
+                    version = version + 1
+                WHERE case_number = ?
+                """,
+                (
+                    ",".join(file_paths),
+                    ",".join(file_paths),
+                    updated_at.isoformat(),
+                    to_epoch_us(updated_at),
+                    case_number
+                )
+            )
+            return cursor.rowcount > 0
+        
+        return run_write(write, self._writer)
+
+    def find_evidence_files(self, case_number: str) -> Optional[List[str]]:
+        """Find the evidence file paths of a support case without loading comments
+
+        Returns None if the case does not exist.
+        """
+        with read_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute(
+                "SELECT evidence_files FROM support_cases WHERE case_number = ?",
+                (case_number,)
+            )
+            row = cursor.fetchone()
+            if row is None:
+                return None
+            return row["evidence_files"].split(",") if row["evidence_files"] else []
 
     def find_by_case_number(self, case_number: str):
         """Find a support case by case number"""
-        conn = get_connection()
-        try:
+        with read_connection() as conn:
             cursor = conn.cursor()
+            cursor.row_factory = None
             cursor.execute(
-                "SELECT * FROM support_cases WHERE case_number = ?",
+                f"SELECT {SUPPORT_CASE_COLUMNS} FROM support_cases WHERE case_number = ?",
                 (case_number,)
             )
             row = cursor.fetchone()
@@ -85,311 +274,232 @@ class SupportCaseRepository:
             if not row:
                 return None
             
-            # Import domain objects
-            from domain.support_case import SupportCase, CaseType, CaseStatus
-            from domain.comment import Comment, CommentType
-            from datetime import datetime
-            
-            data = dict(row)
-            
-            # Convert string enums to proper Enum objects
-            case_type = CaseType(data["case_type"]) if data["case_type"] in ["question", "refund"] else CaseType.QUESTION
-            status = CaseStatus(data["status"]) if data["status"] in ["open", "in_progress", "closed"] else CaseStatus.OPEN
-            
-            # Convert string dates to datetime objects
-            created_at = datetime.fromisoformat(data["created_at"]) if data["created_at"] else datetime.utcnow()
-            updated_at = datetime.fromisoformat(data["updated_at"]) if data["updated_at"] else datetime.utcnow()
-            
-            # Parse product_ids and delivery_date
-            product_ids = []
-            if data["product_ids"]:
-                product_ids = data["product_ids"].split(",") if data["product_ids"] else []
-            
-            delivery_date = None
-            if data["delivery_date"]:
-                delivery_date = datetime.fromisoformat(data["delivery_date"])
-            
-            # Load comments
+            comments = self._load_comments(cursor, "case_number = ?", (case_number,))
+            return self._map_row(row, comments.get(case_number))
+
+    def find_summaries(self, case_numbers: List[str]) -> dict:
+        """Find compact records for many support cases with one query
+        
+        Only the columns other services validate against are read, and
+        comments are not loaded.
+        
+        Returns:
+            Case number mapped to a dict with status, case_type, is_deleted,
+            customer_id and refund_request_ids; unknown cases are absent
+        """
+        if not case_numbers:
+            return {}
+        
+        with read_connection() as conn:
+            cursor = conn.cursor()
+            placeholders = ",".join("?" for _ in case_numbers)
             cursor.execute(
-                "SELECT * FROM support_comments WHERE case_number = ? ORDER BY timestamp",
-                (case_number,)
-            )
-            comment_rows = cursor.fetchall()
-            comments = []
-            
-            for comment_row in comment_rows:
-                comment_data = dict(comment_row)
-                comment_type = CommentType(comment_data["comment_type"]) if comment_data["comment_type"] in ["customer_comment", "agent_response", "refund_feedback"] else CommentType.CUSTOMER_COMMENT
-                timestamp = datetime.fromisoformat(comment_data["timestamp"]) if comment_data["timestamp"] else datetime.utcnow()
-                attachments = []
-                if comment_data["attachments"]:
-                    attachments = comment_data["attachments"].split(",") if comment_data["attachments"] else []
-                
-                comment = Comment(
-                    comment_id=comment_data["comment_id"],
-                    case_number=comment_data["case_number"],
-                    author_id=comment_data["author_id"],
-                    author_type=comment_data["author_type"],
-                    content=comment_data["content"],
-                    comment_type=comment_type,
-                    attachments=attachments,
-                    timestamp=timestamp,
-                    is_internal=comment_data["is_internal"]
-                )
-                comments.append(comment)
-            
-            # Parse refund_request_ids
-            refund_request_ids = []
-            if data["refund_request_id"]:
-                refund_request_ids = data["refund_request_id"].split(",") if data["refund_request_id"] else []
-            
-            support_case = SupportCase(
-                case_number=data["case_number"],
-                customer_id=data["customer_id"],
-                case_type=case_type,
-                subject=data["subject"],
-                description=data["description"],
-                refund_request_ids=refund_request_ids,
-                status=status,
-                created_at=created_at,
-                updated_at=updated_at,
-                assigned_agent_id=data["assigned_agent_id"],
-                order_id=data["order_id"],
-                product_ids=product_ids,
-                delivery_date=delivery_date,
-                comments=comments
+                f"""
+                SELECT case_number, customer_id, case_type, status, refund_request_id
+                FROM support_cases
+                WHERE case_number IN ({placeholders})
+                """,
+                list(case_numbers)
             )
             
-            return support_case
-            
-        finally:
-            conn.close()
+            return {
+                row["case_number"]: {
+                    "case_number": row["case_number"],
+                    "customer_id": row["customer_id"],
+                    "case_type": row["case_type"],
+                    "status": row["status"],
+                    # Deleted cases are removed from the table, never flagged
+                    "is_deleted": False,
+                    "refund_request_ids": row["refund_request_id"].split(",") if row["refund_request_id"] else []
+                }
+                for row in cursor.fetchall()
+            }
 
     def find_by_customer_id(self, customer_id: str) -> List:
-        """Find all support cases for a customer"""
-        conn = get_connection()
-        try:
+        """Find all support cases for a customer, with their comments"""
+        with read_connection() as conn:
             cursor = conn.cursor()
+            cursor.row_factory = None
             cursor.execute(
-                "SELECT * FROM support_cases WHERE customer_id = ?",
+                f"SELECT {SUPPORT_CASE_COLUMNS} FROM support_cases WHERE customer_id = ?",
                 (customer_id,)
             )
             rows = cursor.fetchall()
             
             print(f"Found {len(rows)} support cases for customer {customer_id}")
             
-            # Import domain objects
-            from domain.support_case import SupportCase, CaseType, CaseStatus
-            from domain.comment import Comment, CommentType
-            from datetime import datetime
-            
-            cases = []
-            for row in rows:
-                data = dict(row)
-                
-                # Convert string enums to proper Enum objects
-                case_type = CaseType(data["case_type"]) if data["case_type"] in ["question", "refund"] else CaseType.QUESTION
-                status = CaseStatus(data["status"]) if data["status"] in ["open", "in_progress", "closed"] else CaseStatus.OPEN
-                
-                # Convert string dates to datetime objects
-                created_at = datetime.fromisoformat(data["created_at"]) if data["created_at"] else datetime.utcnow()
-                updated_at = datetime.fromisoformat(data["updated_at"]) if data["updated_at"] else datetime.utcnow()
-                
-                # Parse product_ids and delivery_date
-                product_ids = []
-                if data["product_ids"]:
-                    product_ids = data["product_ids"].split(",") if data["product_ids"] else []
-                
-                delivery_date = None
-                if data["delivery_date"]:
-                    delivery_date = datetime.fromisoformat(data["delivery_date"])
-                
-                # Load comments for this case
-                cursor.execute(
-                    "SELECT * FROM support_comments WHERE case_number = ? ORDER BY timestamp",
-                    (data["case_number"],)
-                )
-                comment_rows = cursor.fetchall()
-                comments = []
-                
-                for comment_row in comment_rows:
-                    comment_data = dict(comment_row)
-                    comment_type = CommentType(comment_data["comment_type"]) if comment_data["comment_type"] in ["customer_comment", "agent_response", "refund_feedback"] else CommentType.CUSTOMER_COMMENT
-                    timestamp = datetime.fromisoformat(comment_data["timestamp"]) if comment_data["timestamp"] else datetime.utcnow()
-                    attachments = []
-                    if comment_data["attachments"]:
-                        attachments = comment_data["attachments"].split(",") if comment_data["attachments"] else []
-                    
-                    comment = Comment(
-                        comment_id=comment_data["comment_id"],
-                        case_number=comment_data["case_number"],
-                        author_id=comment_data["author_id"],
-                        author_type=comment_data["author_type"],
-                        content=comment_data["content"],
-                        comment_type=comment_type,
-                        attachments=attachments,
-                        timestamp=timestamp,
-                        is_internal=comment_data["is_internal"]
-                    )
-                    comments.append(comment)
-                
-                # Parse refund_request_ids
-                refund_request_ids = []
-                if data["refund_request_id"]:
-                    refund_request_ids = data["refund_request_id"].split(",") if data["refund_request_id"] else []
-                
-                case = SupportCase(
-                    case_number=data["case_number"],
-                    customer_id=data["customer_id"],
-                    case_type=case_type,
-                    subject=data["subject"],
-                    description=data["description"],
-                    refund_request_ids=refund_request_ids,
-                    status=status,
-                    created_at=created_at,
-                    updated_at=updated_at,
-                    assigned_agent_id=data["assigned_agent_id"],
-                    order_id=data["order_id"],
-                    product_ids=product_ids,
-                    delivery_date=delivery_date,
-                    comments=comments
-                )
-                cases.append(case)
+            if not rows:
+                return []
             
-            return cases
-        finally:
-            conn.close()
+            # One query for every case's comments instead of one per case
+            comments = self._load_comments(
+                cursor,
+                "case_number IN (SELECT case_number FROM support_cases WHERE customer_id = ?)",
+                (customer_id,)
+            )
+            map_row = self._map_row
+            return [map_row(row, comments.get(row[0])) for row in rows]
 
     def find_all(self) -> List:
-        """Find all support cases"""
-        conn = get_connection()
-        try:
+        """Find all support cases
+        
+        Comments are not loaded; listings only need the case fields.
+        """
+        with read_connection() as conn:
             cursor = conn.cursor()
-            # Get all support cases
-            cursor.execute("SELECT * FROM support_cases")
-            rows = cursor.fetchall()
-            
-            # Import domain objects
-            from domain.support_case import SupportCase, CaseType, CaseStatus
-            from domain.comment import Comment, CommentType
-            from datetime import datetime
-            import json
+            cursor.row_factory = None
+            cursor.execute(f"SELECT {SUPPORT_CASE_COLUMNS} FROM support_cases")
             
-            cases = []
-            for row in rows:
-                data = dict(row)
-                
-                # Convert string enums to proper Enum objects
-                try:
-                    case_type = CaseType(data.get('case_type'))
-                except:
-                    case_type = CaseType.QUESTION
-                
-                try:
-                    status = CaseStatus(data.get('status'))
-                except:
-                    status = CaseStatus.OPEN
-                
-                # Parse refund_request_ids
-                refund_request_ids = []
-                refund_request_id_str = data.get('refund_request_id')
-                if refund_request_id_str:
-                    refund_request_ids = refund_request_id_str.split(",") if refund_request_id_str else []
-                
-                # Parse product_ids
-                product_ids = []
-                product_ids_str = data.get('product_ids')
-                if product_ids_str:
-                    product_ids = product_ids_str.split(",") if product_ids_str else []
-                
-                # Handle dates
-                created_at = datetime.utcnow()
-                updated_at = datetime.utcnow()
-                if data.get('created_at'):
-                    try:
-                        created_at = datetime.fromisoformat(str(data['created_at']))
-                    except ValueError:
-                        pass
-                if data.get('updated_at'):
-                    try:
-                        updated_at = datetime.fromisoformat(str(data['updated_at']))
-                    except ValueError:
-                        pass
-                
-                # Parse comments from JSON
-                comments = []
-                comments_json = data.get('comments_json', '[]')
-                try:
-                    comment_data_list = json.loads(comments_json)
-                    for comment_data in comment_data_list:
-                        if isinstance(comment_data, dict) and comment_data.get('content'):
-                            comment_type = CommentType(comment_data.get('comment_type', 'customer_comment'))
-                            timestamp = datetime.utcnow()
-                            if comment_data.get('timestamp'):
-                                try:
-                                    timestamp = datetime.fromisoformat(str(comment_data['timestamp']))
-                                except ValueError:
-                                    pass
-                            attachments = []
-                            if comment_data.get('attachments'):
-                                attachments = comment_data.get('attachments', '').split(",") if comment_data.get('attachments') else []
-                            
-                            comment = Comment(
-                                comment_id=comment_data.get('comment_id', ''),
-                                case_number=comment_data.get('case_number', ''),
-                                author_id=comment_data.get('author_id', ''),
-                                author_type=comment_data.get('author_type', ''),
-                                content=comment_data.get('content', ''),
-                                comment_type=comment_type,
-                                attachments=attachments,
-                                timestamp=timestamp,
-                                is_internal=bool(comment_data.get('is_internal', False))
-                            )
-                            comments.append(comment)
-                except (json.JSONDecodeError, ValueError) as e:
-                    # If JSON parsing fails, continue without comments
-                    pass
-                
-                # Create SupportCase object
-                support_case = SupportCase(
-                    case_number=data.get('case_number', ''),
-                    customer_id=data.get('customer_id', ''),
-                    case_type=case_type,
-                    subject=data.get('subject', ''),
-                    description=data.get('description', ''),
-                    status=status,
-                    refund_request_ids=refund_request_ids,
-                    assigned_agent_id=data.get('assigned_agent_id'),
-                    order_id=data.get('order_id'),
-                    product_ids=product_ids,
-                    delivery_date=data.get('delivery_date'),
-                    created_at=created_at,
-                    updated_at=updated_at,
-                    comments=comments
-                )
-                
-                cases.append(support_case)
+            map_row = self._map_row
+            return [map_row(row) for row in cursor.fetchall()]
+
+    def find_created_between(
+        self,
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None
+    ) -> List:
+        """Find support cases created in [start, end), oldest first
+        
+        Either bound may be omitted. Served from the created_at_us index;
+        comments are not loaded.
+        """
+        conditions = []
+        params = []
+        if start is not None:
+            conditions.append("created_at_us >= ?")
+            params.append(to_epoch_us(start))
+        if end is not None:
+            conditions.append("created_at_us < ?")
+            params.append(to_epoch_us(end))
+        where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+        
+        with read_connection() as conn:
+            cursor = conn.cursor()
+            cursor.row_factory = None
+            cursor.execute(
+                f"SELECT {SUPPORT_CASE_COLUMNS} FROM support_cases {where} ORDER BY created_at_us",
+                params
+            )
             
-            return cases
-        finally:
-            conn.close()
+            map_row = self._map_row
+            return [map_row(row) for row in cursor.fetchall()]
+
+    def _load_comments(self, cursor, condition: str, params: tuple) -> dict:
+        """Load the comments matching a WHERE condition, grouped by case number in timestamp order"""
+        cursor.execute(
+            f"SELECT {SUPPORT_COMMENT_COLUMNS} FROM support_comments WHERE {condition} ORDER BY timestamp_us",
+            params
+        )
+        comments = {}
+        for row in cursor.fetchall():
+            comments.setdefault(row[1], []).append(map_comment(row))
+        return comments
+
     def delete(self, case_number: str) -> bool:
         """Delete a support case"""
-        conn = get_connection()
-        try:
-            cursor = conn.cursor()
-            cursor.execute(
+        deleted = run_write(
+            lambda conn: conn.execute(
                 "DELETE FROM support_cases WHERE case_number = ?",
                 (case_number,)
+            ).rowcount > 0,
+            self._writer
+        )
+        
+        if deleted:
+            print(f"Deleted support case {case_number}")
+        else:
+            print(f"Support case {case_number} not found for deletion")
+        
+        return deleted
+
+    def search(
+        self,
+        match_query: str,
+        include_internal: bool = False,
+        customer_id: Optional[str] = None,
+        limit: int = 20,
+        offset: int = 0
+    ) -> Tuple[List[dict], int]:
+        """Full-text search over case subjects, descriptions and comments
+        
+        Matches from the case text and its comments are ranked together with
+        bm25 (subject weighted above description), and each case is returned
+        once with the snippet of its best match. Internal comments are only
+        searched when ``include_internal`` is set.
+        
+        Args:
+            match_query: FTS5 MATCH expression
+            include_internal: Whether internal comments may match
+            customer_id: Restrict results to one customer's cases
+            limit: Page size
+            offset: Number of ranked cases to skip
+        
+        Returns:
+            Tuple of the page of result dicts and the total number of matching cases
+        """
+        with read_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute(
+                """
+                WITH matches AS (
+                    SELECT c.case_number,
+                           bm25(support_cases_fts, 10.0, 3.0) AS score,
+                           snippet(support_cases_fts, -1, '[', ']', '...', 16) AS snippet,
+                           'case' AS matched_in
+                    FROM support_cases_fts
+                    JOIN support_cases c ON c.rowid = support_cases_fts.rowid
+                    WHERE support_cases_fts MATCH :query
+                    UNION ALL
+                    SELECT m.case_number,
+                           bm25(support_comments_fts) AS score,
+                           snippet(support_comments_fts, 0, '[', ']', '...', 16) AS snippet,
+                           'comment' AS matched_in
+                    FROM support_comments_fts
+                    JOIN support_comments m ON m.rowid = support_comments_fts.rowid
+                    WHERE support_comments_fts MATCH :query
+                      AND (:include_internal OR NOT m.is_internal)
+                ),
+                ranked AS (
+                    SELECT case_number, score, snippet, matched_in,
+                           ROW_NUMBER() OVER (PARTITION BY case_number ORDER BY score) AS position,
+                           COUNT(*) OVER (PARTITION BY case_number) AS match_count
+                    FROM matches
+                )
+                SELECT c.case_number, c.customer_id, c.case_type, c.subject, c.status,
+                       c.created_at, c.updated_at,
+                       r.score, r.snippet, r.matched_in, r.match_count,
+                       COUNT(*) OVER () AS total
+                FROM ranked r
+                JOIN support_cases c ON c.case_number = r.case_number
+                WHERE r.position = 1
+                  AND (:customer_id IS NULL OR c.customer_id = :customer_id)
+                ORDER BY r.score, c.updated_at_us DESC
+                LIMIT :limit OFFSET :offset
+                """,
+                {
+                    "query": match_query,
+                    "include_internal": include_internal,
+                    "customer_id": customer_id,
+                    "limit": limit,
+                    "offset": offset
+                }
             )
-            deleted = cursor.rowcount > 0
-            conn.commit()
+            rows = cursor.fetchall()
             
-            if deleted:
-                print(f"Deleted support case {case_number}")
+            if rows:
+                total = rows[0]["total"]
+            elif offset > 0:
+                # Page past the end: count the matches without fetching them
+                _, total = self.search(match_query, include_internal, customer_id, limit=1, offset=0)
             else:
-                print(f"Support case {case_number} not found for deletion")
+                total = 0
+            
+            results = []
+            for row in rows:
+                data = dict(row)
+                data.pop("total")
+                # bm25 scores are negative, lower is better; expose higher-is-better
+                data["score"] = -data["score"]
+                results.append(data)
             
-            return deleted
-        finally:
-            conn.close()
\ No newline at end of file
+            return results, total
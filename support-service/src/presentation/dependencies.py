@@ -1,21 +1,46 @@
 """Dependency injection setup for support service"""
 
+from infrastructure.config import get_config
+from infrastructure.database.database_config import get_database_writer
 from infrastructure.repositories.support_case_repository import SupportCaseRepository
+from infrastructure.file_storage.file_storage import FileStorageService
+from infrastructure.file_storage.image_variants import get_variant_processor
 from domain.events.create_support_case import CreateSupportCase
 from domain.events.close_case import CloseCase
 from domain.events.update_case_type import UpdateCaseType
 from domain.events.add_comment import AddComment
+from domain.events.add_comments import AddComments
+from domain.events.upload_evidence import UploadEvidence
+from domain.events.search_support_cases import SearchSupportCases
+from domain.events.lookup_support_cases import LookupSupportCases
 
 
 class Dependencies:
     """Container for application dependencies"""
     
     def __init__(self):
-        self.support_case_repository = SupportCaseRepository()
+        config = get_config()
+        self.support_case_repository = SupportCaseRepository(
+            lazy=config.lazy_row_mapping,
+            writer=get_database_writer()
+        )
+        self.file_storage = FileStorageService(
+            upload_dir=config.evidence_upload_dir,
+            content_addressed=config.evidence_content_addressed
+        )
         self.create_support_case = CreateSupportCase(self.support_case_repository)
         self.add_comment = AddComment(self.support_case_repository)
+        self.add_comments = AddComments(self.support_case_repository)
         self.close_case = CloseCase(self.support_case_repository)
         self.update_case_type = UpdateCaseType(self.support_case_repository)
+        self.search_support_cases = SearchSupportCases(self.support_case_repository)
+        self.lookup_support_cases = LookupSupportCases(self.support_case_repository)
+        self.variant_processor = get_variant_processor()
+        self.upload_evidence = UploadEvidence(
+            self.support_case_repository,
+            self.file_storage,
+            self.variant_processor
+        )
 
 
 def get_dependencies() -> Dependencies:
@@ -5,6 +5,8 @@ from fastapi.middleware.cors import CORSMiddleware
 from infrastructure.config import get_config
 from infrastructure.logging_config import setup_logging, get_logger
 from infrastructure.middleware.error_handler import error_handler
+from infrastructure.file_storage.image_variants import shutdown_variant_processor
+from infrastructure.database.database_config import close_reader_pool, shutdown_database_writer
 from presentation.support_cases import router as support_cases_router
 
 # Load configuration
@@ -15,9 +17,7 @@ setup_logging(config.log_level)
 logger = get_logger(__name__)
 
 # Initialize database
-from infrastructure.database.database_config import init_database
 from infrastructure.database.migrations import migrate_schema
-init_database()
 migrate_schema()
 
 app = FastAPI(
@@ -35,12 +35,19 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-# Add error handling middleware
-app.middleware("http")(error_handler)
+# Add the handler for unexpected errors
+app.add_exception_handler(Exception, error_handler)
 
 # Include routers
 app.include_router(support_cases_router)
 
+@app.on_event("shutdown")
+async def shutdown_background_workers():
+    """Stop the evidence image variant process pool and the database connections"""
+    shutdown_variant_processor()
+    shutdown_database_writer()
+    close_reader_pool()
+
 # Development mode logging
 if config.is_development:
     logger.info("Running in development mode")
@@ -1,11 +1,20 @@
 """API routes for Support Cases"""
 
-from fastapi import APIRouter, Depends, HTTPException, status, UploadFile, File
+import asyncio
+import os
+
+from datetime import datetime
+from fastapi import APIRouter, Depends, HTTPException, Request, status, UploadFile, File
 from typing import List, Optional
 from pydantic import BaseModel
 from uuid import uuid4
 
 from presentation.dependencies import get_dependencies
+from infrastructure.config import get_config
+from infrastructure.database.timestamps import to_epoch_us
+from infrastructure.file_storage.file_storage import FileTooLargeError, InvalidFileTypeError
+from infrastructure.file_storage.file_response import EVIDENCE_CACHE_CONTROL, evidence_file_response
+from infrastructure.repositories.support_case_repository import ConcurrentUpdateError
 
 router = APIRouter(prefix="/support-cases", tags=["support-cases"])
 
@@ -37,10 +46,12 @@ class SupportCaseResponse(BaseModel):
     order_id: Optional[str] = None
     product_ids: Optional[List[str]] = None
     delivery_date: Optional[str] = None
+    evidence_files: Optional[List[str]] = None
     comments: Optional[List[dict]] = None
     case_history: Optional[List[dict]] = None
     created_at: str
     updated_at: str
+    version: Optional[int] = None  # Pass back as expected_version when updating
 
 
 class CommentResponse(BaseModel):
@@ -55,6 +66,46 @@ class CommentResponse(BaseModel):
     is_internal: bool
 
 
+class SearchResultResponse(BaseModel):
+    case_number: str
+    customer_id: str
+    case_type: str
+    subject: str
+    status: str
+    snippet: str
+    matched_in: str  # "case" or "comment"
+    match_count: int
+    score: float
+    created_at: str
+    updated_at: str
+
+
+class SearchResponse(BaseModel):
+    query: str
+    results: List[SearchResultResponse]
+    total: int
+    limit: int
+    offset: int
+
+
+class CaseLookupRequest(BaseModel):
+    case_numbers: List[str]
+
+
+class CaseLookupRecord(BaseModel):
+    case_number: str
+    customer_id: str
+    case_type: str
+    status: str
+    is_deleted: bool
+    refund_request_ids: List[str]
+
+
+class CaseLookupResponse(BaseModel):
+    cases: List[CaseLookupRecord]
+    missing: List[str]
+
+
 # SupportResponse is deprecated - use AddCommentRequest instead
 
 
@@ -99,7 +150,8 @@ async def create_support_case(request: CreateSupportCaseRequest):
             product_ids=support_case.product_ids,
             delivery_date=support_case.delivery_date.isoformat() if support_case.delivery_date else None,
             created_at=support_case.created_at.isoformat(),
-            updated_at=support_case.updated_at.isoformat()
+            updated_at=support_case.updated_at.isoformat(),
+            version=support_case.version
         )
         
     except ValueError as e:
@@ -109,6 +161,62 @@ async def create_support_case(request: CreateSupportCaseRequest):
         )
 
 
+@router.get("/search", response_model=SearchResponse)
+async def search_support_cases(
+    q: str,
+    user_role: str = "customer",
+    customer_id: Optional[str] = None,
+    limit: int = 20,
+    offset: int = 0
+):
+    """Full-text search over case subjects, descriptions and comments
+    
+    Args:
+        q: Search text; all words must match, the last one as a prefix
+        user_role: Role of the searching user; only agents match internal comments
+        customer_id: Restrict results to one customer's cases
+        limit: Page size (1-100)
+        offset: Number of ranked results to skip
+    """
+    dependencies = get_dependencies()
+    
+    try:
+        result = dependencies.search_support_cases.execute(
+            query=q,
+            user_role=user_role,
+            customer_id=customer_id,
+            limit=limit,
+            offset=offset
+        )
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+    
+    return SearchResponse(**result)
+
+
+@router.post("/lookup", response_model=CaseLookupResponse)
+async def lookup_support_cases(request: CaseLookupRequest):
+    """Resolve many support cases in one call for service-to-service validation
+    
+    Returns compact records without comments; unknown case numbers are
+    listed under ``missing``.
+    """
+    dependencies = get_dependencies()
+    
+    try:
+        result = dependencies.lookup_support_cases.execute(request.case_numbers)
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+    
+    return CaseLookupResponse(**result)
+
+
 @router.get("/{case_number}", response_model=SupportCaseResponse)
 async def get_support_case(case_number: str, include_history: bool = False, user_role: str = "customer"):
     """Get a support case by ID
@@ -147,10 +255,12 @@ async def get_support_case(case_number: str, include_history: bool = False, user
             order_id=support_case.order_id,
             product_ids=support_case.product_ids,
             delivery_date=support_case.delivery_date.isoformat() if support_case.delivery_date else None,
+            evidence_files=support_case.evidence_files,
             comments=case_data.get("comments"),
             case_history=case_data.get("case_history"),
             created_at=support_case.created_at.isoformat(),
-            updated_at=support_case.updated_at.isoformat()
+            updated_at=support_case.updated_at.isoformat(),
+            version=support_case.version
         )
     except Exception as e:
         print(f"ERROR in get_support_case: {str(e)}")
@@ -178,19 +288,33 @@ async def get_customer_support_cases(customer_id: str):
             refund_request_ids=case.refund_request_ids,
             assigned_agent_id=case.assigned_agent_id,
             created_at=case.created_at.isoformat(),
-            updated_at=case.updated_at.isoformat()
+            updated_at=case.updated_at.isoformat(),
+            version=case.version
         )
          for case in support_cases
  ]
 
 
 @router.get("/", response_model=List[SupportCaseResponse])
-async def get_all_support_cases():
-    """Get all support cases (for agents)"""
+async def get_all_support_cases(created_from: Optional[datetime] = None, created_to: Optional[datetime] = None):
+    """Get all support cases (for agents)
+    
+    ``created_from``/``created_to`` restrict the list to cases created in
+    [created_from, created_to), oldest first.
+    """
+    if created_from and created_to and to_epoch_us(created_from) >= to_epoch_us(created_to):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="created_from must be before created_to"
+        )
+    
     dependencies = get_dependencies()
     
-    # Find all support cases
-    support_cases = dependencies.support_case_repository.find_all()
+    # Find all support cases, or those created in the requested range
+    if created_from or created_to:
+        support_cases = dependencies.support_case_repository.find_created_between(created_from, created_to)
+    else:
+        support_cases = dependencies.support_case_repository.find_all()
     
     return [
         SupportCaseResponse(
@@ -203,7 +327,8 @@ async def get_all_support_cases():
             refund_request_ids=case.refund_request_ids,
             assigned_agent_id=case.assigned_agent_id,
             created_at=case.created_at.isoformat(),
-            updated_at=case.updated_at.isoformat()
+            updated_at=case.updated_at.isoformat(),
+            version=case.version
         )
         for case in support_cases
     ]
@@ -218,6 +343,7 @@ class UpdateSupportCaseRequest(BaseModel):
     case_type: str
     user_role: str  # "customer" or "agent"
     user_id: str
+    expected_version: Optional[int] = None  # Reject with 409 if the case changed since this version
 
 class UpdateCaseTypeRequest(BaseModel):
     case_type: str
@@ -240,6 +366,11 @@ async def close_case(case_number: str):
             "updated_at": support_case.updated_at.isoformat()
         }
         
+    except ConcurrentUpdateError as e:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail=str(e)
+        )
     except ValueError as e:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
@@ -270,9 +401,15 @@ async def update_case_type(case_number: str, request: UpdateCaseTypeRequest):
             refund_request_ids=support_case.refund_request_ids,
             assigned_agent_id=support_case.assigned_agent_id,
             created_at=support_case.created_at.isoformat(),
-            updated_at=support_case.updated_at.isoformat()
+            updated_at=support_case.updated_at.isoformat(),
+            version=support_case.version
         )
         
+    except ConcurrentUpdateError as e:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail=str(e)
+        )
     except ValueError as e:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
@@ -310,6 +447,12 @@ async def update_support_case(case_number: str, request: UpdateSupportCaseReques
                 detail="You can only update your own support cases"
             )
         
+        if request.expected_version is not None and request.expected_version != support_case.version:
+            raise HTTPException(
+                status_code=status.HTTP_409_CONFLICT,
+                detail=f"Support case is at version {support_case.version}, not {request.expected_version}"
+            )
+        
         # Update case fields
         support_case.subject = request.subject
         support_case.description = request.description
@@ -332,9 +475,15 @@ async def update_support_case(case_number: str, request: UpdateSupportCaseReques
             refund_request_ids=support_case.refund_request_ids,
             assigned_agent_id=support_case.assigned_agent_id,
             created_at=support_case.created_at.isoformat(),
-            updated_at=support_case.updated_at.isoformat()
+            updated_at=support_case.updated_at.isoformat(),
+            version=support_case.version
         )
         
+    except ConcurrentUpdateError as e:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail=str(e)
+        )
     except ValueError as e:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
@@ -365,24 +514,176 @@ async def upload_evidence(
             detail=f"Cannot upload evidence to closed support case {case_number}"
         )
     
-    # TODO: Integrate with file storage service
-    file_names = [file.filename for file in files if file.filename]
+    config = get_config()
+    
+    try:
+        result = await dependencies.upload_evidence.execute(
+            support_case=support_case,
+            files=files,
+            allowed_types=config.evidence_allowed_types,
+            max_size_bytes=config.evidence_max_file_size_mb * 1024 * 1024,
+            max_concurrency=config.evidence_upload_concurrency
+        )
+    except FileTooLargeError as e:
+        raise HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail=str(e)
+        )
+    except InvalidFileTypeError as e:
+        raise HTTPException(
+            status_code=status.HTTP_415_UNSUPPORTED_MEDIA_TYPE,
+            detail=str(e)
+        )
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+    
+    stored_files = result["stored_files"]
     
     return {
         "case_number": case_number,
-        "uploaded_files": file_names,
-        "message": f"Successfully uploaded {len(file_names)} files"
+        "uploaded_files": [stored_file.original_filename for stored_file in stored_files],
+        "stored_files": [stored_file.to_dict() for stored_file in stored_files],
+        "evidence_files": result["support_case"].evidence_files,
+        "message": f"Successfully uploaded {len(stored_files)} files"
     }
 
 
 @router.get("/{case_number}/evidence")
 async def get_evidence(case_number: str):
     """Get list of evidence files for a support case"""
-    # TODO: Integrate with file storage service
+    dependencies = get_dependencies()
+    
+    evidence_files = dependencies.support_case_repository.find_evidence_files(case_number)
+    if evidence_files is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Support case {case_number} not found"
+        )
+    
+    base_url = f"{router.prefix}/{case_number}/evidence"
+    variants = dependencies.file_storage.find_variants(evidence_files)
+    
+    evidence = []
+    for file_path in evidence_files:
+        url = dependencies.file_storage.get_file_url(file_path, base_url)
+        evidence.append({
+            "file_name": os.path.basename(file_path),
+            "file_path": file_path,
+            "url": url,
+            "variants": {
+                variant: f"{url}?size={variant}"
+                for variant in variants.get(file_path, [])
+            }
+        })
+    
     return {
         "case_number": case_number,
-        "evidence_files": ["photo1.jpg", "photo2.png"],
-        "message": "Mock evidence files"
+        "evidence_files": evidence
+    }
+
+
+@router.api_route("/{case_number}/evidence/{file_name}", methods=["GET", "HEAD"])
+async def download_evidence(
+    case_number: str,
+    file_name: str,
+    request: Request,
+    size: Optional[str] = None
+):
+    """Download an evidence file of a support case
+    
+    Supports Range requests and ETag revalidation; the file body is sent
+    with zero-copy sendfile when the ASGI server offers it. ``size`` selects
+    a generated image variant (``thumbnail`` or ``web``); until it exists
+    the original is served without long-lived caching.
+    """
+    dependencies = get_dependencies()
+    config = get_config()
+    
+    if size is not None and size not in ("thumbnail", "web"):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Unknown size '{size}', expected 'thumbnail' or 'web'"
+        )
+    
+    evidence_files = dependencies.support_case_repository.find_evidence_files(case_number)
+    if evidence_files is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Support case {case_number} not found"
+        )
+    
+    stored_path = dependencies.file_storage.find_stored_path(evidence_files, file_name)
+    file_path = dependencies.file_storage.resolve_path(stored_path) if stored_path else None
+    if not file_path:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Evidence file {file_name} not found for support case {case_number}"
+        )
+    
+    cache_control = EVIDENCE_CACHE_CONTROL
+    if size is not None:
+        variant_path = None
+        if config.evidence_variants_enabled:
+            variant_path = dependencies.file_storage.find_variant_path(stored_path, size)
+        if variant_path:
+            file_path = variant_path
+        else:
+            # Variant not generated (yet); don't let clients pin the original to this URL
+            cache_control = "private, no-cache"
+    
+    try:
+        return await evidence_file_response(request, file_path, cache_control)
+    except FileNotFoundError:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Evidence file {file_name} not found for support case {case_number}"
+        )
+
+
+class BatchCommentItem(AddCommentRequest):
+    case_number: str
+
+
+class BatchCommentRequest(BaseModel):
+    comments: List[BatchCommentItem]
+
+
+@router.post("/comments:batch")
+async def add_comments_batch(request: BatchCommentRequest):
+    """Add many comments across support cases in one transaction
+    
+    Each comment is validated on its own and reported as added or failed;
+    comments for unknown cases never block the rest of the batch.
+    """
+    dependencies = get_dependencies()
+    
+    try:
+        # Off the event loop, so concurrent requests can share a group commit
+        result = await asyncio.to_thread(
+            dependencies.add_comments.execute,
+            [item.model_dump() for item in request.comments]
+        )
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+    
+    return {
+        "results": [
+            {
+                "case_number": item["case_number"],
+                "status": item["status"],
+                "comment_id": item["comment"].comment_id if item["comment"] else None,
+                "error": item["error"]
+            }
+            for item in result["results"]
+        ],
+        "added": result["added"],
+        "failed": result["failed"]
     }
 
 
@@ -392,7 +693,8 @@ async def add_comment(case_number: str, request: AddCommentRequest):
     dependencies = get_dependencies()
     
     try:
-        result = dependencies.add_comment.execute(
+        result = await asyncio.to_thread(
+            dependencies.add_comment.execute,
             case_number=case_number,
             author_id=request.author_id,
             author_type=request.author_type,